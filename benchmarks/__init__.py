@@ -0,0 +1,7 @@
+"""Benchmarks reproductibles du Triangulator.
+
+Balaye des tailles et des distributions de points (`distributions`), mesure
+la triangulation, le format binaire et le chemin HTTP complet (`cases`),
+et compare les medianes a une reference JSON (`harness`). Voir
+`python -m benchmarks --help`.
+"""
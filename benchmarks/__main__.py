@@ -0,0 +1,87 @@
+"""Lance les benchmarks du Triangulator.
+
+Exemples::
+
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json
+    python -m benchmarks --sizes 100000 1000000 --cases "triangulate[bowyer-watson]"
+
+Le code de sortie vaut 1 si un cas regresse par rapport a la reference.
+"""
+
+import argparse
+import sys
+
+from benchmarks.cases import CASES, Context, Workload
+from benchmarks.distributions import DISTRIBUTIONS
+from benchmarks.harness import DEFAULT_TOLERANCE, compare, format_table, load, measure, save
+
+#: Tailles mesurees par defaut (1e5 et 1e6 sur demande, via --sizes).
+DEFAULT_SIZES = (100, 1_000, 10_000)
+
+
+def _parse_args(argv):
+    """Analyse la ligne de commande."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="nombres de points (defaut: %(default)s)")
+    parser.add_argument("--distributions", nargs="+", choices=sorted(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS), metavar="NOM",
+                        help="distributions de points (defaut: toutes)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES),
+                        metavar="CAS", help=f"cas mesures parmi {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="appels chronometres par cas (defaut: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="graine des distributions")
+    parser.add_argument("--save", metavar="FICHIER", help="sauvegarde la reference JSON")
+    parser.add_argument("--compare", metavar="FICHIER", help="compare a une reference JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="facteur de mediane tolere (defaut: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Point d'entree de la ligne de commande.
+
+    Args:
+        argv: Arguments (sys.argv[1:] par defaut).
+
+    Returns:
+        int: 0, ou 1 en cas de regression.
+    """
+    args = _parse_args(argv)
+
+    results = []
+    with Context() as context:
+        for distribution in args.distributions:
+            for size in args.sizes:
+                workload = Workload(distribution, size, args.seed)
+                for name in args.cases:
+                    fn = CASES[name](workload, context)
+                    result = {"case": name, "distribution": distribution, "size": size}
+                    result.update(measure(fn, args.repeat))
+                    results.append(result)
+                    print(format_table([result]).splitlines()[-1], flush=True)
+
+    ratios, regressions = {}, []
+    if args.compare:
+        ratios, regressions = compare(results, load(args.compare), args.tolerance)
+
+    print()
+    print(format_table(results, ratios))
+
+    if args.save:
+        save(args.save, results)
+        print(f"\nReference sauvegardee dans {args.save}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) (> x{args.tolerance}) :")
+        for case, distribution, size in regressions:
+            print(f"  {case} {distribution} {size}: x{ratios[case, distribution, size]:.2f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Cas mesures par les benchmarks.
+
+Un cas recoit les donnees d'une distribution a une taille (`Workload`) et
+retourne la fonction sans argument a chronometrer. Le cas "http" passe
+par toute la pile : client HTTP du service, PointSetManager local sur une
+vraie socket, application Flask, cache de resultats vide a chaque appel.
+"""
+
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.distributions import generate
+from triangulator.binary_format import (
+    decode_pointset,
+    decode_triangles,
+    encode_pointset,
+    encode_triangles,
+)
+from triangulator.triangulation import triangulate
+
+
+class Workload:
+    """Points d'une distribution et leurs encodages, calcules a la demande."""
+
+    __slots__ = ("distribution", "size", "points", "_pointset", "_triangles", "_encoded")
+
+    def __init__(self, distribution, size, seed=0):
+        """Genere les points de la charge.
+
+        Args:
+            distribution: Nom de la distribution.
+            size: Nombre de points.
+            seed: Graine du generateur.
+        """
+        self.distribution = distribution
+        self.size = size
+        self.points = generate(distribution, size, seed)
+        self._pointset = None
+        self._triangles = None
+        self._encoded = None
+
+    @property
+    def pointset(self):
+        """PointSet encode."""
+        if self._pointset is None:
+            self._pointset = encode_pointset(self.points)
+        return self._pointset
+
+    @property
+    def triangles(self):
+        """Triangles calcules par le moteur par defaut."""
+        if self._triangles is None:
+            self._triangles = triangulate(self.points)
+        return self._triangles
+
+    @property
+    def encoded(self):
+        """Triangles encodes."""
+        if self._encoded is None:
+            self._encoded = encode_triangles(self.points, self.triangles)
+        return self._encoded
+
+
+def _triangulate_case(method):
+    """Construit le cas `triangulate` pour un moteur."""
+    def case(workload, context):
+        return lambda: triangulate(workload.points, method=method)
+    return case
+
+
+def _encode_pointset(workload, context):
+    """Cas `encode_pointset`."""
+    return lambda: encode_pointset(workload.points)
+
+
+def _decode_pointset(workload, context):
+    """Cas `decode_pointset`."""
+    data = workload.pointset
+    return lambda: decode_pointset(data)
+
+
+def _encode_triangles(workload, context):
+    """Cas `encode_triangles`."""
+    points = workload.points
+    triangles = workload.triangles
+    return lambda: encode_triangles(points, triangles)
+
+
+def _decode_triangles(workload, context):
+    """Cas `decode_triangles`."""
+    data = workload.encoded
+    return lambda: decode_triangles(data)
+
+
+def _http(workload, context):
+    """Cas `http` : GET /triangulation/<id> de bout en bout."""
+    from triangulator.app import result_cache
+
+    pointset_id = str(uuid.uuid4())
+    context.manager.pointsets[pointset_id] = workload.pointset
+    client = context.client
+
+    def run():
+        result_cache.clear()
+        response = client.get(f"/triangulation/{pointset_id}")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_data()!r}")
+        return response.data
+
+    return run
+
+
+#: Cas disponibles, par nom.
+CASES = {
+    "triangulate[bowyer-watson]": _triangulate_case("bowyer-watson"),
+    "triangulate[divide-and-conquer]": _triangulate_case("divide-and-conquer"),
+    "triangulate[parallel]": _triangulate_case("parallel"),
+    "encode_pointset": _encode_pointset,
+    "decode_pointset": _decode_pointset,
+    "encode_triangles": _encode_triangles,
+    "decode_triangles": _decode_triangles,
+    "http": _http,
+}
+
+
+class _ManagerHandler(BaseHTTPRequestHandler):
+    """Sert GET /pointset/<id> depuis `server.pointsets`."""
+
+    protocol_version = "HTTP/1.1"
+    # En-tetes et corps sont ecrits separement : sans TCP_NODELAY, Nagle et
+    # l'ACK differe du client ajoutent ~40 ms a chaque reponse.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802 - nom impose par BaseHTTPRequestHandler
+        """Repond avec le PointSet demande, ou 404."""
+        data = self.server.pointsets.get(self.path.rsplit("/", 1)[-1])
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Desactive les journaux d'acces."""
+
+
+class Context:
+    """Ressources partagees par les cas (PointSetManager local, client Flask).
+
+    S'utilise comme gestionnaire de contexte ; le serveur n'est demarre
+    qu'au premier acces a `manager`.
+    """
+
+    def __init__(self):
+        """Initialise un contexte sans serveur."""
+        self._manager = None
+        self._client = None
+        self._manager_url = None
+
+    @property
+    def manager(self):
+        """PointSetManager local, demarre a la demande."""
+        if self._manager is None:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _ManagerHandler)
+            server.pointsets = {}
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._manager = server
+        return self._manager
+
+    @property
+    def client(self):
+        """Client de test Flask configure sur le PointSetManager local."""
+        if self._client is None:
+            from triangulator.app import app
+
+            host, port = self.manager.server_address[:2]
+            self._manager_url = app.config["POINTSET_MANAGER_URL"]
+            app.config["POINTSET_MANAGER_URL"] = f"http://{host}:{port}"
+            self._client = app.test_client()
+        return self._client
+
+    def __enter__(self):
+        """Retourne le contexte."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Arrete le PointSetManager local et restaure la configuration."""
+        if self._client is not None:
+            from triangulator.app import app
+
+            app.config["POINTSET_MANAGER_URL"] = self._manager_url
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager.server_close()
@@ -0,0 +1,81 @@
+"""Distributions de points reproductibles pour les benchmarks.
+
+Chaque generateur retourne `n` points (x, y) a partir d'une graine ; les
+coordonnees sont arrondies en float32 pour que le chemin direct et le
+chemin HTTP (format PointSet) triangulent exactement les memes points.
+"""
+
+import math
+import random
+from array import array
+
+
+def _uniform(n, rng):
+    """Points uniformes dans [0, 1000]^2."""
+    return [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(n)]
+
+
+def _clustered(n, rng):
+    """Amas gaussiens (un amas pour 1000 points, au moins 4)."""
+    centers = [(rng.uniform(0, 1000), rng.uniform(0, 1000))
+               for _ in range(max(4, n // 1000))]
+    points = []
+    for _ in range(n):
+        cx, cy = rng.choice(centers)
+        points.append((rng.gauss(cx, 5.0), rng.gauss(cy, 5.0)))
+    return points
+
+
+def _grid(n, rng):
+    """Grille reguliere (nombreux points cocycliques)."""
+    side = math.isqrt(n - 1) + 1
+    return [(float(i % side), float(i // side)) for i in range(n)]
+
+
+def _circle(n, rng):
+    """Points regulierement repartis sur un cercle."""
+    return [
+        (1000.0 * math.cos(2 * math.pi * i / n), 1000.0 * math.sin(2 * math.pi * i / n))
+        for i in range(n)
+    ]
+
+
+def _near_collinear(n, rng):
+    """Quatre bandes horizontales d'epaisseur quasi nulle."""
+    return [
+        (rng.uniform(0, 1000), 100.0 * (i % 4) + rng.uniform(-1e-4, 1e-4))
+        for i in range(n)
+    ]
+
+
+def _duplicates(n, rng):
+    """Points tires parmi n / 10 points distincts."""
+    distinct = _uniform(max(3, n // 10), rng)
+    return [rng.choice(distinct) for _ in range(n)]
+
+
+#: Generateurs de points, par nom.
+DISTRIBUTIONS = {
+    "uniform": _uniform,
+    "clustered": _clustered,
+    "grid": _grid,
+    "circle": _circle,
+    "near-collinear": _near_collinear,
+    "duplicates": _duplicates,
+}
+
+
+def generate(name, n, seed=0):
+    """Genere n points selon une distribution.
+
+    Args:
+        name: Nom de la distribution (cle de `DISTRIBUTIONS`).
+        n: Nombre de points.
+        seed: Graine du generateur.
+
+    Returns:
+        list: Liste de tuples (x, y), representables en float32.
+    """
+    points = DISTRIBUTIONS[name](n, random.Random(seed))
+    flat = array("f", [c for p in points for c in p])
+    return list(zip(flat[0::2], flat[1::2]))
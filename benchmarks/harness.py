@@ -0,0 +1,172 @@
+"""Mesure, sauvegarde et comparaison des benchmarks.
+
+Chaque cas est mesure `repeat` fois apres un appel d'echauffement ; la
+memoire de pointe est mesuree par un appel supplementaire sous
+`tracemalloc`, pour ne pas fausser les durees. Les resultats sont
+sauvegardes en JSON et compares a une reference : un cas dont la mediane
+depasse `tolerance` fois celle de la reference est une regression.
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy est optionnel
+    np = None
+
+#: Facteur de mediane au-dela duquel un cas est une regression.
+DEFAULT_TOLERANCE = 1.5
+
+#: Medianes (secondes) en dessous desquelles le bruit domine : pas de
+#: comparaison.
+MIN_COMPARED_SECONDS = 0.001
+
+
+def percentile(values, fraction):
+    """Retourne le percentile de rang le plus proche.
+
+    Args:
+        values: Valeurs mesurees (non vide).
+        fraction: Rang dans [0, 1] (0.95 pour p95).
+
+    Returns:
+        float: Plus petite valeur superieure ou egale a `fraction` des
+        valeurs.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(fn, repeat=5):
+    """Mesure la duree et la memoire de pointe d'un appel.
+
+    Args:
+        fn: Fonction sans argument a mesurer.
+        repeat: Nombre d'appels chronometres.
+
+    Returns:
+        dict: Mediane et p95 des durees (secondes), memoire de pointe
+        (octets) et nombre d'appels chronometres.
+    """
+    fn()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median": statistics.median(durations),
+        "p95": percentile(durations, 0.95),
+        "peak_bytes": peak,
+        "repeat": repeat,
+    }
+
+
+def result_key(result):
+    """Retourne la cle (cas, distribution, taille) d'un resultat."""
+    return result["case"], result["distribution"], result["size"]
+
+
+def environment():
+    """Decrit l'environnement d'execution des benchmarks."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def save(path, results):
+    """Sauvegarde des resultats comme reference JSON.
+
+    Args:
+        path: Chemin du fichier.
+        results: Resultats de `measure` completes par leur cle.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load(path):
+    """Charge une reference JSON.
+
+    Args:
+        path: Chemin du fichier.
+
+    Returns:
+        list: Resultats de reference.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare des resultats a une reference.
+
+    Args:
+        results: Resultats courants.
+        baseline: Resultats de reference (cas absents ignores).
+        tolerance: Facteur de mediane toleré.
+
+    Returns:
+        tuple: (ratios, regressions) ; `ratios` associe a chaque cle
+        comparee le rapport des medianes, `regressions` liste les cles
+        dont le rapport depasse `tolerance`.
+    """
+    reference = {result_key(r): r for r in baseline}
+    ratios = {}
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        base = reference.get(key)
+        if base is None:
+            continue
+        if max(base["median"], result["median"]) < MIN_COMPARED_SECONDS:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else math.inf
+        ratios[key] = ratio
+        if ratio > tolerance:
+            regressions.append(key)
+    return ratios, regressions
+
+
+def format_table(results, ratios=None):
+    """Met en forme des resultats pour la console.
+
+    Args:
+        results: Resultats a afficher.
+        ratios: Rapports a la reference par cle (optionnel).
+
+    Returns:
+        str: Tableau texte, une ligne par resultat.
+    """
+    ratios = ratios or {}
+    lines = [
+        f"{'cas':<32} {'distribution':<15} {'taille':>8} "
+        f"{'mediane ms':>11} {'p95 ms':>10} {'pic Mio':>8} {'ratio':>6}"
+    ]
+    for result in results:
+        ratio = ratios.get(result_key(result))
+        lines.append(
+            f"{result['case']:<32} {result['distribution']:<15} {result['size']:>8} "
+            f"{result['median'] * 1000:>11.3f} {result['p95'] * 1000:>10.3f} "
+            f"{result['peak_bytes'] / 2 ** 20:>8.2f} "
+            f"{'' if ratio is None else f'{ratio:.2f}':>6}"
+        )
+    return "\n".join(lines)
@@ -2,6 +2,9 @@
 
 import random
 import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -109,6 +112,119 @@ def invalid_uuid():
     return "invalid-uuid-format"
 
 
+# =============================================================================
+# Horloge simulee
+# =============================================================================
+
+class FakeClock:
+    """Horloge manuelle, pour les objets qui acceptent un parametre `clock`.
+
+    Attributes:
+        now: Instant courant (s), modifiable directement.
+        tick: Avance (s) appliquee a chaque lecture, avant de la renvoyer
+            (0 : l'horloge ne bouge que si `now` est modifie).
+    """
+
+    def __init__(self, now=0.0, tick=0.0):
+        """Demarre a l'instant `now`."""
+        self.now = now
+        self.tick = tick
+
+    def __call__(self):
+        """Avance de `tick` puis retourne l'instant courant."""
+        self.now += self.tick
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """Horloge manuelle demarrant a l'instant 0."""
+    return FakeClock()
+
+
+# =============================================================================
+# PointSetManager simule
+# =============================================================================
+
+class StubPointSetManager:
+    """Serveur HTTP/1.1 local simulant le PointSetManager.
+
+    Attributes:
+        pointsets: dict UUID -> bytes des PointSets existants.
+        etags: dict UUID -> ETag renvoye (et compare a If-None-Match).
+        status_override: Code HTTP force pour toutes les reponses, ou None.
+        delay: Latence artificielle (s) avant chaque reponse.
+        requests: Liste des (chemin, port client) recus.
+        if_none_match: Liste des en-tetes If-None-Match recus (ou None).
+    """
+
+    def __init__(self):
+        """Demarre le serveur sur un port libre."""
+        self.pointsets = {}
+        self.etags = {}
+        self.status_override = None
+        self.delay = 0.0
+        self.requests = []
+        self.if_none_match = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append((self.path, self.client_address[1]))
+                stub.if_none_match.append(self.headers.get("If-None-Match"))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                pointset_id = self.path.rsplit("/", 1)[-1]
+                body = stub.pointsets.get(pointset_id)
+                etag = stub.etags.get(pointset_id)
+                status = stub.status_override or (200 if body is not None else 404)
+                if status == 200 and etag is not None \
+                        and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                if status != 200:
+                    body = b'{"code": "ERROR", "message": "stub"}'
+                self.send_response(status)
+                if status == 200 and etag is not None:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def connections(self):
+        """Nombre de connexions TCP distinctes observees."""
+        return len({port for _, port in self.requests})
+
+    def stop(self):
+        """Arrete le serveur."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def pointset_manager():
+    """PointSetManager simule sur un port local libre."""
+    stub = StubPointSetManager()
+    yield stub
+    stub.stop()
+
+
 # =============================================================================
 # Helpers de validation
 # =============================================================================
@@ -1,11 +1,28 @@
 """Tests système de l'API Flask."""
 
+import json
 import struct
-from unittest.mock import patch
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from triangulator.app import app
+import triangulator.app as app_module
+from triangulator import parallel
+from triangulator.app import app, result_cache, sessions
+from triangulator.binary_format import (
+    decode_batch,
+    decode_triangles,
+    encode_pointset,
+    iter_encode_triangles,
+)
+from triangulator.client import CircuitOpenError
+from triangulator.scheduler import Scheduler
+from triangulator.service import compute_triangulation
+from triangulator.triangulation import triangulate
 
 
 # =============================================================================
@@ -16,6 +33,7 @@ from triangulator.app import app
 def client():
     """Fixture Flask test client."""
     app.config["TESTING"] = True
+    result_cache.clear()
     with app.test_client() as client:
         yield client
 
@@ -78,6 +96,502 @@ class TestTriangulationEndpointSuccess:
                 assert nb_points >= 0
 
 
+@pytest.mark.system
+class TestTriangulationEndpointMethod:
+    """Tests du choix de moteur via le parametre `method`."""
+
+    def test_divide_and_conquer_method(self, client, valid_uuid, mock_pointset_data):
+        """Test ?method=divide-and-conquer -> 200 et meme contenu."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+
+            default = client.get(f"/triangulation/{valid_uuid}")
+            response = client.get(
+                f"/triangulation/{valid_uuid}?method=divide-and-conquer"
+            )
+
+            assert response.status_code == 200
+            assert len(response.data) == len(default.data)
+
+    def test_unknown_method_returns_400(self, client, valid_uuid):
+        """Test methode inconnue -> 400 + JSON error."""
+        response = client.get(f"/triangulation/{valid_uuid}?method=inconnue")
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "INVALID_METHOD"
+
+
+@pytest.mark.system
+class TestTriangulationEndpointCache:
+    """Tests du cache des resultats."""
+
+    def test_repeated_request_served_from_cache(self, client, valid_uuid, mock_pointset_data):
+        """Test qu'une requete repetee ne re-triangule pas."""
+        with patch("triangulator.app.get_pointset") as mock_get, \
+                patch("triangulator.service.triangulate", wraps=triangulate) as mock_tri:
+            mock_get.return_value = mock_pointset_data
+
+            first = client.get(f"/triangulation/{valid_uuid}")
+            second = client.get(f"/triangulation/{valid_uuid}")
+
+            assert second.status_code == 200
+            assert second.data == first.data
+            assert mock_tri.call_count == 1
+
+    def test_changed_content_recomputed(self, client, valid_uuid, mock_pointset_data):
+        """Test qu'un contenu different n'utilise pas le resultat en cache."""
+        square = struct.pack("<L", 4) + struct.pack("<ff", 0.0, 0.0) \
+            + struct.pack("<ff", 1.0, 0.0) + struct.pack("<ff", 1.0, 1.0) \
+            + struct.pack("<ff", 0.0, 1.0)
+
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+            first = client.get(f"/triangulation/{valid_uuid}")
+            mock_get.return_value = square
+            second = client.get(f"/triangulation/{valid_uuid}")
+
+            assert first.data != second.data
+
+
+@pytest.mark.system
+class TestTriangulationEndpointConditional:
+    """Tests des requetes conditionnelles (ETag / If-None-Match)."""
+
+    def test_etag_on_success(self, client, valid_uuid, mock_pointset_data):
+        """Test qu'une reponse 200 porte un ETag fort."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.headers["ETag"].startswith('"')
+
+    def test_if_none_match_returns_304(self, client, valid_uuid, mock_pointset_data):
+        """Test If-None-Match sur l'ETag courant -> 304 sans triangulation."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+            etag = client.get(f"/triangulation/{valid_uuid}").headers["ETag"]
+            result_cache.clear()
+
+            with patch("triangulator.service.triangulate", wraps=triangulate) as mock_tri:
+                response = client.get(f"/triangulation/{valid_uuid}",
+                                      headers={"If-None-Match": etag})
+
+            assert response.status_code == 304
+            assert response.headers["ETag"] == etag
+            assert response.data == b""
+            assert mock_tri.call_count == 0
+
+    def test_changed_content_new_etag(self, client, valid_uuid, mock_pointset_data):
+        """Test qu'un PointSet modifie invalide l'ETag du client."""
+        square = struct.pack("<L", 4) + struct.pack("<ff", 0.0, 0.0) \
+            + struct.pack("<ff", 1.0, 0.0) + struct.pack("<ff", 1.0, 1.0) \
+            + struct.pack("<ff", 0.0, 1.0)
+
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+            etag = client.get(f"/triangulation/{valid_uuid}").headers["ETag"]
+            mock_get.return_value = square
+
+            response = client.get(f"/triangulation/{valid_uuid}",
+                                  headers={"If-None-Match": etag})
+
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+    def test_etag_depends_on_method(self, client, valid_uuid, mock_pointset_data):
+        """Test que chaque moteur a son propre ETag."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+
+            default = client.get(f"/triangulation/{valid_uuid}")
+            other = client.get(f"/triangulation/{valid_uuid}?method=divide-and-conquer")
+
+            assert default.headers["ETag"] != other.headers["ETag"]
+
+
+@pytest.mark.system
+class TestTriangulationEndpointStreaming:
+    """Tests de l'envoi par morceaux des gros resultats."""
+
+    def test_streamed_response_identical(self, client, valid_uuid, mock_pointset_data,
+                                         monkeypatch):
+        """Test reponse par morceaux identique, avec Content-Length."""
+        monkeypatch.setitem(app.config, "STREAM_MIN_TRIANGLES", 1)
+        expected = compute_triangulation(mock_pointset_data, "bowyer-watson")
+
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data), \
+                patch("triangulator.service.iter_encode_triangles",
+                      wraps=iter_encode_triangles) as mock_iter:
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.status_code == 200
+            mock_iter.assert_called_once()
+            assert response.content_type == "application/octet-stream"
+            assert response.headers["Content-Length"] == str(len(expected))
+            assert response.data == expected
+
+    def test_small_result_not_streamed(self, client, valid_uuid, mock_pointset_data):
+        """Test petit resultat -> reponse complete."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data), \
+                patch("triangulator.service.iter_encode_triangles") as mock_iter:
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.status_code == 200
+            mock_iter.assert_not_called()
+
+
+@pytest.mark.system
+class TestTriangulationEndpointSingleFlight:
+    """Tests du partage des requetes concurrentes identiques."""
+
+    def test_concurrent_requests_share_fetch(self, valid_uuid, mock_pointset_data):
+        """Test requetes concurrentes -> une seule recuperation du PointSet."""
+        app.config["TESTING"] = True
+        result_cache.clear()
+        calls = []
+
+        def slow_fetch(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.2)
+            return mock_pointset_data
+
+        statuses = []
+
+        def request_triangulation():
+            with app.test_client() as client:
+                statuses.append(client.get(f"/triangulation/{valid_uuid}").status_code)
+
+        with patch("triangulator.app.get_pointset", side_effect=slow_fetch):
+            threads = [threading.Thread(target=request_triangulation) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert statuses == [200] * 4
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("validator", ["current", "stale"])
+    def test_conditional_and_plain_requests_share_compute(self, valid_uuid,
+                                                          mock_pointset_data, validator):
+        """Test requetes concurrentes avec et sans If-None-Match -> un seul calcul."""
+        app.config["TESTING"] = True
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            with app.test_client() as client:
+                etag = client.get(f"/triangulation/{valid_uuid}").headers["ETag"]
+        result_cache.clear()
+        if validator == "stale":
+            etag = '"perime"'
+
+        def slow_fetch(*args, **kwargs):
+            time.sleep(0.2)
+            return mock_pointset_data
+
+        statuses = []
+
+        def request_triangulation(headers):
+            with app.test_client() as client:
+                response = client.get(f"/triangulation/{valid_uuid}", headers=headers)
+                statuses.append(response.status_code)
+
+        with patch("triangulator.app.get_pointset", side_effect=slow_fetch), \
+                patch("triangulator.service.triangulate", wraps=triangulate) as mock_tri:
+            threads = [
+                threading.Thread(target=request_triangulation, args=(headers,))
+                for headers in ({"If-None-Match": etag}, {})
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        expected = [200, 304] if validator == "current" else [200, 200]
+        assert sorted(statuses) == expected
+        assert mock_tri.call_count == 1
+
+
+@pytest.mark.system
+class TestTriangulationBatchEndpoint:
+    """Tests de l'endpoint POST /triangulation/batch."""
+
+    def test_batch_returns_items_in_order(self, client, mock_pointset_data):
+        """Test lot -> un element par UUID, dans l'ordre, avec son statut."""
+        found = "123e4567-e89b-12d3-a456-426614174000"
+        missing = "123e4567-e89b-12d3-a456-426614174001"
+
+        def fetch(pointset_id, **kwargs):
+            if pointset_id == missing:
+                raise FileNotFoundError(f"PointSet {pointset_id} non trouve")
+            return mock_pointset_data
+
+        with patch("triangulator.app.get_pointset", side_effect=fetch):
+            response = client.post(
+                "/triangulation/batch",
+                json={"pointSetIds": [found, missing, found]},
+            )
+
+            assert response.status_code == 200
+            assert response.content_type == "application/octet-stream"
+            items = decode_batch(response.data)
+
+        expected = compute_triangulation(mock_pointset_data, "bowyer-watson")
+        assert [status for status, _ in items] == [200, 404, 200]
+        assert items[0][1] == expected
+        assert items[2][1] == expected
+        assert json.loads(items[1][1])["code"] == "POINTSET_NOT_FOUND"
+
+    def test_batch_unexpected_error_becomes_item(self, client, mock_pointset_data):
+        """Test exception inattendue -> element 500 INTERNAL_ERROR, lot complet."""
+        broken = "123e4567-e89b-12d3-a456-426614174001"
+        ids = ["123e4567-e89b-12d3-a456-426614174000", broken,
+               "123e4567-e89b-12d3-a456-426614174002"]
+
+        def fetch(pointset_id, **kwargs):
+            if pointset_id == broken:
+                raise TypeError("bogue")
+            return mock_pointset_data
+
+        with patch("triangulator.app.get_pointset", side_effect=fetch):
+            response = client.post("/triangulation/batch", json={"pointSetIds": ids})
+            items = decode_batch(response.data)
+
+        assert [status for status, _ in items] == [200, 500, 200]
+        assert json.loads(items[1][1])["code"] == "INTERNAL_ERROR"
+
+    def test_batch_fetches_concurrently(self, client, mock_pointset_data, monkeypatch):
+        """Test les PointSets du lot sont recuperes en parallele."""
+        monkeypatch.setitem(app.config, "BATCH_WORKERS", 4)
+        ids = [f"123e4567-e89b-12d3-a456-42661417400{i}" for i in range(4)]
+
+        def slow_fetch(*args, **kwargs):
+            time.sleep(0.2)
+            return mock_pointset_data
+
+        with patch("triangulator.app.get_pointset", side_effect=slow_fetch):
+            start = time.perf_counter()
+            response = client.post("/triangulation/batch", json={"pointSetIds": ids})
+            items = decode_batch(response.data)
+            elapsed = time.perf_counter() - start
+
+        assert [status for status, _ in items] == [200] * 4
+        assert elapsed < 0.6
+
+    def test_empty_batch(self, client):
+        """Test lot vide -> lot binaire sans element."""
+        response = client.post("/triangulation/batch", json={"pointSetIds": []})
+
+        assert response.status_code == 200
+        assert decode_batch(response.data) == []
+
+    @pytest.mark.parametrize("body", [None, [], {"ids": []}, {"pointSetIds": [1]}])
+    def test_invalid_body_returns_400(self, client, body):
+        """Test corps mal forme -> 400 INVALID_REQUEST."""
+        response = client.post("/triangulation/batch", json=body)
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "INVALID_REQUEST"
+
+    def test_batch_too_large_returns_400(self, client, valid_uuid, monkeypatch):
+        """Test lot trop grand -> 400 BATCH_TOO_LARGE."""
+        monkeypatch.setitem(app.config, "BATCH_MAX_ITEMS", 2)
+
+        response = client.post(
+            "/triangulation/batch", json={"pointSetIds": [valid_uuid] * 3}
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "BATCH_TOO_LARGE"
+
+    def test_invalid_method_returns_400(self, client, valid_uuid):
+        """Test methode inconnue -> 400 INVALID_METHOD pour tout le lot."""
+        response = client.post(
+            "/triangulation/batch?method=inconnue", json={"pointSetIds": [valid_uuid]}
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "INVALID_METHOD"
+
+
+@pytest.fixture
+def session_id(client, valid_uuid, mock_pointset_data):
+    """Session ouverte sur le PointSet mocke."""
+    sessions.clear()
+    with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+        response = client.post("/triangulation/sessions", json={"pointSetId": valid_uuid})
+    yield response.get_json()["sessionId"]
+    sessions.clear()
+
+
+@pytest.mark.system
+class TestTriangulationSessions:
+    """Tests des sessions de triangulation incrementale."""
+
+    def test_create_session(self, client, valid_uuid, mock_pointset_data):
+        """Test POST /triangulation/sessions -> 201 + identifiant + Location."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            response = client.post("/triangulation/sessions",
+                                   json={"pointSetId": valid_uuid})
+        body = response.get_json()
+        sessions.clear()
+
+        assert response.status_code == 201
+        assert body["points"] == 3
+        assert response.headers["Location"] == f"/triangulation/sessions/{body['sessionId']}"
+
+    def test_insert_points(self, client, session_id):
+        """Test que les points ajoutes sont triangules avec les precedents."""
+        response = client.post(f"/triangulation/sessions/{session_id}/points",
+                               data=encode_pointset([(0.5, 0.3), (2.0, 2.0)]),
+                               content_type="application/octet-stream")
+        triangles = client.get(f"/triangulation/sessions/{session_id}")
+        points, indices = decode_triangles(triangles.data)
+
+        assert response.status_code == 200
+        assert response.get_json()["points"] == 5
+        assert triangles.status_code == 200
+        assert triangles.content_type == "application/octet-stream"
+        assert len(points) == 5
+        assert {frozenset(t) for t in indices} == \
+            {frozenset(t) for t in triangulate(points)}
+
+    def test_insert_does_not_retriangulate(self, client, session_id):
+        """Test qu'un ajout n'appelle pas la triangulation complete."""
+        with patch("triangulator.service.triangulate") as mock_tri:
+            client.post(f"/triangulation/sessions/{session_id}/points",
+                        data=encode_pointset([(0.5, 0.3)]))
+            client.get(f"/triangulation/sessions/{session_id}")
+
+        assert mock_tri.call_count == 0
+
+    def test_invalid_points_returns_400(self, client, session_id):
+        """Test corps PointSet invalide -> 400 INVALID_POINTSET."""
+        response = client.post(f"/triangulation/sessions/{session_id}/points",
+                               data=b"\x01")
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "INVALID_POINTSET"
+
+    def test_delete_session(self, client, session_id):
+        """Test DELETE -> 204, puis la session n'existe plus."""
+        response = client.delete(f"/triangulation/sessions/{session_id}")
+        missing = client.get(f"/triangulation/sessions/{session_id}")
+
+        assert response.status_code == 204
+        assert missing.status_code == 404
+        assert missing.get_json()["code"] == "SESSION_NOT_FOUND"
+
+    def test_invalid_body_returns_400(self, client):
+        """Test corps sans pointSetId -> 400 INVALID_REQUEST."""
+        response = client.post("/triangulation/sessions", json={"ids": []})
+
+        assert response.status_code == 400
+        assert response.get_json()["code"] == "INVALID_REQUEST"
+
+    def test_pointset_not_found_returns_404(self, client, valid_uuid):
+        """Test PointSet initial inexistant -> 404 POINTSET_NOT_FOUND."""
+        with patch("triangulator.app.get_pointset", side_effect=FileNotFoundError("x")):
+            response = client.post("/triangulation/sessions",
+                                   json={"pointSetId": valid_uuid})
+
+        assert response.status_code == 404
+        assert response.get_json()["code"] == "POINTSET_NOT_FOUND"
+
+    def test_too_many_sessions_returns_503(self, client, valid_uuid, mock_pointset_data):
+        """Test limite de sessions atteinte -> 503 TOO_MANY_SESSIONS."""
+        sessions.clear()
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data), \
+                patch.object(sessions, "max_sessions", 1):
+            client.post("/triangulation/sessions", json={"pointSetId": valid_uuid})
+            response = client.post("/triangulation/sessions",
+                                   json={"pointSetId": valid_uuid})
+        sessions.clear()
+
+        assert response.status_code == 503
+        assert response.get_json()["code"] == "TOO_MANY_SESSIONS"
+
+
+@pytest.mark.system
+class TestTriangulationEndpointProcessPool:
+    """Tests du calcul dans un pool de processus."""
+
+    @pytest.fixture
+    def pool_config(self, monkeypatch):
+        """Active un pool d'un processus pour le test."""
+        monkeypatch.setitem(app.config, "PROCESS_POOL_WORKERS", 1)
+        monkeypatch.setattr(app_module, "_pool", None)
+        yield
+        app_module.get_pool().shutdown()
+
+    def test_pool_result_identical(self, client, valid_uuid, mock_pointset_data, pool_config):
+        """Test que le resultat via le pool est identique."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.return_value = mock_pointset_data
+
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.status_code == 200
+            assert response.data == compute_triangulation(mock_pointset_data, "bowyer-watson")
+
+    def test_pool_saturated_returns_503(self, client, valid_uuid, mock_pointset_data,
+                                        pool_config):
+        """Test pool sature -> 503 + JSON error."""
+        with patch("triangulator.app.get_pointset") as mock_get, \
+                patch.object(app_module.get_pool()._slots, "acquire", return_value=False):
+            mock_get.return_value = mock_pointset_data
+
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.status_code == 503
+            assert response.get_json()["code"] == "POOL_SATURATED"
+
+
+@pytest.mark.system
+class TestTriangulationEndpointAdmission:
+    """Tests du controle d'admission des calculs."""
+
+    @pytest.fixture
+    def scheduler(self, monkeypatch):
+        """Ordonnanceur dont la file des petits travaux est deja chargee."""
+        scheduler = Scheduler(small_max_backlog=1.0, seconds_per_point=1.0)
+        scheduler.admit(struct.pack("<L", 1) + bytes(8))
+        monkeypatch.setattr(app_module, "scheduler", scheduler)
+        return scheduler
+
+    def test_overloaded_returns_503_retry_after(self, client, valid_uuid,
+                                                mock_pointset_data, scheduler):
+        """Test file des travaux pleine -> 503 JSON + Retry-After."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        assert response.status_code == 503
+        assert response.get_json()["code"] == "SERVICE_OVERLOADED"
+        assert response.headers["Retry-After"] == "1"
+        assert scheduler.stats()["small"]["rejected"] == 1
+
+    def test_cached_result_bypasses_admission(self, client, valid_uuid,
+                                              mock_pointset_data, monkeypatch):
+        """Test un resultat en cache est servi meme si la file est pleine."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            client.get(f"/triangulation/{valid_uuid}")
+            scheduler = Scheduler(small_max_backlog=1.0, seconds_per_point=1.0)
+            scheduler.admit(struct.pack("<L", 1) + bytes(8))
+            monkeypatch.setattr(app_module, "scheduler", scheduler)
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        assert response.status_code == 200
+
+    def test_session_overloaded_returns_503(self, client, valid_uuid,
+                                            mock_pointset_data, scheduler):
+        """Test ouverture de session refusee -> 503 + Retry-After."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            response = client.post("/triangulation/sessions",
+                                   json={"pointSetId": valid_uuid})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
 @pytest.mark.system
 class TestTriangulationEndpointClientErrors:
     """Tests cas d'erreur client (4xx)."""
@@ -171,6 +685,54 @@ class TestTriangulationEndpointServerErrors:
             assert "code" in data
             assert "message" in data
 
+    def test_pointset_manager_server_error_returns_503(self, client, valid_uuid):
+        """Test PointSetManager en erreur 5xx -> 503 + JSON error."""
+        with patch("triangulator.app.get_pointset") as mock_get:
+            mock_get.side_effect = RuntimeError("Erreur serveur 500")
+
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+            assert response.status_code == 503
+            assert response.get_json()["code"] == "SERVICE_UNAVAILABLE"
+
+    def test_parallel_worker_dies_returns_500_json(self, client, valid_uuid, monkeypatch):
+        """Test processus de bande mort (moteur parallel) -> 500 WORKER_FAILED en JSON."""
+        dead = Future()
+        dead.set_exception(BrokenProcessPool("processus mort"))
+        executor = MagicMock()
+        executor.submit.return_value = dead
+        monkeypatch.setattr(parallel, "MIN_STRIP_POINTS", 2)
+        monkeypatch.setattr(parallel.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(parallel, "_get_executor", lambda workers: executor)
+        pointset = encode_pointset([(float(i), float(i * i % 7)) for i in range(8)])
+
+        with patch("triangulator.app.get_pointset", return_value=pointset):
+            response = client.get(f"/triangulation/{valid_uuid}?method=parallel")
+
+        assert executor.submit.called
+        assert response.status_code == 500
+        assert response.content_type == "application/json"
+        assert response.get_json()["code"] == "WORKER_FAILED"
+
+    def test_circuit_open_returns_503_retry_after(self, client, valid_uuid):
+        """Test disjoncteur ouvert -> 503 immediat + Retry-After."""
+        with patch("triangulator.app.get_pointset", side_effect=CircuitOpenError(3.2)):
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        assert response.status_code == 503
+        assert response.get_json()["code"] == "SERVICE_UNAVAILABLE"
+        assert response.headers["Retry-After"] == "4"
+
+    def test_triangulation_timeout_returns_503(self, client, valid_uuid,
+                                               mock_pointset_data, monkeypatch):
+        """Test delai de triangulation depasse -> 503 TRIANGULATION_TIMEOUT."""
+        monkeypatch.setitem(app.config, "TRIANGULATION_TIMEOUT", 0.0)
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        assert response.status_code == 503
+        assert response.get_json()["code"] == "TRIANGULATION_TIMEOUT"
+
 
 @pytest.mark.system
 class TestErrorResponseFormat:
@@ -209,3 +771,48 @@ class TestErrorResponseFormat:
         data = response.get_json()
         assert "code" in data
         assert "message" in data
+
+
+@pytest.mark.system
+class TestMetricsEndpoint:
+    """Tests de l'instrumentation et de l'endpoint /metrics."""
+
+    def test_server_timing_header(self, client, valid_uuid, mock_pointset_data):
+        """Test en-tete Server-Timing avec la duree de chaque etape."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        phases = [part.split(";")[0] for part in response.headers["Server-Timing"].split(", ")]
+        assert phases == [
+            "fetch", "queue", "decode", "preprocess", "triangulate", "encode", "total"
+        ]
+
+    def test_server_timing_on_error(self, client, valid_uuid):
+        """Test en-tete Server-Timing aussi sur une erreur."""
+        with patch("triangulator.app.get_pointset", side_effect=FileNotFoundError("x")):
+            response = client.get(f"/triangulation/{valid_uuid}")
+
+        assert response.status_code == 404
+        assert response.headers["Server-Timing"].startswith("fetch;dur=")
+
+    def test_metrics_prometheus(self, client, valid_uuid, mock_pointset_data):
+        """Test /metrics -> texte Prometheus avec etapes, tailles et erreurs."""
+        with patch("triangulator.app.get_pointset", return_value=mock_pointset_data):
+            client.get(f"/triangulation/{valid_uuid}")
+        client.get("/triangulation/invalide?method=inconnue")
+
+        response = client.get("/metrics")
+        text = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert 'triangulator_phase_seconds_count{phase="triangulate"}' in text
+        assert "triangulator_triangles_count" in text
+        assert 'triangulator_errors_total{code="INVALID_METHOD"}' in text
+        assert "triangulator_cache_hits_total" in text
+        assert "triangulator_singleflight_leaders_total" in text
+        assert "triangulator_sessions " in text
+        assert "triangulator_scheduler_small_backlog_seconds" in text
+        assert "triangulator_scheduler_large_rejected_total" in text
+        assert "triangulator_manager_circuit_state " in text
+        assert "triangulator_manager_not_found_hits_total" in text
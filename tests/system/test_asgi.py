@@ -0,0 +1,303 @@
+"""Tests système du point d'entree ASGI."""
+
+import asyncio
+import json
+import struct
+import threading
+import time
+
+import pytest
+
+from triangulator.app import app as flask_app
+from triangulator.app import result_cache
+import triangulator.asgi as asgi_module
+import triangulator.client as client_module
+from triangulator.asgi import app
+from triangulator.scheduler import Scheduler
+
+
+async def _request(path, method="GET", query_string=b"", headers=(), disconnect=None):
+    """Appelle l'application ASGI et retourne (status, headers, body).
+
+    Apres le corps de la requete, `receive` attend `disconnect` (un
+    `asyncio.Event`, jamais declenche par defaut) puis signale la
+    deconnexion du client ; sans reponse, le resultat est (None, {}, b"").
+    """
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query_string,
+        "headers": list(headers),
+    }
+    messages = []
+    received = False
+    disconnect = disconnect or asyncio.Event()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    if not messages:
+        return None, {}, b""
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+def call(path, method="GET", query_string=b"", headers=()):
+    """Version synchrone de `_request`."""
+    return asyncio.run(_request(path, method, query_string, headers))
+
+
+@pytest.fixture
+def manager(pointset_manager, monkeypatch):
+    """PointSetManager simule branche sur la configuration du service."""
+    monkeypatch.setitem(flask_app.config, "POINTSET_MANAGER_URL", pointset_manager.url)
+    result_cache.clear()
+    return pointset_manager
+
+
+@pytest.fixture
+def triangle_data():
+    """Données PointSet (3 points)."""
+    return struct.pack("<L", 3) + struct.pack("<ff", 0.0, 0.0) \
+        + struct.pack("<ff", 1.0, 0.0) + struct.pack("<ff", 0.5, 1.0)
+
+
+@pytest.mark.system
+class TestAsgiTriangulation:
+    """Tests du contrat HTTP de l'application ASGI."""
+
+    def test_success_returns_binary(self, manager, valid_uuid, triangle_data):
+        """Test 200 + application/octet-stream + Triangles binaires."""
+        manager.pointsets[valid_uuid] = triangle_data
+
+        status, headers, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 200
+        assert headers[b"content-type"] == b"application/octet-stream"
+        assert int.from_bytes(body[:4], byteorder="little") == 3
+        assert len(body) == 28 + 4 + 12
+
+    def test_method_query_parameter(self, manager, valid_uuid, triangle_data):
+        """Test ?method=divide-and-conquer."""
+        manager.pointsets[valid_uuid] = triangle_data
+
+        status, _, _ = call(f"/triangulation/{valid_uuid}",
+                            query_string=b"method=divide-and-conquer")
+
+        assert status == 200
+
+    def test_if_none_match_returns_304(self, manager, valid_uuid, triangle_data):
+        """Test If-None-Match sur l'ETag courant -> 304 sans corps."""
+        manager.pointsets[valid_uuid] = triangle_data
+        _, headers, _ = call(f"/triangulation/{valid_uuid}")
+
+        status, cached, body = call(f"/triangulation/{valid_uuid}",
+                                    headers=[(b"if-none-match", headers[b"etag"])])
+
+        assert status == 304
+        assert cached[b"etag"] == headers[b"etag"]
+        assert body == b""
+
+    def test_invalid_uuid_returns_400(self, manager):
+        """Test UUID invalide -> 400 JSON."""
+        status, headers, body = call("/triangulation/invalid-uuid")
+
+        assert status == 400
+        assert headers[b"content-type"] == b"application/json"
+        assert json.loads(body)["code"] == "INVALID_UUID"
+
+    def test_not_found_returns_404(self, manager, valid_uuid):
+        """Test PointSet inexistant -> 404 JSON."""
+        status, _, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 404
+        assert json.loads(body)["code"] == "POINTSET_NOT_FOUND"
+
+    def test_manager_unavailable_returns_503(self, manager, valid_uuid):
+        """Test PointSetManager en erreur -> 503 JSON."""
+        manager.status_override = 500
+
+        status, _, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 503
+        assert json.loads(body)["code"] == "SERVICE_UNAVAILABLE"
+
+    def test_triangulation_fails_returns_500(self, manager, valid_uuid):
+        """Test triangulation impossible -> 500 JSON."""
+        manager.pointsets[valid_uuid] = struct.pack("<L", 2) \
+            + struct.pack("<ff", 0.0, 0.0) + struct.pack("<ff", 1.0, 0.0)
+
+        status, _, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 500
+        assert json.loads(body)["code"] == "TRIANGULATION_FAILED"
+
+    def test_overloaded_returns_503_retry_after(self, manager, valid_uuid, triangle_data,
+                                                monkeypatch):
+        """Test file des travaux pleine -> 503 JSON + Retry-After."""
+        manager.pointsets[valid_uuid] = triangle_data
+        scheduler = Scheduler(small_max_backlog=1.0, seconds_per_point=1.0)
+        scheduler.admit(struct.pack("<L", 1) + bytes(8))
+        monkeypatch.setattr(asgi_module, "scheduler", scheduler)
+
+        status, headers, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 503
+        assert json.loads(body)["code"] == "SERVICE_OVERLOADED"
+        assert headers[b"retry-after"] == b"1"
+
+    def test_timeout_returns_503(self, manager, valid_uuid, triangle_data, monkeypatch):
+        """Test delai de triangulation depasse -> 503 TRIANGULATION_TIMEOUT."""
+        manager.pointsets[valid_uuid] = triangle_data
+        monkeypatch.setitem(flask_app.config, "TRIANGULATION_TIMEOUT", 0.0)
+
+        status, _, body = call(f"/triangulation/{valid_uuid}")
+
+        assert status == 503
+        assert json.loads(body)["code"] == "TRIANGULATION_TIMEOUT"
+
+    def test_disconnect_cancels_computation(self, manager, valid_uuid, triangle_data,
+                                            monkeypatch):
+        """Test client deconnecte -> calcul interrompu, aucune reponse."""
+        manager.pointsets[valid_uuid] = triangle_data
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def endless(pointset_data, method, deadline):
+            started.set()
+            try:
+                while True:
+                    deadline.check()
+                    time.sleep(0.001)
+            finally:
+                stopped.set()
+
+        monkeypatch.setattr(asgi_module, "compute_triangulation", endless)
+
+        async def scenario():
+            disconnect = asyncio.Event()
+            request = asyncio.ensure_future(
+                _request(f"/triangulation/{valid_uuid}", disconnect=disconnect)
+            )
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            disconnect.set()
+            return await request
+
+        status, _, _ = asyncio.run(scenario())
+
+        assert status is None
+        assert stopped.wait(1)
+
+    def test_server_timing_header(self, manager, valid_uuid, triangle_data):
+        """Test en-tete Server-Timing avec les etapes du calcul."""
+        manager.pointsets[valid_uuid] = triangle_data
+
+        _, headers, _ = call(f"/triangulation/{valid_uuid}")
+
+        phases = [part.split(";")[0] for part in headers[b"server-timing"].decode().split(", ")]
+        assert phases == ["fetch", "queue", "compute", "total"]
+
+    def test_metrics_endpoint(self, manager, valid_uuid, triangle_data):
+        """Test GET /metrics -> mesures partagees au format Prometheus."""
+        manager.pointsets[valid_uuid] = triangle_data
+        call(f"/triangulation/{valid_uuid}")
+
+        status, headers, body = call("/metrics")
+
+        assert status == 200
+        assert headers[b"content-type"].startswith(b"text/plain")
+        assert b'triangulator_phase_seconds_count{phase="compute"}' in body
+
+    def test_post_not_allowed(self, valid_uuid):
+        """Test POST -> 405."""
+        status, _, _ = call(f"/triangulation/{valid_uuid}", method="POST")
+
+        assert status == 405
+
+    def test_unknown_route_returns_404(self):
+        """Test route inconnue -> 404."""
+        status, _, body = call("/unknown-route")
+
+        assert status == 404
+        assert json.loads(body)["code"] == "NOT_FOUND"
+
+    def test_websocket_rejected(self):
+        """Test connexion WebSocket -> fermee sans lever d'exception."""
+        messages = []
+
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(app({"type": "websocket", "path": "/triangulation/x"}, receive, send))
+
+        assert [m["type"] for m in messages] == ["websocket.close"]
+
+    def test_lifespan_shutdown_closes_clients(self, manager, valid_uuid, triangle_data):
+        """Test arret lifespan -> clients asynchrones de la boucle fermes et oublies."""
+        manager.pointsets[valid_uuid] = triangle_data
+        events = ["lifespan.startup", "lifespan.shutdown"]
+        sent = []
+
+        async def receive():
+            return {"type": events.pop(0)}
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async def serve():
+            await _request(f"/triangulation/{valid_uuid}")
+            loop = asyncio.get_running_loop()
+            assert loop in client_module._async_clients
+            await app({"type": "lifespan"}, receive, send)
+            return loop in client_module._async_clients
+
+        assert asyncio.run(serve()) is False
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+    def test_concurrent_requests_do_not_serialize(self, manager, triangle_data):
+        """Test que les attentes du PointSetManager se recouvrent."""
+        uuids = [f"123e4567-e89b-12d3-a456-4266141740{i:02d}" for i in range(20)]
+        for pointset_id in uuids:
+            manager.pointsets[pointset_id] = triangle_data
+        manager.delay = 0.2
+
+        async def burst():
+            return await asyncio.gather(*(
+                _request(f"/triangulation/{pointset_id}") for pointset_id in uuids
+            ))
+
+        start = time.perf_counter()
+        results = asyncio.run(burst())
+        duration = time.perf_counter() - start
+
+        assert all(status == 200 for status, _, _ in results)
+        assert duration < 20 * 0.2 / 2
+
+    def test_identical_requests_share_fetch(self, manager, valid_uuid, triangle_data):
+        """Test requetes concurrentes identiques -> une seule recuperation."""
+        manager.pointsets[valid_uuid] = triangle_data
+        manager.delay = 0.1
+
+        async def burst():
+            return await asyncio.gather(*(
+                _request(f"/triangulation/{valid_uuid}") for _ in range(10)
+            ))
+
+        results = asyncio.run(burst())
+
+        assert all(status == 200 for status, _, _ in results)
+        assert len({body for _, _, body in results}) == 1
+        assert len(manager.requests) == 1
@@ -0,0 +1,100 @@
+"""Tests unitaires pour le harnais de benchmarks."""
+
+import struct
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.distributions import DISTRIBUTIONS, generate
+from benchmarks.harness import compare, load, measure, percentile, save
+from triangulator.triangulation import triangulate
+
+
+class TestDistributions:
+    """Tests des distributions de points."""
+
+    @pytest.mark.parametrize("name", sorted(DISTRIBUTIONS))
+    def test_reproductible_et_triangulable(self, name):
+        """Meme graine, memes points ; chaque distribution est triangulable."""
+        points = generate(name, 200, seed=3)
+
+        assert len(points) == 200
+        assert points == generate(name, 200, seed=3)
+        assert triangulate(points)
+
+    def test_float32(self):
+        """Les coordonnees sont representables en float32."""
+        for x, y in generate("uniform", 50):
+            assert struct.unpack("<ff", struct.pack("<ff", x, y)) == (x, y)
+
+    def test_doublons(self):
+        """La distribution a doublons compte 10 fois moins de points distincts."""
+        assert len(set(generate("duplicates", 1000))) <= 100
+
+
+class TestHarness:
+    """Tests de la mesure et de la comparaison."""
+
+    def test_percentile(self):
+        """Percentile de rang le plus proche."""
+        values = list(range(1, 21))
+
+        assert percentile(values, 0.95) == 19
+        assert percentile(values, 0.5) == 10
+        assert percentile([4.0], 0.95) == 4.0
+
+    def test_measure(self):
+        """La mesure appelle la fonction (echauffement + repetitions + memoire)."""
+        calls = []
+
+        result = measure(lambda: calls.append(bytearray(1 << 20)), repeat=3)
+
+        assert len(calls) == 5
+        assert result["repeat"] == 3
+        assert result["p95"] >= result["median"] >= 0
+        assert result["peak_bytes"] >= 1 << 20
+
+    def test_compare(self):
+        """Regression si la mediane depasse la tolerance ; bruit ignore."""
+        def entry(case, median):
+            return {"case": case, "distribution": "uniform", "size": 100, "median": median}
+
+        baseline = [entry("a", 0.010), entry("b", 0.010), entry("c", 0.0001)]
+        results = [entry("a", 0.012), entry("b", 0.020), entry("c", 0.0009),
+                   entry("nouveau", 1.0)]
+
+        ratios, regressions = compare(results, baseline, tolerance=1.5)
+
+        assert regressions == [("b", "uniform", 100)]
+        assert ratios[("a", "uniform", 100)] == pytest.approx(1.2)
+        assert ("c", "uniform", 100) not in ratios
+
+    def test_save_load(self, tmp_path):
+        """Une reference sauvegardee se recharge a l'identique."""
+        results = [{"case": "a", "distribution": "grid", "size": 10, "median": 0.5}]
+        path = tmp_path / "baseline.json"
+
+        save(path, results)
+
+        assert load(path) == results
+
+
+class TestMain:
+    """Tests de la ligne de commande."""
+
+    def test_reference_puis_comparaison(self, tmp_path, capsys):
+        """Une reference est ecrite puis comparee ; une regression echoue."""
+        path = tmp_path / "baseline.json"
+        args = ["--sizes", "50", "--distributions", "uniform",
+                "--cases", "encode_pointset", "http", "--repeat", "1"]
+
+        assert main(args + ["--save", str(path)]) == 0
+
+        baseline = load(path)
+        for result in baseline:
+            result["median"] = 1e-9
+        save(path, baseline)
+        capsys.readouterr()
+
+        assert main(args + ["--compare", str(path)]) == 1
+        assert "regression" in capsys.readouterr().out
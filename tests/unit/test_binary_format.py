@@ -4,11 +4,21 @@ import struct
 
 import pytest
 
+from triangulator import binary_format
 from triangulator.binary_format import (
+    PointSetView,
+    TrianglesView,
+    decode_batch,
     decode_pointset,
     decode_triangles,
+    decode_triangles_view,
+    encode_batch_header,
+    encode_batch_item,
     encode_pointset,
     encode_triangles,
+    encoded_triangles_size,
+    iter_encode_triangles,
+    read_point_count,
 )
 
 
@@ -107,6 +117,15 @@ class TestDecodePointSet:
         with pytest.raises(ValueError):
             decode_pointset(b"")
 
+    def test_read_point_count(self):
+        """Nombre de points lu dans l'en-tete, sans decodage."""
+        assert read_point_count(encode_pointset([(0.0, 0.0), (1.0, 2.0)])) == 2
+
+    def test_read_point_count_en_tete_mensonger(self):
+        """Nombre de points declare superieur aux donnees."""
+        with pytest.raises(ValueError):
+            read_point_count(struct.pack("<L", 1_000_000))
+
 
 class TestRoundtripPointSet:
     """Tests aller-retour encode/decode."""
@@ -249,3 +268,245 @@ class TestRoundtripTriangles:
         points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
         decoded_pts, decoded_tri = decode_triangles(encode_triangles(points, []))
         assert len(decoded_tri) == 0
+
+
+@pytest.fixture(params=["numpy", "python"])
+def codec(request, monkeypatch):
+    """Force le chemin NumPy ou le chemin Python pur du codec."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(binary_format, "np", None)
+    return request.param
+
+
+class TestCodecBackends:
+    """Tests d'equivalence entre le chemin NumPy et le chemin Python pur."""
+
+    def test_encode_pointset_identique(self, codec, sample_points_100):
+        """Octets identiques a l'encodage struct de reference."""
+        expected = struct.pack("<L", 100)
+        for x, y in sample_points_100:
+            expected += struct.pack("<ff", x, y)
+
+        assert encode_pointset(sample_points_100) == expected
+
+    def test_encode_triangles_identique(self, codec, sample_points_square):
+        """Octets identiques a l'encodage struct de reference."""
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        expected = encode_pointset(sample_points_square) + struct.pack("<L", 2)
+        for tri in triangles:
+            expected += struct.pack("<LLL", *tri)
+
+        assert encode_triangles(sample_points_square, triangles) == expected
+
+    def test_decode_identique(self, codec, sample_points_100):
+        """Le decodage redonne les valeurs float32 de struct.unpack."""
+        data = encode_pointset(sample_points_100)
+        expected = [struct.unpack("<ff", struct.pack("<ff", x, y)) for x, y in sample_points_100]
+
+        assert decode_pointset(data) == expected
+
+    def test_roundtrip_triangles(self, codec, sample_points_square):
+        """Aller-retour Triangles avec des tuples d'entiers."""
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        _, decoded = decode_triangles(encode_triangles(sample_points_square, triangles))
+
+        assert decoded == triangles
+        assert all(isinstance(i, int) for tri in decoded for i in tri)
+
+    def test_index_invalide(self, codec, sample_points_triangle):
+        """Les deux chemins rejettent les index hors limite."""
+        with pytest.raises(ValueError, match="Index 7 hors limite"):
+            encode_triangles(sample_points_triangle, [(0, 1, 2), (0, 7, 2)])
+
+        data = encode_pointset(sample_points_triangle) + struct.pack("<L", 1) \
+            + struct.pack("<LLL", 0, 1, 9)
+        with pytest.raises(ValueError, match="Index 9 hors limite"):
+            decode_triangles(data)
+
+    @pytest.mark.parametrize("triangles, message", [
+        ([(0.5, 1, 2)], "non entiers"),
+        ([("0", "1", "2")], "non entiers"),
+        ([[0, 1], [2, 0], [1, 2]], "triplets"),
+        ([(0, 1, 2, 0)], "triplets"),
+        ([(0, 1, 2), (0, 1)], "triplets"),
+    ])
+    def test_triangles_mal_formes(self, codec, sample_points_triangle, triangles, message):
+        """Les deux chemins rejettent les memes triangles mal formes."""
+        with pytest.raises(ValueError, match=message):
+            encode_triangles(sample_points_triangle, triangles)
+        with pytest.raises(ValueError, match=message):
+            iter_encode_triangles(sample_points_triangle, triangles)
+
+    @pytest.mark.parametrize("points, message", [
+        ([("1.0", "2.0")], "non numeriques"),
+        ([(0.0, 1.0, 2.0)], "couples"),
+        ([(0.0,)], "couples"),
+        ([(0.0, 1.0), (2.0,)], "couples"),
+    ])
+    def test_points_mal_formes(self, codec, points, message):
+        """Les deux chemins rejettent les memes points mal formes."""
+        with pytest.raises(ValueError, match=message):
+            encode_pointset(points)
+
+    def test_valeur_trop_grande(self, codec):
+        """Valeur hors de la plage float32 -> OverflowError."""
+        with pytest.raises(OverflowError):
+            encode_pointset([(1e39, 0.0)])
+
+
+class TestPointSetView:
+    """Tests de la vue sans copie sur un PointSet."""
+
+    def test_len_et_indexation(self, sample_points_100):
+        """La vue se comporte comme la liste decodee."""
+        data = encode_pointset(sample_points_100)
+        view = PointSetView.from_bytes(data)
+        decoded = decode_pointset(data)
+
+        assert len(view) == 100
+        assert view[0] == decoded[0]
+        assert view[-1] == decoded[-1]
+        assert list(view) == decoded
+
+    def test_slice_sans_copie(self, sample_points_100):
+        """Le decoupage retourne une vue partageant le buffer."""
+        data = encode_pointset(sample_points_100)
+        view = PointSetView.from_bytes(data)
+        decoded = decode_pointset(data)
+
+        sub = view[10:50:3]
+        assert isinstance(sub, PointSetView)
+        assert list(sub) == decoded[10:50:3]
+        assert list(view[::-1]) == decoded[::-1]
+        assert sub.xs == [x for x, _ in decoded[10:50:3]]
+
+    def test_buffer_partage(self):
+        """Une modification du buffer est visible dans la vue."""
+        data = bytearray(encode_pointset([(1.0, 2.0)]))
+        view = PointSetView.from_bytes(data)
+
+        data[4:8] = struct.pack("<f", 5.0)
+        assert view[0] == (5.0, 2.0)
+
+    def test_index_hors_limite(self, sample_points_triangle):
+        """Indexation hors limite -> IndexError."""
+        view = PointSetView.from_bytes(encode_pointset(sample_points_triangle))
+
+        with pytest.raises(IndexError):
+            view[3]
+
+    def test_donnees_incompletes(self):
+        """Donnees tronquees -> ValueError."""
+        with pytest.raises(ValueError):
+            PointSetView.from_bytes(b"\x01\x00\x00\x00\xff")
+
+    def test_reencodage_identique(self, codec, sample_points_100):
+        """encode_pointset sur une vue redonne les octets d'origine."""
+        data = encode_pointset(sample_points_100)
+        view = PointSetView.from_bytes(data)
+
+        assert encode_pointset(view) == data
+        assert encode_pointset(view[::2]) == encode_pointset(sample_points_100[::2])
+
+
+class TestTrianglesView:
+    """Tests de la vue sans copie sur des Triangles."""
+
+    def test_decode_view(self, codec, sample_points_square):
+        """decode_triangles_view equivaut a decode_triangles."""
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        data = encode_triangles(sample_points_square, triangles)
+
+        points, tri_view = decode_triangles_view(data)
+        assert isinstance(tri_view, TrianglesView)
+        assert list(tri_view) == triangles
+        assert tri_view[1] == (0, 2, 3)
+        assert list(points) == decode_pointset(data)
+
+    def test_encode_depuis_vues(self, codec, sample_points_square):
+        """encode_triangles accepte directement les vues."""
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        data = encode_triangles(sample_points_square, triangles)
+
+        points, tri_view = decode_triangles_view(data)
+        assert encode_triangles(points, tri_view) == data
+
+    def test_index_hors_limite(self, codec, sample_points_triangle):
+        """Index hors limite -> ValueError, au decodage comme a l'encodage."""
+        data = encode_pointset(sample_points_triangle) + struct.pack("<L", 1) \
+            + struct.pack("<LLL", 0, 1, 9)
+        with pytest.raises(ValueError, match="Index 9 hors limite"):
+            decode_triangles_view(data)
+
+        valid = encode_triangles(sample_points_triangle + [(2.0, 2.0)], [(0, 1, 3)])
+        _, tri_view = decode_triangles_view(valid)
+        with pytest.raises(ValueError, match="Index 3 hors limite"):
+            encode_triangles(sample_points_triangle, tri_view)
+
+
+class TestIterEncodeTriangles:
+    """Tests de l'encodage par morceaux."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 16, 1 << 20])
+    def test_identique_a_encode_triangles(self, codec, sample_points_square, chunk_size):
+        """La concatenation des morceaux est identique a encode_triangles."""
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        expected = encode_triangles(sample_points_square, triangles)
+
+        chunks = list(iter_encode_triangles(sample_points_square, triangles, chunk_size))
+
+        assert b"".join(chunks) == expected
+        assert encoded_triangles_size(4, 2) == len(expected)
+
+    def test_identique_depuis_vues(self, codec, sample_points_square):
+        """Les vues sont encodees par morceaux sans changer les octets."""
+        data = encode_triangles(sample_points_square, [(0, 1, 2), (0, 2, 3)])
+        points, tri_view = decode_triangles_view(data)
+
+        assert b"".join(iter_encode_triangles(points, tri_view, chunk_size=12)) == data
+
+    def test_vide(self, codec):
+        """Aucun point ni triangle."""
+        assert b"".join(iter_encode_triangles([], [])) == encode_triangles([], [])
+
+    def test_index_hors_limite_avant_envoi(self, codec, sample_points_triangle):
+        """Un index invalide est detecte avant le premier morceau."""
+        with pytest.raises(ValueError, match="Index 5 hors limite"):
+            iter_encode_triangles(sample_points_triangle, [(0, 1, 5)])
+
+
+class TestBatch:
+    """Tests du format de lot."""
+
+    def test_aller_retour(self):
+        """Un lot encode element par element se decode a l'identique."""
+        items = [(200, b"\x01\x02\x03"), (404, b'{"code": "X"}'), (200, b"")]
+        data = encode_batch_header(len(items))
+        data += b"".join(encode_batch_item(status, payload) for status, payload in items)
+
+        assert decode_batch(data) == items
+
+    def test_encadrement(self):
+        """Statut sur 2 octets, longueur sur 4 octets, little-endian."""
+        assert encode_batch_item(503, b"ab") == struct.pack("<HL", 503, 2) + b"ab"
+
+    def test_vide(self):
+        """Lot sans element."""
+        assert decode_batch(encode_batch_header(0)) == []
+
+    @pytest.mark.parametrize("data", [
+        b"\x01\x00",
+        struct.pack("<L", 1),
+        struct.pack("<L", 1) + struct.pack("<HL", 200, 5) + b"abc",
+    ])
+    def test_tronque(self, data):
+        """Donnees tronquees -> ValueError."""
+        with pytest.raises(ValueError):
+            decode_batch(data)
+
+    def test_donnees_en_trop(self):
+        """Octets apres le dernier element -> ValueError."""
+        with pytest.raises(ValueError, match="en trop"):
+            decode_batch(encode_batch_header(0) + b"\x00")
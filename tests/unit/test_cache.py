@@ -0,0 +1,215 @@
+"""Tests unitaires pour le cache des resultats de triangulation."""
+
+import os
+
+from triangulator.cache import (
+    TriangulationCache,
+    content_digest,
+    etag_matches,
+    make_etag,
+    make_key,
+)
+from triangulator.triangulation import ENGINE_VERSION
+
+
+class TestMakeKey:
+    """Tests de construction des cles."""
+
+    def test_meme_contenu_meme_cle(self, valid_uuid):
+        """Meme UUID, meme moteur, meme contenu -> meme cle."""
+        assert make_key(valid_uuid, b"abc", "m") == make_key(valid_uuid, b"abc", "m")
+
+    def test_contenu_different(self, valid_uuid):
+        """Un contenu modifie change la cle."""
+        assert make_key(valid_uuid, b"abc", "m") != make_key(valid_uuid, b"abd", "m")
+
+    def test_moteur_different(self, valid_uuid):
+        """Un autre moteur change la cle."""
+        assert make_key(valid_uuid, b"abc", "a") != make_key(valid_uuid, b"abc", "b")
+
+    def test_empreinte_fournie(self, valid_uuid):
+        """Une empreinte deja calculee donne la meme cle."""
+        digest = content_digest(b"abc")
+
+        assert make_key(valid_uuid, b"abc", "m", digest) == make_key(valid_uuid, b"abc", "m")
+
+    def test_version_du_moteur(self, valid_uuid):
+        """La cle porte la version des moteurs."""
+        assert f"v{ENGINE_VERSION}" in make_key(valid_uuid, b"abc", "m")
+
+
+class TestEtag:
+    """Tests des ETags et de `If-None-Match`."""
+
+    def test_etag_stable_et_entre_guillemets(self):
+        """Meme contenu, meme moteur -> meme ETag fort."""
+        etag = make_etag(content_digest(b"abc"), "m")
+
+        assert etag == make_etag(content_digest(b"abc"), "m")
+        assert etag.startswith('"') and etag.endswith('"')
+
+    def test_etag_depend_du_contenu_et_du_moteur(self):
+        """Un autre contenu ou un autre moteur change l'ETag."""
+        etag = make_etag(content_digest(b"abc"), "a")
+
+        assert etag != make_etag(content_digest(b"abd"), "a")
+        assert etag != make_etag(content_digest(b"abc"), "b")
+
+    def test_if_none_match(self):
+        """Egalite, liste, etoile et ETag faible correspondent."""
+        etag = make_etag(content_digest(b"abc"), "m")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"autre", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert etag_matches(f"W/{etag}", etag)
+
+    def test_if_none_match_absent_ou_different(self):
+        """Absence d'en-tete ou ETag different -> pas de correspondance."""
+        etag = make_etag(content_digest(b"abc"), "m")
+
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
+        assert not etag_matches('"autre"', etag)
+
+
+class TestTriangulationCache:
+    """Tests du cache LRU en memoire."""
+
+    def test_miss_puis_hit(self):
+        """Premier acces manque, second acces trouve."""
+        cache = TriangulationCache()
+
+        assert cache.get("k") is None
+        cache.put("k", b"data")
+        assert cache.get("k") == b"data"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_eviction_par_nombre(self):
+        """L'entree la moins recemment utilisee est evincee."""
+        cache = TriangulationCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_par_octets(self):
+        """Le volume total reste sous le budget en octets."""
+        cache = TriangulationCache(max_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"123")
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 10
+        assert cache.get("a") is None
+
+    def test_entree_trop_grande_ignoree(self):
+        """Une entree plus grande que le budget n'est pas conservee."""
+        cache = TriangulationCache(max_bytes=4)
+        cache.put("a", b"12345")
+
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_cache_desactive(self):
+        """max_entries=0 desactive le cache."""
+        cache = TriangulationCache(max_entries=0)
+        cache.put("a", b"1")
+
+        assert cache.get("a") is None
+
+
+class TestTriangulationCacheDisque:
+    """Tests du niveau disque."""
+
+    def test_survit_a_une_nouvelle_instance(self, tmp_path):
+        """Une nouvelle instance relit les entrees ecrites sur disque."""
+        TriangulationCache(directory=str(tmp_path)).put("k", b"data")
+
+        cache = TriangulationCache(directory=str(tmp_path))
+        assert cache.get("k") == b"data"
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_absent_du_disque(self, tmp_path):
+        """Cle absente en memoire et sur disque -> None."""
+        cache = TriangulationCache(directory=str(tmp_path))
+
+        assert cache.get("inconnue") is None
+
+    def test_eviction_disque_par_nombre(self, tmp_path):
+        """Le fichier le moins recemment utilise est supprime du disque."""
+        cache = TriangulationCache(directory=str(tmp_path), disk_max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.clear()
+        cache.get("a")
+        cache.put("c", b"3")
+        cache.clear()
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert len(list(tmp_path.glob("*.bin"))) == 2
+        assert cache.stats()["disk_evictions"] == 1
+
+    def test_eviction_disque_par_octets(self, tmp_path):
+        """Le volume du niveau disque reste sous son budget."""
+        cache = TriangulationCache(directory=str(tmp_path), disk_max_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"123")
+
+        assert cache.stats()["disk_bytes"] <= 10
+        assert sum(p.stat().st_size for p in tmp_path.glob("*.bin")) <= 10
+
+    def test_limites_disque_appliquees_au_demarrage(self, tmp_path):
+        """Les fichiers en trop au demarrage sont supprimes, les plus anciens d'abord."""
+        first = TriangulationCache(directory=str(tmp_path))
+        for i, key in enumerate(["a", "b", "c"]):
+            first.put(key, b"data")
+            os.utime(first._path(key), (1000 + i, 1000 + i))
+
+        cache = TriangulationCache(directory=str(tmp_path), disk_max_entries=2)
+
+        assert cache.stats()["disk_entries"] == 2
+        assert cache.get("a") is None
+        assert cache.get("c") == b"data"
+
+    def test_disque_sans_niveau_memoire(self, tmp_path):
+        """Le niveau disque fonctionne meme si le niveau memoire est desactive."""
+        cache = TriangulationCache(max_entries=0, directory=str(tmp_path))
+        cache.put("k", b"data")
+
+        assert cache.get("k") == b"data"
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_entree_trop_grande_pour_la_memoire_gardee_sur_disque(self, tmp_path):
+        """Un resultat au-dela du budget memoire est conserve sur disque."""
+        cache = TriangulationCache(max_bytes=4, directory=str(tmp_path))
+        cache.put("k", b"12345")
+
+        assert cache.stats()["entries"] == 0
+        assert cache.get("k") == b"12345"
+        assert cache.stats()["disk_entries"] == 1
+
+    def test_fichier_d_un_autre_worker_compte(self, tmp_path):
+        """Un fichier ecrit par un autre worker est compte a sa premiere lecture."""
+        cache = TriangulationCache(directory=str(tmp_path), disk_max_entries=1)
+        TriangulationCache(directory=str(tmp_path)).put("autre", b"data")
+
+        assert cache.stats()["disk_entries"] == 0
+        assert cache.get("autre") == b"data"
+        assert cache.stats()["disk_entries"] == 1
+        assert cache.stats()["disk_bytes"] == 4
+
+        cache.put("k", b"1")
+        assert len(list(tmp_path.glob("*.bin"))) == 1
@@ -1,13 +1,32 @@
 """Tests unitaires pour le client PointSetManager."""
 
+import asyncio
+import socket
 import struct
-import urllib.error
-from io import BytesIO
-from unittest.mock import MagicMock, patch
+import threading
 
 import pytest
 
-from triangulator.client import get_pointset
+import triangulator.client as client_module
+from triangulator.client import (
+    AsyncPointSetManagerClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    NotFoundCache,
+    PointSetManagerClient,
+    get_client,
+    get_pointset,
+    get_pointset_async,
+    manager_stats,
+)
+
+
+def _unused_port_url():
+    """Retourne l'URL d'un port local sur lequel personne n'ecoute."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
 
 
 # =============================================================================
@@ -32,129 +51,443 @@ class TestGetPointsetValidation:
         with pytest.raises(ValueError):
             get_pointset("123")
 
-    def test_valid_uuid_format_accepted(self, valid_uuid):
-        """Test format UUID valide est accepte (mock la requete)."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = struct.pack("<L", 0)
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+    def test_valid_uuid_format_accepted(self, valid_uuid, pointset_manager):
+        """Test format UUID valide est accepte."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
 
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value = mock_response
-            result = get_pointset(valid_uuid)
-            assert result is not None
+        result = get_pointset(valid_uuid, manager_url=pointset_manager.url)
+        assert result is not None
+
+    def test_invalid_manager_url_raises(self):
+        """Test URL de PointSetManager invalide leve ValueError."""
+        with pytest.raises(ValueError):
+            PointSetManagerClient("ftp://manager")
 
 
 class TestGetPointsetSuccess:
     """Tests des cas de succes."""
 
-    def test_get_pointset_success_200(self, valid_uuid):
+    def test_get_pointset_success_200(self, valid_uuid, pointset_manager):
         """Test requete reussie (200 + PointSet binaire valide)."""
         pointset_data = struct.pack("<L", 3) + struct.pack("<ff", 0.0, 0.0) \
             + struct.pack("<ff", 1.0, 0.0) + struct.pack("<ff", 0.5, 1.0)
+        pointset_manager.pointsets[valid_uuid] = pointset_data
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = pointset_data
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value = mock_response
-            result = get_pointset(valid_uuid)
+        result = get_pointset(valid_uuid, manager_url=pointset_manager.url)
 
-            assert isinstance(result, bytes)
-            assert len(result) == 28
+        assert isinstance(result, bytes)
+        assert len(result) == 28
 
-    def test_get_pointset_empty(self, valid_uuid):
+    def test_get_pointset_empty(self, valid_uuid, pointset_manager):
         """Test recuperation PointSet vide."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = struct.pack("<L", 0)
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
 
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value = mock_response
-            result = get_pointset(valid_uuid)
+        result = get_pointset(valid_uuid, manager_url=pointset_manager.url)
 
-            assert len(result) == 4
+        assert len(result) == 4
 
 
 class TestGetPointsetErrors:
     """Tests des cas d erreur."""
 
-    def test_get_pointset_not_found_404(self, valid_uuid):
+    def test_get_pointset_not_found_404(self, valid_uuid, pointset_manager):
         """Test PointSet inexistant (404) leve FileNotFoundError."""
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.side_effect = urllib.error.HTTPError(
-                url="http://test/pointset/123",
-                code=404,
-                msg="Not Found",
-                hdrs={},
-                fp=BytesIO(b"")
-            )
+        with pytest.raises(FileNotFoundError):
+            get_pointset(valid_uuid, manager_url=pointset_manager.url)
 
-            with pytest.raises(FileNotFoundError):
-                get_pointset(valid_uuid)
-
-    def test_get_pointset_server_error_500(self, valid_uuid):
+    def test_get_pointset_server_error_500(self, valid_uuid, pointset_manager):
         """Test erreur serveur PointSetManager (500)."""
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.side_effect = urllib.error.HTTPError(
-                url="http://test/pointset/123",
-                code=500,
-                msg="Internal Server Error",
-                hdrs={},
-                fp=BytesIO(b"")
-            )
+        pointset_manager.status_override = 500
 
-            with pytest.raises(RuntimeError):
-                get_pointset(valid_uuid)
+        with pytest.raises(RuntimeError):
+            get_pointset(valid_uuid, manager_url=pointset_manager.url)
 
     def test_get_pointset_connection_error(self, valid_uuid):
         """Test serveur inaccessible leve ConnectionError."""
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.side_effect = urllib.error.URLError("Connection refused")
+        with pytest.raises(ConnectionError):
+            get_pointset(valid_uuid, manager_url=_unused_port_url())
 
-            with pytest.raises(ConnectionError):
-                get_pointset(valid_uuid)
+    def test_get_pointset_timeout(self, valid_uuid, pointset_manager):
+        """Test timeout de lecture."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        pointset_manager.delay = 0.5
+        client = PointSetManagerClient(pointset_manager.url, read_timeout=0.1)
 
-    def test_get_pointset_timeout(self, valid_uuid):
-        """Test timeout de connexion."""
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.side_effect = TimeoutError("Timeout")
-
-            with pytest.raises(ConnectionError):
-                get_pointset(valid_uuid)
+        with pytest.raises(ConnectionError):
+            client.get_pointset(valid_uuid)
 
 
 class TestGetPointsetURLConstruction:
     """Tests de construction d URL."""
 
-    def test_correct_url_called(self, valid_uuid):
+    def test_correct_url_called(self, valid_uuid, pointset_manager):
         """Test que l URL correcte est appelee."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = struct.pack("<L", 0)
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value = mock_response
-            get_pointset(valid_uuid, manager_url="http://test-server:8080")
-
-            call_url = mock_urlopen.call_args[0][0]
-            assert valid_uuid in call_url
-            assert "test-server:8080" in call_url
-
-    def test_custom_manager_url(self, valid_uuid):
-        """Test avec URL personnalisee du manager."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = struct.pack("<L", 0)
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        with patch("triangulator.client.urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value = mock_response
-            get_pointset(valid_uuid, manager_url="http://custom:9000")
-
-            call_url = mock_urlopen.call_args[0][0]
-            assert "custom:9000" in call_url
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+
+        get_pointset(valid_uuid, manager_url=pointset_manager.url)
+
+        path, _ = pointset_manager.requests[-1]
+        assert path == f"/pointset/{valid_uuid}"
+
+    def test_base_path_prefix(self, valid_uuid, pointset_manager):
+        """Test que le chemin de l URL de base est conserve."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        client = PointSetManagerClient(f"{pointset_manager.url}/api/")
+
+        client.get_pointset(valid_uuid)
+
+        path, _ = pointset_manager.requests[-1]
+        assert path == f"/api/pointset/{valid_uuid}"
+
+
+class TestConnectionPool:
+    """Tests du pool de connexions keep-alive."""
+
+    def test_connection_reused(self, valid_uuid, pointset_manager):
+        """Test que des requetes successives reutilisent la connexion."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        client = PointSetManagerClient(pointset_manager.url)
+
+        for _ in range(5):
+            client.get_pointset(valid_uuid)
+
+        assert len(pointset_manager.requests) == 5
+        assert pointset_manager.connections == 1
+        client.close()
+
+    def test_connection_reused_after_error_status(self, valid_uuid, pointset_manager):
+        """Test qu'une reponse 404 ne ferme pas la connexion."""
+        client = PointSetManagerClient(pointset_manager.url)
+
+        for _ in range(3):
+            with pytest.raises(FileNotFoundError):
+                client.get_pointset(valid_uuid)
+
+        assert pointset_manager.connections == 1
+
+    def test_reconnects_when_server_closed_connection(self, valid_uuid, pointset_manager):
+        """Test qu'une connexion fermee cote serveur est remplacee."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        client = PointSetManagerClient(pointset_manager.url)
+        client.get_pointset(valid_uuid)
+
+        idle = client._acquire()
+        idle.sock.shutdown(socket.SHUT_RDWR)
+        client._release(idle)
+
+        assert client.get_pointset(valid_uuid) == struct.pack("<L", 0)
+
+    def test_pool_size_bounds_idle_connections(self, valid_uuid, pointset_manager):
+        """Test que le pool ne conserve pas plus de pool_size connexions."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        pointset_manager.delay = 0.05
+        client = PointSetManagerClient(pointset_manager.url, pool_size=2)
+
+        threads = [
+            threading.Thread(target=client.get_pointset, args=(valid_uuid,))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client._idle.qsize() <= 2
+        client.close()
+        assert client._idle.qsize() == 0
+
+    def test_shared_client_per_url(self, pointset_manager):
+        """Test que get_client partage un client par URL."""
+        assert get_client(pointset_manager.url) is get_client(pointset_manager.url)
+
+
+class TestConditionalFetch:
+    """Tests des recuperations conditionnelles (ETag / If-None-Match)."""
+
+    def test_304_reuses_known_body(self, valid_uuid, pointset_manager):
+        """Test qu'un 304 renvoie le contenu deja recu."""
+        data = struct.pack("<L", 0)
+        pointset_manager.pointsets[valid_uuid] = data
+        pointset_manager.etags[valid_uuid] = '"v1"'
+        client = PointSetManagerClient(pointset_manager.url)
+
+        assert client.get_pointset(valid_uuid) == data
+        assert client.get_pointset(valid_uuid) == data
+        assert pointset_manager.if_none_match == [None, '"v1"']
+
+    def test_changed_pointset_refetched(self, valid_uuid, pointset_manager):
+        """Test qu'un nouvel ETag remplace le contenu connu."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        pointset_manager.etags[valid_uuid] = '"v1"'
+        client = PointSetManagerClient(pointset_manager.url)
+        client.get_pointset(valid_uuid)
+
+        updated = struct.pack("<Lff", 1, 1.0, 2.0)
+        pointset_manager.pointsets[valid_uuid] = updated
+        pointset_manager.etags[valid_uuid] = '"v2"'
+
+        assert client.get_pointset(valid_uuid) == updated
+        assert client.get_pointset(valid_uuid) == updated
+        assert pointset_manager.if_none_match[-1] == '"v2"'
+
+    def test_without_etag_not_conditional(self, valid_uuid, pointset_manager):
+        """Test qu'un PointSetManager sans ETag n'est jamais interroge sous condition."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        client = PointSetManagerClient(pointset_manager.url)
+
+        client.get_pointset(valid_uuid)
+        client.get_pointset(valid_uuid)
+
+        assert pointset_manager.if_none_match == [None, None]
+
+    def test_disabled(self, valid_uuid, pointset_manager):
+        """Test validator_max_bytes=0 desactive les requetes conditionnelles."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        pointset_manager.etags[valid_uuid] = '"v1"'
+        client = PointSetManagerClient(pointset_manager.url, validator_max_bytes=0)
+
+        client.get_pointset(valid_uuid)
+        client.get_pointset(valid_uuid)
+
+        assert pointset_manager.if_none_match == [None, None]
+
+    def test_async_304_reuses_known_body(self, valid_uuid, pointset_manager):
+        """Test qu'un 304 sans corps est gere par le client asyncio."""
+        data = struct.pack("<L", 0)
+        pointset_manager.pointsets[valid_uuid] = data
+        pointset_manager.etags[valid_uuid] = '"v1"'
+        client = AsyncPointSetManagerClient(pointset_manager.url)
+
+        async def fetch_twice():
+            return [await client.get_pointset(valid_uuid) for _ in range(2)]
+
+        assert asyncio.run(fetch_twice()) == [data, data]
+        assert pointset_manager.if_none_match == [None, '"v1"']
+
+
+class TestNotFoundCache:
+    """Tests du cache negatif des PointSets introuvables."""
+
+    def test_404_not_requested_again(self, valid_uuid, pointset_manager):
+        """Test qu'un 404 recent est resservi sans requete."""
+        client = PointSetManagerClient(pointset_manager.url)
+        for _ in range(3):
+            with pytest.raises(FileNotFoundError):
+                client.get_pointset(valid_uuid)
+
+        assert len(pointset_manager.requests) == 1
+        assert client.not_found.stats() == {"entries": 1, "hits": 2}
+
+    def test_expires_after_ttl(self, valid_uuid, pointset_manager, fake_clock):
+        """Test qu'un PointSet cree apres son 404 est visible apres le TTL."""
+        client = PointSetManagerClient(
+            pointset_manager.url, not_found=NotFoundCache(ttl=2.0, clock=fake_clock)
+        )
+        with pytest.raises(FileNotFoundError):
+            client.get_pointset(valid_uuid)
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+
+        with pytest.raises(FileNotFoundError):
+            client.get_pointset(valid_uuid)
+        fake_clock.now = 2.0
+        assert client.get_pointset(valid_uuid) == struct.pack("<L", 0)
+
+    def test_disabled(self, valid_uuid, pointset_manager):
+        """Test ttl=0 desactive le cache negatif."""
+        client = PointSetManagerClient(pointset_manager.url, not_found=NotFoundCache(ttl=0))
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                client.get_pointset(valid_uuid)
+
+        assert len(pointset_manager.requests) == 2
+
+    def test_bounded(self):
+        """Test que les entrees les plus anciennes sont oubliees."""
+        cache = NotFoundCache(max_entries=2)
+        for pointset_id in ("a", "b", "c"):
+            cache.add(pointset_id)
+
+        assert "a" not in cache
+        assert "c" in cache
+
+
+class TestCircuitBreaker:
+    """Tests du disjoncteur des appels au PointSetManager."""
+
+    def test_opens_after_consecutive_failures(self, fake_clock):
+        """Test ouverture apres `failure_threshold` echecs consecutifs."""
+        breaker = CircuitBreaker(failure_threshold=2, clock=fake_clock)
+        breaker.failed()
+        breaker.before_call()
+        breaker.failed()
+
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.before_call()
+        assert excinfo.value.retry_after == breaker.reset_timeout
+        assert breaker.stats() == {"state": "open", "failures": 2, "opened": 1,
+                                   "rejected": 1}
+
+    def test_success_resets_failures(self):
+        """Test qu'une reponse remet le compte d'echecs a zero."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.failed()
+        breaker.succeeded()
+        breaker.failed()
+
+        breaker.before_call()
+        assert breaker.state == "closed"
+
+    def test_half_open_single_probe(self, fake_clock):
+        """Test qu'un seul appel d'essai passe apres `reset_timeout`."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=fake_clock)
+        breaker.failed()
+        fake_clock.now = 5.0
+
+        breaker.before_call()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.succeeded()
+        breaker.before_call()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self, fake_clock):
+        """Test qu'un essai en echec rouvre le disjoncteur."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=fake_clock)
+        breaker.failed()
+        fake_clock.now = 5.0
+        breaker.before_call()
+        breaker.failed()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["opened"] == 2
+
+    def test_abandoned_probe_released(self, fake_clock):
+        """Test qu'un essai annule laisse passer l'appel suivant."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=fake_clock)
+        breaker.failed()
+        fake_clock.now = 5.0
+        breaker.before_call()
+        breaker.abandoned()
+
+        breaker.before_call()
+
+    def test_client_fails_fast(self, valid_uuid):
+        """Test qu'un client dont le disjoncteur est ouvert n'ouvre plus de connexion."""
+        client = PointSetManagerClient(
+            _unused_port_url(), breaker=CircuitBreaker(failure_threshold=2)
+        )
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                client.get_pointset(valid_uuid)
+
+        with pytest.raises(CircuitOpenError):
+            client.get_pointset(valid_uuid)
+
+    def test_http_error_is_a_response(self, valid_uuid, pointset_manager):
+        """Test qu'une erreur 500 n'ouvre pas le disjoncteur."""
+        pointset_manager.status_override = 500
+        client = PointSetManagerClient(
+            pointset_manager.url, breaker=CircuitBreaker(failure_threshold=1)
+        )
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                client.get_pointset(valid_uuid)
+
+        assert client.breaker.state == "closed"
+
+    def test_async_client_fails_fast(self, valid_uuid):
+        """Test du disjoncteur avec le client asyncio."""
+        client = AsyncPointSetManagerClient(
+            _unused_port_url(), breaker=CircuitBreaker(failure_threshold=1)
+        )
+
+        async def fetch():
+            return await client.get_pointset(valid_uuid)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(fetch())
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(fetch())
+
+    def test_shared_by_url(self, valid_uuid):
+        """Test que les clients partages d'une URL partagent leur etat."""
+        url = _unused_port_url()
+        with pytest.raises(ConnectionError):
+            get_pointset(valid_uuid, manager_url=url)
+        with pytest.raises(ConnectionError):
+            asyncio.run(get_pointset_async(valid_uuid, url))
+
+        assert manager_stats(url)["failures"] == 2
+
+
+class TestGetPointsetAsync:
+    """Tests du client asyncio."""
+
+    def test_success(self, valid_uuid, pointset_manager):
+        """Test recuperation asynchrone reussie."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+
+        result = asyncio.run(get_pointset_async(valid_uuid, pointset_manager.url))
+
+        assert result == struct.pack("<L", 0)
+
+    def test_invalid_uuid_raises(self):
+        """Test UUID invalide leve ValueError."""
+        with pytest.raises(ValueError):
+            asyncio.run(get_pointset_async("invalid-uuid"))
+
+    def test_closed_loop_clients_dropped(self, valid_uuid, pointset_manager):
+        """Test qu'une boucle fermee ne garde pas son client ni ne le prete."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+
+        async def fetch():
+            await get_pointset_async(valid_uuid, pointset_manager.url)
+            loop = asyncio.get_running_loop()
+            return loop, client_module._async_clients[loop][pointset_manager.url]
+
+        first_loop, first = asyncio.run(fetch())
+        _, second = asyncio.run(fetch())
+
+        assert second is not first
+        assert first_loop not in client_module._async_clients
+
+    def test_not_found_404(self, valid_uuid, pointset_manager):
+        """Test 404 leve FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(get_pointset_async(valid_uuid, pointset_manager.url))
+
+    def test_server_error_500(self, valid_uuid, pointset_manager):
+        """Test 500 leve RuntimeError."""
+        pointset_manager.status_override = 500
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(get_pointset_async(valid_uuid, pointset_manager.url))
+
+    def test_connection_error(self, valid_uuid):
+        """Test serveur inaccessible leve ConnectionError."""
+        with pytest.raises(ConnectionError):
+            asyncio.run(get_pointset_async(valid_uuid, _unused_port_url()))
+
+    def test_timeout(self, valid_uuid, pointset_manager):
+        """Test timeout de lecture leve ConnectionError."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        pointset_manager.delay = 0.5
+        client = AsyncPointSetManagerClient(pointset_manager.url, read_timeout=0.1)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(client.get_pointset(valid_uuid))
+
+    def test_connection_reused(self, valid_uuid, pointset_manager):
+        """Test que les requetes successives reutilisent la connexion."""
+        pointset_manager.pointsets[valid_uuid] = struct.pack("<L", 0)
+        client = AsyncPointSetManagerClient(pointset_manager.url)
+
+        async def run():
+            for _ in range(3):
+                await client.get_pointset(valid_uuid)
+            await client.close()
+
+        asyncio.run(run())
+        assert pointset_manager.connections == 1
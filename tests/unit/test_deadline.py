@@ -0,0 +1,54 @@
+"""Tests unitaires pour les delais et l'annulation des triangulations."""
+
+import pickle
+
+import pytest
+
+from triangulator.deadline import Deadline, TriangulationCancelled
+
+
+class TestDeadline:
+    """Tests de l'expiration, de l'annulation et de la transmission."""
+
+    def test_sans_limite(self):
+        """Sans delai ni annulation, la verification passe."""
+        deadline = Deadline()
+
+        deadline.check()
+        assert deadline.remaining() is None
+
+    def test_expire(self, fake_clock):
+        """Le delai expire apres `timeout` secondes."""
+        deadline = Deadline(1.0, clock=fake_clock)
+        deadline.check()
+
+        fake_clock.now = 1.0
+        with pytest.raises(TriangulationCancelled, match="Delai"):
+            deadline.check()
+        assert deadline.remaining() == 0.0
+
+    def test_annule(self):
+        """Une annulation interrompt la verification suivante."""
+        deadline = Deadline()
+        deadline.cancel()
+
+        assert deadline.cancelled
+        with pytest.raises(TriangulationCancelled, match="annulee"):
+            deadline.check()
+
+    def test_transmis_par_temps_restant(self, fake_clock):
+        """Une copie (autre processus) garde le temps restant."""
+        deadline = Deadline(10.0, clock=fake_clock)
+        fake_clock.now = 4.0
+
+        copy = pickle.loads(pickle.dumps(deadline))
+
+        assert 5.0 < copy.remaining() <= 6.0
+
+    def test_annulation_transmise(self):
+        """Une copie d'un delai annule a deja expire."""
+        deadline = Deadline()
+        deadline.cancel()
+
+        with pytest.raises(TriangulationCancelled):
+            pickle.loads(pickle.dumps(deadline)).check()
@@ -0,0 +1,167 @@
+"""Tests unitaires pour le pool de processus de triangulation."""
+
+import threading
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+import triangulator.executor as executor_module
+from triangulator.binary_format import encode_pointset
+from triangulator.executor import TriangulationPool
+from triangulator.service import ServiceError, compute_triangulation
+from triangulator.transport import SharedJob
+
+
+@pytest.fixture
+def pool():
+    """Pool de 2 processus arrete en fin de test."""
+    pool = TriangulationPool(workers=2, timeout=30.0)
+    yield pool
+    pool.shutdown()
+
+
+class TestTriangulationPool:
+    """Tests d'execution dans le pool."""
+
+    def test_result_identique_au_calcul_local(self, pool, sample_points_100):
+        """Le resultat du pool est celui du calcul dans le processus courant."""
+        data = encode_pointset(sample_points_100)
+
+        assert pool.run(data, "bowyer-watson") == compute_triangulation(data, "bowyer-watson")
+
+    def test_stats(self, pool, sample_points_100):
+        """Les travaux acceptes sont comptes jusqu'a leur fin."""
+        future = pool.submit(encode_pointset(sample_points_100), "bowyer-watson")
+        # Les callbacks s'executent dans l'ordre : celui-ci suit celui du pool.
+        released = threading.Event()
+        future.add_done_callback(lambda _: released.set())
+
+        pool.result(future)
+        released.wait(5)
+
+        assert pool.stats() == {"workers": 2, "pending": 0, "max_pending": 4}
+
+    def test_erreur_du_calcul_propagee(self, pool):
+        """Une ServiceError levee dans le processus est propagee."""
+        data = encode_pointset([(0.0, 0.0), (1.0, 0.0)])
+
+        with pytest.raises(ServiceError) as excinfo:
+            pool.run(data, "bowyer-watson")
+        assert excinfo.value.code == "TRIANGULATION_FAILED"
+        assert excinfo.value.status == 500
+
+    def test_pool_sature(self, sample_points_1000):
+        """Au-dela de max_pending travaux, la soumission est refusee."""
+        pool = TriangulationPool(workers=1, max_pending=1)
+        data = encode_pointset(sample_points_1000)
+        try:
+            future = pool.submit(data, "bowyer-watson")
+            with pytest.raises(ServiceError) as excinfo:
+                pool.submit(data, "bowyer-watson")
+            assert excinfo.value.status == 503
+            assert excinfo.value.code == "POOL_SATURATED"
+
+            pool.result(future)
+            pool.run(data, "bowyer-watson")
+        finally:
+            pool.shutdown()
+
+    def test_timeout(self, sample_points_1000):
+        """Un travail trop long leve TRIANGULATION_TIMEOUT."""
+        pool = TriangulationPool(workers=1, timeout=0.001)
+        try:
+            with pytest.raises(ServiceError) as excinfo:
+                pool.run(encode_pointset(sample_points_1000), "bowyer-watson")
+            assert excinfo.value.code == "TRIANGULATION_TIMEOUT"
+        finally:
+            pool.shutdown()
+
+    def test_timeout_arrete_le_processus(self, sample_points_10000):
+        """Le processus abandonne le calcul a l'expiration du delai."""
+        pool = TriangulationPool(workers=1, timeout=0.05)
+        try:
+            future = pool.submit(encode_pointset(sample_points_10000), "bowyer-watson")
+            with pytest.raises(ServiceError) as excinfo:
+                future.result(timeout=30)
+            assert excinfo.value.code == "TRIANGULATION_TIMEOUT"
+        finally:
+            pool.shutdown()
+
+
+@pytest.fixture
+def shared_jobs(monkeypatch):
+    """Travaux en memoire partagee crees par le pool."""
+    jobs = []
+
+    class RecordingJob(SharedJob):
+        __slots__ = ()
+
+        def __init__(self, *args):
+            super().__init__(*args)
+            jobs.append(self)
+
+    monkeypatch.setattr(executor_module, "SharedJob", RecordingJob)
+    return jobs
+
+
+def _released(job, timeout=10.0):
+    """Attend la suppression des segments d'un travail."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            segment = shared_memory.SharedMemory(name=job.output.name)
+        except FileNotFoundError:
+            return True
+        segment.close()
+        time.sleep(0.01)
+    return False
+
+
+class TestTriangulationPoolSharedMemory:
+    """Tests du pool avec transport par memoire partagee."""
+
+    def test_resultat_identique(self, shared_jobs, sample_points_100):
+        """Le resultat est celui du calcul local, segments supprimes."""
+        pool = TriangulationPool(workers=1, shared_memory_min_bytes=0)
+        data = encode_pointset(sample_points_100)
+        try:
+            assert pool.run(data, "bowyer-watson") == \
+                compute_triangulation(data, "bowyer-watson")
+        finally:
+            pool.shutdown()
+
+        assert len(shared_jobs) == 1
+        assert _released(shared_jobs[0])
+
+    def test_erreur_propagee(self, shared_jobs):
+        """Une ServiceError du processus est propagee, segments supprimes."""
+        pool = TriangulationPool(workers=1, shared_memory_min_bytes=0)
+        try:
+            with pytest.raises(ServiceError) as excinfo:
+                pool.run(encode_pointset([(0.0, 0.0), (1.0, 0.0)]), "bowyer-watson")
+            assert excinfo.value.code == "TRIANGULATION_FAILED"
+        finally:
+            pool.shutdown()
+
+        assert _released(shared_jobs[0])
+
+    def test_timeout_libere_les_segments(self, shared_jobs, sample_points_1000):
+        """Apres un delai depasse, les segments sont supprimes a la fin du calcul."""
+        pool = TriangulationPool(workers=1, timeout=0.001, shared_memory_min_bytes=0)
+        try:
+            with pytest.raises(ServiceError):
+                pool.run(encode_pointset(sample_points_1000), "bowyer-watson")
+            assert _released(shared_jobs[0])
+        finally:
+            pool.shutdown()
+
+    def test_petit_pointset_serialise(self, shared_jobs, sample_points_100):
+        """En dessous du seuil, le PointSet est serialise."""
+        pool = TriangulationPool(workers=1)
+        try:
+            pool.run(encode_pointset(sample_points_100), "bowyer-watson")
+        finally:
+            pool.shutdown()
+
+        assert shared_jobs == []
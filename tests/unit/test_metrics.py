@@ -0,0 +1,87 @@
+"""Tests unitaires pour les mesures du pipeline."""
+
+import pytest
+
+from triangulator.binary_format import encode_triangles
+from triangulator.metrics import Histogram, Metrics, server_timing
+
+
+class TestHistogram:
+    """Tests de l'histogramme a seaux fixes."""
+
+    def test_comptes_cumules(self):
+        """Les comptes rendus sont cumules, seau +Inf compris."""
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        cumulative, count, total = histogram.snapshot()
+
+        assert cumulative == [2, 3, 4]
+        assert count == 4
+        assert total == pytest.approx(56.5)
+
+    def test_vide(self):
+        """Un histogramme vide a des comptes nuls."""
+        assert Histogram((1,)).snapshot() == ([0, 0], 0, 0.0)
+
+
+class TestServerTiming:
+    """Tests de l'en-tete Server-Timing."""
+
+    def test_format(self):
+        """Durees en millisecondes, dans l'ordre des etapes."""
+        assert server_timing({"fetch": 0.0012, "total": 0.5}) == (
+            "fetch;dur=1.200, total;dur=500.000"
+        )
+
+    def test_vide(self):
+        """Aucune etape."""
+        assert server_timing({}) == ""
+
+
+class TestMetrics:
+    """Tests de l'agregation et du rendu Prometheus."""
+
+    def test_etapes(self):
+        """Chaque etape a son histogramme."""
+        metrics = Metrics()
+        metrics.observe_timings({"fetch": 0.002, "triangulate": 0.3})
+        metrics.observe_timings({"fetch": 0.004})
+
+        text = metrics.render()
+
+        assert 'triangulator_phase_seconds_count{phase="fetch"} 2' in text
+        assert 'triangulator_phase_seconds_count{phase="triangulate"} 1' in text
+        assert 'triangulator_phase_seconds_bucket{phase="fetch",le="0.0025"} 1' in text
+        assert 'triangulator_phase_seconds_bucket{phase="fetch",le="+Inf"} 2' in text
+
+    def test_tailles_lues_dans_le_resultat(self, sample_points_square):
+        """Nombres de points et de triangles lus dans les en-tetes binaires."""
+        metrics = Metrics()
+        data = encode_triangles(sample_points_square, [(0, 1, 2), (0, 2, 3)])
+
+        metrics.observe_result(data)
+
+        assert metrics.points.snapshot()[1:] == (1, 4.0)
+        assert metrics.triangles.snapshot()[1:] == (1, 2.0)
+        assert metrics.response_bytes.snapshot()[1:] == (1, float(len(data)))
+
+    def test_reponses_et_erreurs(self):
+        """Reponses comptees par statut, erreurs par code."""
+        metrics = Metrics()
+        metrics.count_response(200)
+        metrics.count_response(404, "POINTSET_NOT_FOUND")
+        metrics.count_response(404, "POINTSET_NOT_FOUND")
+
+        text = metrics.render()
+
+        assert 'triangulator_responses_total{status="200"} 1' in text
+        assert 'triangulator_responses_total{status="404"} 2' in text
+        assert 'triangulator_errors_total{code="POINTSET_NOT_FOUND"} 2' in text
+
+    def test_valeurs_supplementaires(self):
+        """Les valeurs supplementaires sont rendues avec leur type."""
+        text = Metrics().render([("triangulator_cache_entries", "gauge", "Entrees.", 3)])
+
+        assert "# TYPE triangulator_cache_entries gauge\ntriangulator_cache_entries 3\n" in text
@@ -0,0 +1,82 @@
+"""Tests unitaires pour les ordres d'insertion spatiaux."""
+
+import random
+
+import pytest
+
+from triangulator import ordering
+from triangulator.ordering import ORDERS, brio_order, hilbert_keys, hilbert_order
+
+
+@pytest.fixture
+def coords():
+    """Abscisses et ordonnees de 500 points aleatoires."""
+    rng = random.Random(7)
+    xs = [rng.uniform(-50, 50) for _ in range(500)]
+    ys = [rng.uniform(0, 10) for _ in range(500)]
+    return xs, ys
+
+
+class TestHilbertKeys:
+    """Tests du calcul des cles de Hilbert."""
+
+    def test_numpy_et_python_identiques(self, coords):
+        """Les deux chemins de calcul donnent les memes cles."""
+        pytest.importorskip("numpy")
+        xs, ys = coords
+
+        assert ordering._hilbert_keys_numpy(xs, ys) == ordering._hilbert_keys_python(xs, ys)
+
+    def test_sans_numpy(self, coords, monkeypatch):
+        """Le chemin Python pur est utilise sans NumPy."""
+        xs, ys = coords
+        expected = ordering._hilbert_keys_python(xs, ys)
+        monkeypatch.setattr(ordering, "np", None)
+
+        assert hilbert_keys(xs, ys) == expected
+
+    def test_premier_niveau(self):
+        """Les quadrants sont parcourus bas gauche, haut gauche, haut droit, bas droit."""
+        xs = [0.0, 0.0, 1.0, 1.0]
+        ys = [0.0, 1.0, 1.0, 0.0]
+
+        keys = hilbert_keys(xs, ys)
+
+        assert keys == sorted(keys)
+
+    def test_points_confondus(self):
+        """Une boite englobante vide ne provoque pas de division par zero."""
+        assert hilbert_keys([1.0, 1.0], [2.0, 2.0]) == [0, 0]
+
+    def test_vide(self):
+        """Aucun point."""
+        assert hilbert_keys([], []) == []
+
+
+class TestOrders:
+    """Tests des ordres d'insertion."""
+
+    @pytest.mark.parametrize("name", sorted(ORDERS))
+    def test_permutation(self, name, coords):
+        """Chaque ordre est une permutation des indices demandes."""
+        xs, ys = coords
+        indices = range(0, 500, 3)
+
+        assert sorted(ORDERS[name](xs, ys, indices)) == list(indices)
+
+    def test_hilbert_localite(self, coords):
+        """Le parcours de Hilbert raccourcit le trajet entre points successifs."""
+        xs, ys = coords
+
+        def length(order):
+            return sum(abs(xs[a] - xs[b]) + abs(ys[a] - ys[b])
+                       for a, b in zip(order, order[1:]))
+
+        assert length(hilbert_order(xs, ys, range(500))) < length(range(500)) / 5
+
+    def test_brio_reproductible(self, coords):
+        """BRIO avec la meme graine donne le meme ordre."""
+        xs, ys = coords
+
+        assert brio_order(xs, ys, range(500)) == brio_order(xs, ys, range(500))
+        assert brio_order(xs, ys, range(500)) != brio_order(xs, ys, range(500), seed=1)
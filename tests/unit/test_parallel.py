@@ -0,0 +1,90 @@
+"""Tests unitaires pour la triangulation parallele par bandes."""
+
+import random
+
+import pytest
+
+from triangulator import parallel
+from triangulator.binary_format import TrianglesView, decode_triangles, encode_triangles
+from triangulator.predicates import incircle_indexed
+from triangulator.triangulation import triangulate
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _shutdown_pool():
+    """Arrete les processus du pool partage en fin de module."""
+    yield
+    parallel.shutdown()
+
+
+@pytest.fixture
+def small_strips(monkeypatch):
+    """Bandes de 100 points, pour paralleliser de petits ensembles."""
+    monkeypatch.setattr(parallel, "MIN_STRIP_POINTS", 100)
+
+
+def _normalized(triangles):
+    """Ensemble des triangles, independamment de l'ordre et de la rotation."""
+    return {frozenset(tri) for tri in triangles}
+
+
+def _assert_delaunay(points, triangles):
+    """Verifie que chaque arete interieure est localement de Delaunay."""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    opposite = {}
+    for a, b, c in triangles:
+        for u, v, w in ((a, b, c), (b, c, a), (c, a, b)):
+            assert (u, v) not in opposite
+            opposite[u, v] = w
+    for (u, v), w in opposite.items():
+        other = opposite.get((v, u))
+        if other is not None:
+            assert incircle_indexed(xs, ys, u, v, w, other) <= 0
+
+
+class TestParallelTriangulation:
+    """Tests du decoupage en bandes et de leur recollement."""
+
+    def test_matches_divide_and_conquer(self, small_strips, sample_points_1000):
+        """Test que le resultat est celui du calcul sequentiel."""
+        triangles = parallel.triangulate(sample_points_1000, workers=3)
+
+        assert isinstance(triangles, TrianglesView)
+        assert _normalized(triangles) == \
+            _normalized(triangulate(sample_points_1000, method="divide-and-conquer"))
+
+    def test_grid_with_duplicates(self, small_strips):
+        """Test points cocycliques, alignes et doublons a cheval sur les bandes."""
+        rng = random.Random(0)
+        points = [(float(rng.randint(0, 30)), float(rng.randint(0, 30))) for _ in range(1500)]
+
+        triangles = parallel.triangulate(points, workers=4)
+
+        _assert_delaunay(points, triangles)
+        assert len(triangles) == len(triangulate(points, method="divide-and-conquer"))
+
+    def test_without_numpy(self, small_strips, monkeypatch, sample_points_1000):
+        """Test du recollement en Python pur."""
+        monkeypatch.setattr(parallel, "np", None)
+
+        triangles = parallel.triangulate(sample_points_1000, workers=2)
+
+        assert _normalized(triangles) == \
+            _normalized(triangulate(sample_points_1000, method="divide-and-conquer"))
+
+    def test_encoded_like_a_list(self, small_strips, sample_points_1000):
+        """Test que le resultat s'encode comme la liste de ses triangles."""
+        triangles = parallel.triangulate(sample_points_1000, workers=2)
+
+        data = encode_triangles(sample_points_1000, triangles)
+
+        assert data == encode_triangles(sample_points_1000, triangles.tolist())
+        assert decode_triangles(data)[1] == triangles.tolist()
+
+    def test_small_input_sequential(self, sample_points_100):
+        """Test qu'un petit ensemble est triangule sans processus."""
+        triangles = parallel.triangulate(sample_points_100, workers=4)
+
+        assert isinstance(triangles, list)
+        assert triangles == triangulate(sample_points_100, method="divide-and-conquer")
@@ -0,0 +1,91 @@
+"""Tests unitaires pour les predicats geometriques robustes."""
+
+import random
+from fractions import Fraction
+
+import pytest
+
+from triangulator.predicates import (
+    incircle,
+    incircle_indexed,
+    orient2d,
+    orient2d_indexed,
+)
+
+
+def _sign(value):
+    """Retourne -1, 0 ou 1."""
+    return (value > 0) - (value < 0)
+
+
+def _orient_exact(ax, ay, bx, by, cx, cy):
+    """Orientation calculee en fractions."""
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    return _sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+
+class TestOrient2d:
+    """Tests du predicat d'orientation."""
+
+    def test_sens_direct(self):
+        """Point a gauche -> positif, a droite -> negatif."""
+        assert orient2d(0.0, 0.0, 1.0, 0.0, 0.0, 1.0) > 0
+        assert orient2d(0.0, 0.0, 1.0, 0.0, 0.0, -1.0) < 0
+
+    def test_alignes_exactement_nul(self):
+        """Points exactement alignes -> 0."""
+        assert orient2d(0.0, 0.0, 1.0, 1.0, 3.0, 3.0) == 0
+        assert orient2d(0.1, 0.1, 0.2, 0.2, 0.3, 0.3) == _orient_exact(
+            0.1, 0.1, 0.2, 0.2, 0.3, 0.3
+        )
+
+    def test_quasi_alignes(self):
+        """Le signe reste exact pres de la droite, la ou le calcul flottant se trompe."""
+        rng = random.Random(3)
+        base = 0.5
+        for _ in range(2000):
+            px = base + rng.randrange(-256, 256) * 2.0 ** -53
+            py = base + rng.randrange(-256, 256) * 2.0 ** -53
+            expected = _orient_exact(px, py, 12.0, 12.0, 24.0, 24.0)
+            assert _sign(orient2d(px, py, 12.0, 12.0, 24.0, 24.0)) == expected
+
+    def test_variante_indexee(self):
+        """orient2d_indexed donne le meme signe qu'orient2d."""
+        rng = random.Random(5)
+        xs = [rng.uniform(-1, 1) for _ in range(30)]
+        ys = [rng.uniform(-1, 1) for _ in range(30)]
+        for a, b, c in zip(range(10), range(10, 20), range(20, 30)):
+            assert _sign(orient2d_indexed(xs, ys, a, b, c)) == _sign(
+                orient2d(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+            )
+
+
+class TestIncircle:
+    """Tests du predicat du cercle circonscrit."""
+
+    def test_dedans_dehors(self):
+        """Centre -> positif, point lointain -> negatif."""
+        assert incircle(0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 0.25, 0.25) > 0
+        assert incircle(0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 5.0, 5.0) < 0
+
+    def test_cocycliques_nul(self):
+        """Quatrieme sommet d'un carre -> exactement 0."""
+        assert incircle(0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0) == 0
+
+    def test_quasi_cocycliques(self):
+        """Le signe est exact pour des points a quelques ulp du cercle."""
+        for k in (-3, -1, 1, 3):
+            dy = 1.0 + k * 2.0 ** -52
+            value = incircle(0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, dy)
+            assert _sign(value) == (-1 if k > 0 else 1)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_variante_indexee(self, seed):
+        """incircle_indexed donne le meme signe qu'incircle."""
+        rng = random.Random(seed)
+        xs = [rng.uniform(-1, 1) for _ in range(4)]
+        ys = [rng.uniform(-1, 1) for _ in range(4)]
+
+        assert _sign(incircle_indexed(xs, ys, 0, 1, 2, 3)) == _sign(
+            incircle(xs[0], ys[0], xs[1], ys[1], xs[2], ys[2], xs[3], ys[3])
+        )
@@ -0,0 +1,127 @@
+"""Tests unitaires pour la preparation des points."""
+
+import math
+import random
+
+import pytest
+
+from triangulator import preprocessing
+from triangulator.binary_format import PointSetView, encode_pointset
+from triangulator.preprocessing import PreparedPoints, prepare
+
+
+@pytest.fixture(params=["numpy", "python"])
+def chemin(request, monkeypatch):
+    """Execute le test avec NumPy puis en Python pur."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(preprocessing, "np", None)
+    return request.param
+
+
+class TestPrepare:
+    """Tests de `prepare`."""
+
+    def test_doublons_premiere_occurrence(self, chemin):
+        """Les doublons sont elimines en gardant la premiere occurrence."""
+        points = [(1, 1), (0, 0), (1, 0), (0, 0), (1, 1), (0, 1)]
+
+        prepared = prepare(points)
+
+        assert prepared.unique == [0, 1, 2, 5]
+        assert len(prepared) == 6
+        assert prepared.xs == [1.0, 0.0, 1.0, 0.0, 1.0, 0.0]
+
+    def test_zero_negatif(self, chemin):
+        """-0.0 et 0.0 designent le meme point."""
+        prepared = prepare([(0.0, 0.0), (1.0, 0.0), (-0.0, 0.0), (0.0, 1.0)])
+
+        assert prepared.unique == [0, 1, 3]
+
+    def test_boite_englobante(self, chemin):
+        """La boite englobante couvre tous les points."""
+        prepared = prepare([(2, -1), (5, 3), (-4, 0), (0, 7)])
+
+        assert prepared.bounds == (-4.0, -1.0, 5.0, 7.0)
+
+    def test_ordre_lexicographique(self, chemin):
+        """Les points distincts sont tries par (x, y)."""
+        prepared = prepare([(1, 0), (0, 1), (0, 0), (1, 0), (0, 1)])
+
+        assert prepared.lexicographic() == [2, 1, 0]
+
+    def test_pointset_view(self, chemin):
+        """Un PointSetView donne le meme resultat qu'une liste."""
+        rng = random.Random(3)
+        points = [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(300)]
+        view = PointSetView.from_bytes(encode_pointset(points))
+
+        from_view = prepare(view)
+        from_list = prepare(points)
+
+        assert from_view.unique == from_list.unique
+        assert from_view.bounds == from_list.bounds
+        assert from_view.lexicographic() == from_list.lexicographic()
+
+    def test_numpy_et_python_identiques(self, monkeypatch):
+        """Les deux chemins donnent le meme resultat."""
+        pytest.importorskip("numpy")
+        rng = random.Random(5)
+        points = [(rng.uniform(-1, 1), rng.randint(0, 9)) for _ in range(500)]
+        points += points[:50]
+
+        vectorized = prepare(points)
+        monkeypatch.setattr(preprocessing, "np", None)
+        pure = prepare(points)
+
+        assert vectorized.unique == pure.unique
+        assert vectorized.bounds == pure.bounds
+        assert vectorized.lexicographic() == pure.lexicographic()
+
+    def test_idempotent(self, chemin):
+        """Des points deja prepares sont retournes tels quels."""
+        prepared = prepare([(0, 0), (1, 0), (0, 1)])
+
+        assert prepare(prepared) is prepared
+        assert isinstance(prepared, PreparedPoints)
+
+    def test_durees(self, chemin):
+        """Chaque etape est chronometree."""
+        prepared = prepare([(0, 0), (1, 0), (0, 1)])
+
+        assert set(prepared.timings) == {"validation", "dedupe", "bounds", "collinearity"}
+        assert all(d >= 0 for d in prepared.timings.values())
+
+
+class TestPrepareErreurs:
+    """Tests des erreurs de `prepare`."""
+
+    def test_moins_de_3_points(self, chemin):
+        """Moins de 3 points."""
+        with pytest.raises(ValueError, match="Au moins 3 points sont requis"):
+            prepare([(0, 0), (1, 1)])
+
+    @pytest.mark.parametrize("bad", [math.nan, math.inf, -math.inf])
+    def test_coordonnee_non_finie(self, chemin, bad):
+        """Coordonnee NaN ou infinie."""
+        with pytest.raises(ValueError, match="finies"):
+            prepare([(0, 0), (1, 0), (0, bad)])
+
+    def test_moins_de_3_points_distincts(self, chemin):
+        """Trois points dont deux confondus."""
+        with pytest.raises(ValueError, match="distincts"):
+            prepare([(0, 0), (1, 1), (0, 0)])
+
+    def test_points_alignes(self, chemin):
+        """Points exactement alignes, doublons compris."""
+        with pytest.raises(ValueError, match="alignes"):
+            prepare([(0, 0), (1, 1), (2, 2), (1, 1), (-3, -3)])
+
+    def test_presque_alignes(self, chemin):
+        """Un ecart d'un ulp suffit a rompre l'alignement."""
+        y = math.nextafter(2.0, 3.0)
+
+        prepared = prepare([(0.0, 0.0), (1.0, 1.0), (2.0, y)])
+
+        assert prepared.unique == [0, 1, 2]
@@ -0,0 +1,168 @@
+"""Tests unitaires pour l'ordonnanceur des triangulations."""
+
+import asyncio
+import struct
+import threading
+
+import pytest
+
+from triangulator.scheduler import Scheduler
+from triangulator.service import ServiceError
+
+
+def _pointset(count):
+    """Retourne un PointSet de `count` points a l'origine."""
+    return struct.pack("<L", count) + bytes(8 * count)
+
+
+class TestSchedulerAdmission:
+    """Tests de l'estimation du cout et du choix de la file."""
+
+    def test_lane_from_header(self):
+        """Le nombre de points de l'en-tete choisit la file."""
+        scheduler = Scheduler(large_points=100)
+
+        assert scheduler.admit(_pointset(99)).lane == "small"
+        assert scheduler.admit(_pointset(100)).lane == "large"
+
+    def test_cost_estimate(self):
+        """Le cout estime est proportionnel au nombre de points."""
+        scheduler = Scheduler(seconds_per_point=0.001)
+        ticket = scheduler.admit(_pointset(50))
+
+        assert ticket.points == 50
+        assert ticket.cost == pytest.approx(0.05)
+        assert scheduler.stats()["small"]["backlog"] == pytest.approx(0.05)
+
+    def test_invalid_header_admitted_as_empty(self):
+        """Un en-tete invalide est admis sans cout (le decodage echouera)."""
+        ticket = Scheduler().admit(b"\x01")
+
+        assert ticket.points == 0
+        assert ticket.lane == "small"
+
+    def test_reject_when_backlog_exceeded(self):
+        """Au-dela de l'arriere maximal, 503 avec Retry-After."""
+        scheduler = Scheduler(small_max_backlog=1.0, seconds_per_point=0.01)
+        scheduler.admit(_pointset(80))
+
+        with pytest.raises(ServiceError) as exc_info:
+            scheduler.admit(_pointset(30))
+
+        assert exc_info.value.status == 503
+        assert exc_info.value.code == "SERVICE_OVERLOADED"
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        assert scheduler.stats()["small"]["rejected"] == 1
+
+    def test_idle_lane_admits_oversized_job(self):
+        """Une file vide admet un travail plus gros que sa limite."""
+        scheduler = Scheduler(large_points=10, large_max_backlog=1.0,
+                              seconds_per_point=1.0)
+
+        assert scheduler.admit(_pointset(100)).lane == "large"
+
+    def test_large_backlog_does_not_reject_small(self):
+        """Une file des gros travaux pleine n'empeche pas les petits."""
+        scheduler = Scheduler(large_points=100, large_max_backlog=1.0,
+                              seconds_per_point=0.01)
+        scheduler.admit(_pointset(200))
+        with pytest.raises(ServiceError):
+            scheduler.admit(_pointset(200))
+
+        assert scheduler.admit(_pointset(10)).lane == "small"
+
+    def test_unused_ticket_releases_backlog(self):
+        """Un ticket ferme sans calcul rend sa reservation."""
+        scheduler = Scheduler(seconds_per_point=0.01)
+        scheduler.admit(_pointset(10)).close()
+
+        assert scheduler.stats()["small"]["backlog"] == 0.0
+
+
+class TestSchedulerConcurrency:
+    """Tests des places de calcul de chaque file."""
+
+    def test_release_updates_estimate(self):
+        """La duree observee corrige l'estimation par point."""
+        scheduler = Scheduler(seconds_per_point=1.0)
+        with scheduler.admit(_pointset(1000)):
+            pass
+
+        stats = scheduler.stats()
+        assert stats["small"]["running"] == 0
+        assert stats["small"]["backlog"] == 0.0
+        assert stats["seconds_per_point"] < 1.0
+
+    def test_failed_compute_does_not_update_estimate(self):
+        """Un calcul en echec libere sa place sans fausser l'estimation."""
+        scheduler = Scheduler(seconds_per_point=5e-5)
+        for _ in range(10):
+            with pytest.raises(ServiceError):
+                with scheduler.admit(_pointset(100_000)):
+                    raise ServiceError(503, "POOL_SATURATED", "Pool sature")
+
+        stats = scheduler.stats()
+        assert stats["seconds_per_point"] == 5e-5
+        assert stats["large"]["running"] == 0
+        assert stats["large"]["backlog"] == 0.0
+
+    def test_concurrency_limit(self):
+        """Un travail attend qu'une place de sa file se libere."""
+        scheduler = Scheduler(small_concurrency=1)
+        first = scheduler.admit(_pointset(1))
+        second = scheduler.admit(_pointset(1))
+        entered = threading.Event()
+
+        def run():
+            with second:
+                entered.set()
+
+        with first:
+            thread = threading.Thread(target=run)
+            thread.start()
+            assert not entered.wait(0.05)
+            assert scheduler.stats()["small"]["waiting"] == 1
+        thread.join(timeout=5)
+
+        assert entered.is_set()
+        assert second.waited > 0
+        assert scheduler.stats()["small"]["running"] == 0
+
+    def test_lanes_are_independent(self):
+        """Un gros travail en cours n'occupe pas la place des petits."""
+        scheduler = Scheduler(large_points=100, small_concurrency=1,
+                              large_concurrency=1)
+        with scheduler.admit(_pointset(100)), scheduler.admit(_pointset(1)) as small:
+            assert small.waited < 0.05
+            assert scheduler.stats()["large"]["running"] == 1
+            assert scheduler.stats()["small"]["running"] == 1
+
+    def test_async_wait_and_cancel(self):
+        """En asyncio, un travail annule pendant son attente rend sa place."""
+        scheduler = Scheduler(small_concurrency=1)
+
+        async def scenario():
+            first = scheduler.admit(_pointset(1))
+            await first.__aenter__()
+
+            async def wait():
+                async with scheduler.admit(_pointset(1)):
+                    pass
+
+            cancelled = asyncio.ensure_future(wait())
+            waiting = asyncio.ensure_future(wait())
+            await asyncio.sleep(0.01)
+            assert scheduler.stats()["small"]["waiting"] == 2
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            await first.__aexit__(None, None, None)
+            await asyncio.wait_for(waiting, timeout=5)
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+
+        asyncio.run(scenario())
+
+        stats = scheduler.stats()["small"]
+        assert stats["running"] == 0
+        assert stats["waiting"] == 0
+        assert stats["backlog"] == pytest.approx(0.0)
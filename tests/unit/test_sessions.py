@@ -0,0 +1,59 @@
+"""Tests unitaires pour le magasin de sessions incrementales."""
+
+from triangulator.sessions import SessionStore
+
+
+class TestSessionStore:
+    """Tests de creation, d'expiration et de fermeture des sessions."""
+
+    def test_create_then_get(self):
+        """Une session creee est retrouvee par son identifiant."""
+        store = SessionStore()
+        session = store.create("triangulation")
+
+        assert store.get(session.id) is session
+        assert session.triangulation == "triangulation"
+
+    def test_unknown_session(self):
+        """Un identifiant inconnu ne donne aucune session."""
+        assert SessionStore().get("inconnue") is None
+
+    def test_expires_after_ttl(self, fake_clock):
+        """Une session sans acces expire apres le TTL."""
+        store = SessionStore(ttl=10.0, clock=fake_clock)
+        session = store.create("t")
+
+        fake_clock.now = 10.0
+
+        assert store.get(session.id) is None
+        assert store.stats()["expired"] == 1
+
+    def test_access_refreshes_ttl(self, fake_clock):
+        """Chaque acces repousse l'expiration."""
+        store = SessionStore(ttl=10.0, clock=fake_clock)
+        session = store.create("t")
+
+        fake_clock.now = 8.0
+        store.get(session.id)
+        fake_clock.now = 16.0
+
+        assert store.get(session.id) is session
+
+    def test_max_sessions(self, fake_clock):
+        """Au-dela de max_sessions, aucune session n'est creee."""
+        store = SessionStore(ttl=10.0, max_sessions=1, clock=fake_clock)
+        store.create("t")
+
+        assert store.create("t") is None
+        fake_clock.now = 10.0
+        assert store.create("t") is not None
+
+    def test_discard(self):
+        """Une session fermee n'existe plus."""
+        store = SessionStore()
+        session = store.create("t")
+
+        assert store.discard(session.id)
+        assert not store.discard(session.id)
+        assert store.get(session.id) is None
+        assert store.stats() == {"sessions": 0, "created": 1, "expired": 0}
@@ -0,0 +1,151 @@
+"""Tests unitaires pour la deduplication des calculs concurrents."""
+
+import asyncio
+import threading
+
+import pytest
+
+from triangulator.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Tests de la deduplication entre threads."""
+
+    def _run_concurrently(self, flight, key, fn, count):
+        """Lance `count` appels concurrents et retourne leurs resultats."""
+        results = [None] * count
+
+        def worker(i):
+            try:
+                results[i] = flight.do(key, fn)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_appels_concurrents_partages(self):
+        """Les appels concurrents de meme cle executent un seul calcul."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(1.0)
+            return b"result"
+
+        timer = threading.Timer(0.1, release.set)
+        timer.start()
+        results = self._run_concurrently(flight, "k", compute, 5)
+
+        assert results == [b"result"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"leaders": 1, "followers": 4, "in_flight": 0}
+
+    def test_exception_partagee(self):
+        """L'exception du leader est levee chez tous les appelants."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(1.0)
+            raise ValueError("echec")
+
+        timer = threading.Timer(0.1, release.set)
+        timer.start()
+        results = self._run_concurrently(flight, "k", compute, 3)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.stats()["in_flight"] == 0
+
+    def test_appels_successifs_recalcules(self):
+        """Un appel termine n'est pas memorise."""
+        flight = SingleFlight()
+        calls = []
+
+        for _ in range(2):
+            flight.do("k", calls.append, 1)
+
+        assert len(calls) == 2
+        assert flight.stats()["leaders"] == 2
+
+    def test_cles_differentes_independantes(self):
+        """Deux cles differentes ne sont pas partagees."""
+        flight = SingleFlight()
+
+        assert flight.do("a", str.upper, "a") == "A"
+        assert flight.do("b", str.upper, "b") == "B"
+        assert flight.stats()["followers"] == 0
+
+
+class TestAsyncSingleFlight:
+    """Tests de la deduplication dans une boucle asyncio."""
+
+    def test_appels_concurrents_partages(self):
+        """Les coroutines concurrentes de meme cle executent un seul calcul."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+
+        assert asyncio.run(run()) == [b"result"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"leaders": 1, "followers": 4, "in_flight": 0}
+
+    def test_exception_partagee(self):
+        """L'exception du leader est levee chez tous les appelants."""
+        flight = AsyncSingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            raise ValueError("echec")
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("k", compute) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_exception_sans_follower(self):
+        """Sans follower, l'exception est levee normalement."""
+        flight = AsyncSingleFlight()
+
+        async def compute():
+            raise ValueError("echec")
+
+        with pytest.raises(ValueError):
+            asyncio.run(flight.do("k", compute))
+
+    def test_leader_annule_repris_par_follower(self):
+        """Si le leader est annule, un follower refait le calcul."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"result"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(run()) == b"result"
+        assert len(calls) == 2
@@ -0,0 +1,119 @@
+"""Tests unitaires pour le transport par memoire partagee."""
+
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import pytest
+
+from triangulator.binary_format import encode_pointset, encoded_triangles_size
+from triangulator.service import ServiceError, compute_triangulation
+from triangulator.transport import SharedJob, compute_shared, output_size
+
+
+def _exists(name):
+    """Indique si un segment de memoire partagee existe encore."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    return True
+
+
+@pytest.fixture
+def job(sample_points_100):
+    """Travail sur 100 points, supprime en fin de test."""
+    data = encode_pointset(sample_points_100)
+    job = SharedJob(data, output_size(data))
+    yield job
+    job.close()
+
+
+class TestOutputSize:
+    """Tests de la taille reservee au resultat."""
+
+    def test_taille_maximale(self, sample_points_100):
+        """La taille couvre 2n triangles."""
+        assert output_size(encode_pointset(sample_points_100)) == \
+            encoded_triangles_size(100, 200)
+
+    def test_entete_invalide(self):
+        """Un PointSet tronque n'a pas de taille."""
+        assert output_size(b"\x01") is None
+
+
+class TestComputeShared:
+    """Tests du calcul en memoire partagee."""
+
+    def test_resultat_identique(self, job, sample_points_100):
+        """Les octets ecrits sont ceux de compute_triangulation."""
+        length = compute_shared(*job.arguments(), "bowyer-watson")
+
+        expected = compute_triangulation(encode_pointset(sample_points_100), "bowyer-watson")
+        assert job.read(length) == expected
+
+    def test_erreur_du_calcul(self):
+        """Une ServiceError du calcul est levee telle quelle."""
+        data = encode_pointset([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)])
+        job = SharedJob(data, output_size(data))
+        try:
+            with pytest.raises(ServiceError) as excinfo:
+                compute_shared(*job.arguments(), "bowyer-watson")
+            assert excinfo.value.code == "TRIANGULATION_FAILED"
+        finally:
+            job.close()
+
+
+class TestSharedJob:
+    """Tests du cycle de vie des segments."""
+
+    def test_close_supprime_les_segments(self, job):
+        """Fermer le travail supprime les deux segments, une seule fois."""
+        names = [job.input.name, job.output.name]
+
+        job.close()
+        job.close()
+
+        assert not any(_exists(name) for name in names)
+
+    def test_resultat_puis_suppression(self, job):
+        """La fin du calcul transmet le resultat et supprime les segments."""
+        inner = Future()
+        outer = job.attach(inner)
+        job.output.buf[:3] = b"abc"
+
+        inner.set_result(3)
+
+        assert outer.result() == b"abc"
+        assert not _exists(job.output.name)
+
+    def test_erreur_puis_suppression(self, job):
+        """Une erreur du calcul est transmise et les segments supprimes."""
+        inner = Future()
+        outer = job.attach(inner)
+
+        inner.set_exception(RuntimeError("processus mort"))
+
+        with pytest.raises(RuntimeError):
+            outer.result()
+        assert not _exists(job.input.name)
+
+    def test_annulation_avant_calcul(self, job):
+        """Annuler un calcul en attente supprime les segments."""
+        outer = job.attach(Future())
+
+        assert outer.cancel()
+        assert outer.cancelled()
+        assert not _exists(job.input.name)
+
+    def test_annulation_pendant_calcul(self, job):
+        """Un calcul en cours garde ses segments jusqu'a sa fin."""
+        inner = Future()
+        inner.set_running_or_notify_cancel()
+        outer = job.attach(inner)
+
+        assert not outer.cancel()
+        assert _exists(job.output.name)
+
+        inner.set_result(0)
+        assert not _exists(job.output.name)
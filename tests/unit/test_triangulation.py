@@ -2,7 +2,15 @@
 
 import pytest
 
-from triangulator.triangulation import triangulate
+from triangulator.binary_format import PointSetView, decode_pointset, encode_pointset
+from triangulator.deadline import Deadline, TriangulationCancelled
+from triangulator.triangulation import (
+    ENGINES,
+    Triangulation,
+    _TriangleStore,
+    triangulate,
+)
+from triangulator.ordering import ORDERS
 
 
 # =============================================================================
@@ -212,3 +220,312 @@ class TestTriangulationFormesSpeciales:
 
         # Doit produire plus de triangles qu'un simple carré
         assert len(triangles) >= 2
+
+
+def _in_circumcircle(points, tri, p):
+    """Teste si p est strictement dans le cercle circonscrit de tri."""
+    (ax, ay), (bx, by), (cx, cy) = (points[i] for i in tri)
+    px, py = p
+    adx, ady = ax - px, ay - py
+    bdx, bdy = bx - px, by - py
+    cdx, cdy = cx - px, cy - py
+    det = (
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        - (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+    orient = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return det * orient > 1e-9
+
+
+class TestTriangulationDelaunay:
+    """Tests de la propriete de Delaunay et de la coherence du maillage."""
+
+    def test_empty_circumcircle(self, sample_points_100):
+        """Test qu'aucun point n'est dans le cercle circonscrit d'un triangle."""
+        triangles = triangulate(sample_points_100)
+
+        for tri in triangles:
+            for i, p in enumerate(sample_points_100):
+                if i not in tri:
+                    assert not _in_circumcircle(sample_points_100, tri, p)
+
+    def test_no_overlapping_triangles(self, sample_points_1000):
+        """Test que chaque arete orientee n'appartient qu'a un seul triangle."""
+        triangles = triangulate(sample_points_1000)
+
+        edges = set()
+        for i1, i2, i3 in triangles:
+            for edge in ((i1, i2), (i2, i3), (i3, i1)):
+                assert edge not in edges
+                edges.add(edge)
+
+    def test_regular_grid(self):
+        """Test grille reguliere (points cocycliques) : 2 triangles par case."""
+        points = [(float(i), float(j)) for i in range(10) for j in range(10)]
+        triangles = triangulate(points)
+
+        assert len(triangles) == 2 * 9 * 9
+
+    def test_duplicates_are_ignored(self):
+        """Test que les doublons n'apparaissent pas dans les triangles."""
+        points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (1.0, 0.0)]
+        triangles = triangulate(points)
+
+        assert len(triangles) == 1
+        assert 3 not in triangles[0]
+
+
+class TestTriangulationMethods:
+    """Tests du choix de moteur de triangulation."""
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_each_engine_triangulates_square(self, method, sample_points_square):
+        """Test que chaque moteur triangule un carre en 2 triangles."""
+        triangles = triangulate(sample_points_square, method=method)
+
+        assert len(triangles) == 2
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_each_engine_is_delaunay(self, method, sample_points_100):
+        """Test de la propriete de Delaunay pour chaque moteur."""
+        triangles = triangulate(sample_points_100, method=method)
+
+        for tri in triangles:
+            for i, p in enumerate(sample_points_100):
+                if i not in tri:
+                    assert not _in_circumcircle(sample_points_100, tri, p)
+
+    def test_engines_agree(self, sample_points_1000):
+        """Test que les triangles Bowyer-Watson sont ceux de diviser pour regner."""
+        bw = triangulate(sample_points_1000, method="bowyer-watson")
+        dc = triangulate(sample_points_1000, method="divide-and-conquer")
+
+        assert {frozenset(t) for t in bw} == {frozenset(t) for t in dc}
+
+    def test_divide_and_conquer_duplicates(self, sample_points_duplicate):
+        """Test que diviser pour regner ignore les doublons."""
+        triangles = triangulate(sample_points_duplicate, method="divide-and-conquer")
+
+        assert len(triangles) == 1
+        assert set(triangles[0]) == {0, 1, 3}
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_accepts_point_set_view(self, method, sample_points_100):
+        """Test que triangulate accepte une PointSetView."""
+        data = encode_pointset(sample_points_100)
+
+        from_view = triangulate(PointSetView.from_bytes(data), method=method)
+        from_list = triangulate(decode_pointset(data), method=method)
+
+        assert from_view == from_list
+
+    @pytest.mark.parametrize("order", sorted(ORDERS))
+    def test_insertion_order_same_triangulation(self, order, sample_points_1000):
+        """Test que l'ordre d'insertion ne change pas les triangles."""
+        reference = triangulate(sample_points_1000, order="input")
+        triangles = triangulate(sample_points_1000, order=order)
+
+        assert {frozenset(t) for t in triangles} == {frozenset(t) for t in reference}
+
+    @pytest.mark.parametrize("order", sorted(ORDERS))
+    def test_insertion_order_keeps_first_duplicate(self, order):
+        """Test que les indices restent ceux d'origine (premier doublon)."""
+        points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (1.0, 0.0), (0.0, 0.0)]
+        triangles = triangulate(points, order=order)
+
+        assert [set(t) for t in triangles] == [{0, 1, 2}]
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_nearly_collinear_points(self, method):
+        """Test points presque alignes : triangules, pas rejetes."""
+        points = [(0.0, 0.0), (1.0, 1e-12), (2.0, 0.0)]
+        triangles = triangulate(points, method=method)
+
+        assert [set(t) for t in triangles] == [{0, 1, 2}]
+
+    def test_engines_agree_on_flat_hull(self):
+        """Test enveloppe presque plate : memes triangles pour les deux moteurs."""
+        points = [(float(i), 1e-13 * ((i * 7919) % 13)) for i in range(60)]
+        points.append((30.0, 10.0))
+
+        bw = triangulate(points, method="bowyer-watson")
+        dc = triangulate(points, method="divide-and-conquer")
+
+        assert {frozenset(t) for t in bw} == {frozenset(t) for t in dc}
+
+    @pytest.mark.parametrize("bad", [float("inf"), float("nan")])
+    def test_non_finite_coordinates_raise(self, bad):
+        """Test coordonnee infinie ou NaN -> ValueError."""
+        with pytest.raises(ValueError):
+            triangulate([(0.0, 0.0), (1.0, 0.0), (bad, 1.0)])
+
+    @pytest.mark.parametrize("method", ["bowyer-watson", "divide-and-conquer"])
+    def test_timings(self, method, sample_points_triangle):
+        """Test durees des etapes de preparation et de la triangulation."""
+        timings = {}
+
+        triangulate(sample_points_triangle, method=method, timings=timings)
+
+        assert set(timings) == {
+            "validation", "dedupe", "bounds", "collinearity", "triangulation"
+        }
+
+    def test_unknown_order_raises(self, sample_points_triangle):
+        """Test ordre d'insertion inconnu -> ValueError."""
+        with pytest.raises(ValueError):
+            triangulate(sample_points_triangle, order="inconnu")
+
+    def test_unknown_method_raises(self, sample_points_triangle):
+        """Test methode inconnue -> ValueError."""
+        with pytest.raises(ValueError):
+            triangulate(sample_points_triangle, method="inconnue")
+
+
+def _normalized(triangles):
+    """Ensemble des triangles, independamment de l'ordre et de la rotation."""
+    return {frozenset(tri) for tri in triangles}
+
+
+class TestTriangulationIncremental:
+    """Tests de la triangulation incrementale (`Triangulation.insert`)."""
+
+    def test_insert_matches_full_triangulation(self, sample_points_1000):
+        """Test que des ajouts successifs donnent la triangulation complete."""
+        triangulation = Triangulation(sample_points_1000[:200])
+        for start in range(200, 1000, 250):
+            triangulation.insert(sample_points_1000[start:start + 250])
+
+        assert len(triangulation) == 1000
+        assert _normalized(triangulation.triangles()) == \
+            _normalized(triangulate(sample_points_1000))
+
+    def test_insert_outside_hull(self):
+        """Test d'ajouts hors de l'enveloppe convexe."""
+        points = [(0.0, 0.0), (1.0, 0.1), (0.9, 1.2), (0.1, 0.8)]
+        outside = [(-2.0, 0.5), (3.0, 3.5), (0.6, -4.0)]
+        triangulation = Triangulation(points)
+        triangulation.insert(outside)
+
+        assert _normalized(triangulation.triangles()) == \
+            _normalized(triangulate(points + outside))
+
+    def test_insert_duplicates_ignored(self, sample_points_square):
+        """Test qu'un point deja present garde son premier indice."""
+        triangulation = Triangulation(sample_points_square)
+        triangulation.insert([sample_points_square[0], (0.5, 0.5), (0.5, 0.5)])
+
+        indices = {i for tri in triangulation.triangles() for i in tri}
+        assert len(triangulation) == 7
+        assert indices == {0, 1, 2, 3, 5}
+
+    def test_insert_pointset_view(self, sample_points_square):
+        """Test d'ajout depuis un PointSet decode."""
+        triangulation = Triangulation(sample_points_square)
+        triangulation.insert(PointSetView.from_bytes(encode_pointset([(0.5, 0.25)])))
+
+        assert len(triangulation.triangles()) == 4
+        assert triangulation.points()[-1] == (0.5, 0.25)
+
+    def test_invalid_insert_leaves_triangulation_unchanged(self, sample_points_square):
+        """Test qu'un ajout invalide ne modifie pas la triangulation."""
+        triangulation = Triangulation(sample_points_square)
+        before = triangulation.triangles()
+
+        with pytest.raises(ValueError):
+            triangulation.insert([(0.5, 0.5), (float("nan"), 0.0)])
+
+        assert len(triangulation) == 4
+        assert triangulation.triangles() == before
+
+
+class TestTriangulationDeadline:
+    """Tests de l'interruption des moteurs par un `Deadline`."""
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_cancelled_before_start(self, method, sample_points_100):
+        """Test qu'un calcul annule ne commence pas."""
+        deadline = Deadline()
+        deadline.cancel()
+
+        with pytest.raises(TriangulationCancelled):
+            triangulate(sample_points_100, method=method, deadline=deadline)
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_checked_during_computation(self, method, sample_points_1000, fake_clock):
+        """Test que le moteur verifie le delai en cours de calcul."""
+        fake_clock.tick = 1.0
+        deadline = Deadline(5.0, clock=fake_clock)
+
+        with pytest.raises(TriangulationCancelled):
+            triangulate(sample_points_1000, method=method, deadline=deadline)
+        assert fake_clock.now > 3.0
+
+    @pytest.mark.parametrize("method", sorted(ENGINES))
+    def test_unlimited_deadline_same_result(self, method, sample_points_1000):
+        """Test qu'un delai non atteint ne change pas le resultat."""
+        assert triangulate(sample_points_1000, method=method, deadline=Deadline(60.0)) \
+            == triangulate(sample_points_1000, method=method)
+
+
+class TestTriangleStore:
+    """Tests du stockage des triangles de Bowyer-Watson."""
+
+    @staticmethod
+    def _store():
+        """Stockage sur des sommets de parabole (jamais 3 alignes)."""
+        return _TriangleStore([float(i) for i in range(10)],
+                              [float(i * i) for i in range(10)])
+
+    def test_emplacement_recycle(self):
+        """Un triangle supprime libere son emplacement pour le suivant."""
+        store = self._store()
+        first = store.add(0, 1, 2, -1, -1, -1)
+        second = store.add(1, 3, 2, -1, first, -1)
+
+        store.remove(first)
+        third = store.add(4, 5, 6, second, -1, -1)
+
+        assert third == first
+        assert len(store.alive) == 2
+        assert list(store.vertices[3 * third:3 * third + 3]) == [4, 5, 6]
+        assert list(store.neighbors[3 * third:3 * third + 3]) == [second, -1, -1]
+
+    def test_triangles_filtre_sommets(self):
+        """Seuls les triangles presents et sans sommet >= n sont retournes."""
+        store = self._store()
+        store.add(0, 1, 2, -1, -1, -1)
+        removed = store.add(0, 2, 3, -1, -1, -1)
+        store.add(0, 1, 9, -1, -1, -1)
+        store.remove(removed)
+
+        assert store.triangles(4) == [(0, 1, 2)]
+
+    def test_cercle_precalcule(self):
+        """Le cercle circonscrit est calcule a la creation du triangle."""
+        store = self._store()
+        t = store.add(1, 4, 2, -1, -1, -1)
+
+        ox, oy, inner, outer = store.circles[4 * t:4 * t + 4]
+        for x, y in ((1.0, 1.0), (4.0, 16.0), (2.0, 4.0)):
+            dist_squared = (x - ox) ** 2 + (y - oy) ** 2
+            assert inner < dist_squared < outer
+            assert dist_squared == pytest.approx(inner)
+
+    def test_triangle_fantome(self):
+        """Un triangle fantome n'a pas de cercle utilisable comme filtre."""
+        store = _TriangleStore([0.0, 1.0, 0.0], [0.0, 0.0, 0.0], ghost=2)
+        t = store.add(0, 1, 2, -1, -1, -1)
+
+        _, _, inner, outer = store.circles[4 * t:4 * t + 4]
+        assert inner < 0
+        assert outer == float("inf")
+
+    def test_cercle_degenere(self):
+        """Un triangle degenere ne permet aucune decision sans predicat."""
+        store = _TriangleStore([0.0, 1.0, 2.0], [0.0, 1.0, 2.0])
+        t = store.add(0, 1, 2, -1, -1, -1)
+
+        _, _, inner, outer = store.circles[4 * t:4 * t + 4]
+        assert inner < 0
+        assert outer == float("inf")
@@ -1,69 +1,661 @@
 """Application Flask pour le service Triangulator."""
 
-from flask import Flask, jsonify, make_response
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from triangulator.binary_format import decode_pointset, encode_triangles
-from triangulator.client import get_pointset
-from triangulator.triangulation import triangulate
+from flask import Flask, Response, jsonify, make_response, request
+
+from triangulator.binary_format import (
+    encode_batch_header,
+    encode_batch_item,
+    encoded_triangles_size,
+)
+from triangulator.cache import (
+    TriangulationCache,
+    content_digest,
+    etag_matches,
+    make_etag,
+    make_key,
+)
+from triangulator.client import (
+    DEFAULT_MANAGER_URL,
+    CircuitBreaker,
+    get_pointset,
+    manager_stats,
+)
+from triangulator.executor import TriangulationPool
+from triangulator.metrics import Metrics, server_timing
+from triangulator.service import (
+    FETCH_ERRORS,
+    ServiceError,
+    check_method,
+    decode_points,
+    encode_triangulation,
+    fetch_error,
+    open_triangulation,
+    stream_triangulation,
+    triangulate_pointset,
+)
+from triangulator.deadline import Deadline
+from triangulator.scheduler import Scheduler
+from triangulator.sessions import SessionStore
+from triangulator.singleflight import SingleFlight
+from triangulator.triangulation import DEFAULT_METHOD
 
 app = Flask(__name__)
+app.config.from_mapping(
+    TRIANGULATION_METHOD=DEFAULT_METHOD,
+    TRIANGULATION_TIMEOUT=30.0,
+    POINTSET_MANAGER_URL=DEFAULT_MANAGER_URL,
+    RESULT_CACHE_MAX_ENTRIES=256,
+    RESULT_CACHE_MAX_BYTES=64 * 1024 * 1024,
+    RESULT_CACHE_DIR=None,
+    RESULT_CACHE_DISK_MAX_ENTRIES=4096,
+    RESULT_CACHE_DISK_MAX_BYTES=1024 * 1024 * 1024,
+    PROCESS_POOL_WORKERS=0,
+    PROCESS_POOL_MAX_PENDING=None,
+    PROCESS_POOL_TIMEOUT=30.0,
+    PROCESS_POOL_SHARED_MEMORY_MIN_BYTES=1024 * 1024,
+    STREAM_MIN_TRIANGLES=100_000,
+    BATCH_MAX_ITEMS=256,
+    BATCH_WORKERS=8,
+    SESSION_TTL=300.0,
+    SESSION_MAX_SESSIONS=64,
+    SCHEDULER_LARGE_POINTS=50_000,
+    SCHEDULER_SMALL_CONCURRENCY=8,
+    SCHEDULER_LARGE_CONCURRENCY=1,
+    SCHEDULER_SMALL_MAX_BACKLOG=10.0,
+    SCHEDULER_LARGE_MAX_BACKLOG=120.0,
+)
+app.config.from_prefixed_env()
+
+result_cache = TriangulationCache(
+    max_entries=app.config["RESULT_CACHE_MAX_ENTRIES"],
+    max_bytes=app.config["RESULT_CACHE_MAX_BYTES"],
+    directory=app.config["RESULT_CACHE_DIR"],
+    disk_max_entries=app.config["RESULT_CACHE_DISK_MAX_ENTRIES"],
+    disk_max_bytes=app.config["RESULT_CACHE_DISK_MAX_BYTES"],
+)
+
+in_flight = SingleFlight()
+
+sessions = SessionStore(
+    ttl=app.config["SESSION_TTL"],
+    max_sessions=app.config["SESSION_MAX_SESSIONS"],
+)
+
+scheduler = Scheduler(
+    large_points=app.config["SCHEDULER_LARGE_POINTS"],
+    small_concurrency=app.config["SCHEDULER_SMALL_CONCURRENCY"],
+    large_concurrency=app.config["SCHEDULER_LARGE_CONCURRENCY"],
+    small_max_backlog=app.config["SCHEDULER_SMALL_MAX_BACKLOG"],
+    large_max_backlog=app.config["SCHEDULER_LARGE_MAX_BACKLOG"],
+)
+
+metrics = Metrics()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Retourne le pool de processus de triangulation configure.
+
+    Le pool est cree a la premiere utilisation a partir de
+    `PROCESS_POOL_WORKERS` (0 : pas de pool, calcul dans le thread de la
+    requete), `PROCESS_POOL_MAX_PENDING`, `PROCESS_POOL_TIMEOUT` et
+    `PROCESS_POOL_SHARED_MEMORY_MIN_BYTES` (taille de PointSet a partir de
+    laquelle il est transmis par memoire partagee, None : jamais).
+
+    Returns:
+        TriangulationPool: Pool partage, ou None si desactive.
+    """
+    global _pool
+    if not app.config["PROCESS_POOL_WORKERS"]:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = TriangulationPool(
+                workers=app.config["PROCESS_POOL_WORKERS"],
+                max_pending=app.config["PROCESS_POOL_MAX_PENDING"],
+                timeout=app.config["PROCESS_POOL_TIMEOUT"],
+                shared_memory_min_bytes=app.config["PROCESS_POOL_SHARED_MEMORY_MIN_BYTES"],
+            )
+        return _pool
+
+
+def _octet_stream(data):
+    """Construit une reponse binaire application/octet-stream."""
+    response = make_response(data)
+    response.headers["Content-Type"] = "application/octet-stream"
+    return response
+
+
+def _streamed_octet_stream(points, triangles):
+    """Construit une reponse binaire envoyee par morceaux."""
+    size, chunks = stream_triangulation(points, triangles)
+    return Response(
+        chunks,
+        mimetype="application/octet-stream",
+        headers={"Content-Length": str(size)},
+    )
+
+
+def _triangulation_result(pointset_id, method, timings, if_none_match=None):
+    """Recupere un PointSet et calcule sa triangulation.
+
+    Sans pool de processus, la triangulation est interrompue apres
+    `TRIANGULATION_TIMEOUT` secondes (None : sans limite) ; avec un pool,
+    apres `PROCESS_POOL_TIMEOUT`. Un resultat d'au moins
+    `STREAM_MIN_TRIANGLES` triangles n'est pas encode ni mis en cache : le
+    couple (points, triangles) est retourne pour etre envoye par morceaux.
+    Si `if_none_match` designe deja la version courante, rien n'est
+    calcule.
+
+    Args:
+        pointset_id: UUID du PointSet a trianguler.
+        method: Nom du moteur de triangulation.
+        timings: Dictionnaire complete avec la duree (secondes) de chaque
+            etape : "fetch", "queue" (attente d'une place dans
+            `scheduler`), puis "compute" (pool de processus) ou "decode",
+            "preprocess", "triangulate" et "encode".
+        if_none_match: En-tete `If-None-Match` de la requete, ou None.
+
+    Returns:
+        tuple: (etag, resultat) ; le resultat est les Triangles au format
+            binaire, un couple (points, triangles) a envoyer par morceaux,
+            ou None si le client detient deja cette version.
+
+    Raises:
+        ServiceError: En cas d'erreur de recuperation ou de calcul, 503
+            SERVICE_OVERLOADED si `scheduler` refuse le calcul ou 503
+            TRIANGULATION_TIMEOUT si le delai est depasse.
+    """
+    start = time.perf_counter()
+    try:
+        pointset_data = get_pointset(
+            pointset_id, manager_url=app.config["POINTSET_MANAGER_URL"]
+        )
+    except FETCH_ERRORS as e:
+        raise fetch_error(e) from e
+    finally:
+        timings["fetch"] = time.perf_counter() - start
+
+    digest = content_digest(pointset_data)
+    etag = make_etag(digest, method)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+
+    cache_key = make_key(pointset_id, pointset_data, method, digest)
+    result_data = result_cache.get(cache_key)
+    if result_data is not None:
+        return etag, result_data
+
+    with scheduler.admit(pointset_data) as ticket:
+        timings["queue"] = ticket.waited
+        pool = get_pool()
+        if pool is not None:
+            start = time.perf_counter()
+            try:
+                result_data = pool.run(pointset_data, method)
+            finally:
+                timings["compute"] = time.perf_counter() - start
+        else:
+            deadline = Deadline(app.config["TRIANGULATION_TIMEOUT"])
+            points, triangles = triangulate_pointset(
+                pointset_data, method, timings, deadline
+            )
+            stream_min = app.config["STREAM_MIN_TRIANGLES"]
+            if stream_min and len(triangles) >= stream_min:
+                return etag, (points, triangles)
+            start = time.perf_counter()
+            result_data = encode_triangulation(points, triangles)
+            timings["encode"] = time.perf_counter() - start
+
+    result_cache.put(cache_key, result_data)
+    return etag, result_data
+
+
+def _shared_triangulation(pointset_id, method, timings, if_none_match):
+    """Partage `_triangulation_result` entre les requetes concurrentes.
+
+    La cle de partage ne depend pas de `If-None-Match` : des requetes avec
+    ou sans validateur partagent la meme recuperation et le meme calcul,
+    et l'ETag est compare pour chaque appelant. Seul un leader dont le
+    validateur correspond saute le calcul ; un follower qui n'en detient
+    pas cette version relance alors le partage, sans validateur.
+
+    Returns:
+        tuple: (etag, resultat), le resultat valant None si ce client
+            detient deja cette version (voir `_triangulation_result`).
+    """
+    key = (pointset_id, method)
+    etag, result = in_flight.do(
+        key, _triangulation_result, pointset_id, method, timings, if_none_match
+    )
+    while result is None and not etag_matches(if_none_match, etag):
+        etag, result = in_flight.do(
+            key, _triangulation_result, pointset_id, method, timings, None
+        )
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, result
 
 
 @app.route("/triangulation/<pointset_id>", methods=["GET"])
 def get_triangulation(pointset_id):
     """Calcule la triangulation pour un PointSet donne.
 
+    Le moteur de triangulation peut etre choisi par le parametre de requete
+    `method`, sinon la valeur de configuration `TRIANGULATION_METHOD` est
+    utilisee. Les resultats sont mis en cache par UUID, moteur et empreinte
+    du contenu recu : une requete repetee ne refait ni le decodage, ni la
+    triangulation, ni l'encodage. Si un pool de processus est configure,
+    le calcul y est execute ; un pool sature repond 503. Les requetes
+    concurrentes pour le meme PointSet et le meme moteur partagent une
+    seule recuperation et un seul calcul. Les gros resultats sont envoyes
+    par morceaux (voir `_triangulation_result`), avec les memes octets.
+
+    Avant tout decodage, le calcul est admis par `scheduler` dans la file
+    des petits ou des gros travaux selon le nombre de points ; si la file
+    est trop chargee, la reponse est un 503 SERVICE_OVERLOADED immediat
+    avec un en-tete `Retry-After`.
+    Une triangulation qui depasse son delai est interrompue (503
+    TRIANGULATION_TIMEOUT) au lieu d'occuper le processeur jusqu'a sa fin.
+
+    La reponse porte un ETag fort derive du contenu du PointSet, du moteur
+    et de sa version : une requete `If-None-Match` correspondante recoit un
+    304 sans triangulation (le PointSet est tout de meme recupere, de
+    facon conditionnelle si le PointSetManager fournit des ETag).
+
+    La duree de chaque etape est renvoyee dans l'en-tete `Server-Timing`
+    et agregee dans `metrics` (voir `get_metrics`).
+
     Args:
         pointset_id: UUID du PointSet a trianguler.
 
     Returns:
         Response: Donnees binaires des triangles ou erreur JSON.
     """
+    method = request.args.get("method", app.config["TRIANGULATION_METHOD"])
+    if_none_match = request.headers.get("If-None-Match")
+    start = time.perf_counter()
+    timings = {}
+
+    try:
+        check_method(method)
+        etag, result = _shared_triangulation(pointset_id, method, timings, if_none_match)
+        if result is None:
+            response = Response(status=304)
+        elif isinstance(result, tuple):
+            response = _streamed_octet_stream(*result)
+            points, triangles = result
+            metrics.observe_sizes(
+                len(points), len(triangles),
+                encoded_triangles_size(len(points), len(triangles)),
+            )
+        else:
+            response = _octet_stream(result)
+            metrics.observe_result(result)
+        response.headers["ETag"] = etag
+    except ServiceError as e:
+        response = jsonify(e.to_dict())
+        response.status_code = e.status
+        response.headers.update(e.headers)
+        metrics.count_response(e.status, e.code)
+    else:
+        metrics.count_response(response.status_code)
+
+    timings["total"] = time.perf_counter() - start
+    metrics.observe_timings(timings)
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response
+
+
+def _batch_item(pointset_id, method):
+    """Calcule un element d'un lot et retourne son encadrement binaire.
+
+    Toute erreur devient un element en erreur : l'en-tete du lot est deja
+    envoye, une exception interromprait le flux pour tous les elements.
+    """
+    timings = {}
+    error = None
+    try:
+        _, result = _shared_triangulation(pointset_id, method, timings, None)
+        if isinstance(result, tuple):
+            result = encode_triangulation(*result)
+    except ServiceError as e:
+        error = e
+    except Exception as e:
+        app.logger.exception("Echec inattendu de l'element %s du lot", pointset_id)
+        error = ServiceError(500, "INTERNAL_ERROR", f"Erreur interne: {e}")
+    if error is not None:
+        metrics.count_response(error.status, error.code)
+        frame = encode_batch_item(
+            error.status, json.dumps(error.to_dict()).encode("utf-8")
+        )
+    else:
+        metrics.count_response(200)
+        metrics.observe_result(result)
+        frame = encode_batch_item(200, result)
+    metrics.observe_timings(timings)
+    return frame
+
+
+def _batch_frames(futures):
+    """Produit l'en-tete du lot puis chaque element, dans l'ordre demande."""
+    yield encode_batch_header(len(futures))
+    for future in futures:
+        yield future.result()
+
+
+def _batch_ids(body):
+    """Extrait la liste d'UUID du corps d'une requete de lot.
+
+    Args:
+        body: Corps JSON decode (ou None s'il est invalide).
+
+    Returns:
+        list: UUID des PointSets a trianguler.
+
+    Raises:
+        ServiceError: 400 INVALID_REQUEST si le corps est mal forme, 400
+            BATCH_TOO_LARGE si le lot depasse `BATCH_MAX_ITEMS`.
+    """
+    ids = body.get("pointSetIds") if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+        raise ServiceError(
+            400, "INVALID_REQUEST",
+            "Corps attendu: {\"pointSetIds\": [\"<uuid>\", ...]}"
+        )
+    max_items = app.config["BATCH_MAX_ITEMS"]
+    if len(ids) > max_items:
+        raise ServiceError(
+            400, "BATCH_TOO_LARGE", f"Au plus {max_items} PointSets par lot"
+        )
+    return ids
+
+
+@app.route("/triangulation/batch", methods=["POST"])
+def post_triangulation_batch():
+    """Calcule la triangulation de plusieurs PointSets en une requete.
+
+    Le corps JSON `{"pointSetIds": [...]}` liste les UUID ; le moteur est
+    choisi comme pour `get_triangulation`. Les PointSets sont recuperes
+    en parallele par `BATCH_WORKERS` threads, qui partagent le pool de
+    connexions du client, et triangules en parallele dans le pool de
+    processus s'il est configure. Cache et single-flight sont ceux des
+    requetes unitaires.
+
+    La reponse est un lot binaire (voir `triangulator.binary_format`) envoye
+    par morceaux, un element par UUID dans l'ordre demande : chaque element
+    porte son propre statut, une erreur n'interrompt pas le lot.
+
+    Returns:
+        Response: Lot binaire, ou erreur JSON si la requete est invalide.
+    """
+    method = request.args.get("method", app.config["TRIANGULATION_METHOD"])
+
+    try:
+        check_method(method)
+        ids = _batch_ids(request.get_json(silent=True))
+    except ServiceError as e:
+        return jsonify(e.to_dict()), e.status, e.headers
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(app.config["BATCH_WORKERS"], len(ids)))
+    )
+    futures = [executor.submit(_batch_item, i, method) for i in ids]
+    # Les elements restants s'executent sans bloquer le debut de la reponse.
+    executor.shutdown(wait=False)
+
+    return Response(_batch_frames(futures), mimetype="application/octet-stream")
+
+
+def _session_summary(session):
+    """Decrit une session en JSON (verrou de la session tenu)."""
+    return {"sessionId": session.id, "points": len(session.triangulation)}
+
+
+def _get_session(session_id):
+    """Retourne une session ouverte.
+
+    Raises:
+        ServiceError: 404 SESSION_NOT_FOUND si la session n'existe pas ou a
+            expire.
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        raise ServiceError(
+            404, "SESSION_NOT_FOUND", f"Session {session_id} inexistante ou expiree"
+        )
+    return session
+
+
+@app.route("/triangulation/sessions", methods=["POST"])
+def post_triangulation_session():
+    """Ouvre une session de triangulation incrementale.
+
+    Le corps JSON `{"pointSetId": "<uuid>"}` designe le PointSet initial,
+    recupere aupres du PointSetManager et triangule par le moteur
+    incremental (Bowyer-Watson) : le parametre `method` ne s'applique pas
+    aux sessions. La triangulation reste en memoire jusqu'a sa fermeture
+    ou `SESSION_TTL` secondes apres son dernier acces ; des points peuvent
+    lui etre ajoutes sans tout recalculer (voir
+    `post_triangulation_session_points`).
+
+    Returns:
+        Response: 201 et `{"sessionId", "points"}`, ou erreur JSON (503
+            TOO_MANY_SESSIONS si `SESSION_MAX_SESSIONS` sessions sont
+            ouvertes, 503 SERVICE_OVERLOADED si `scheduler` refuse la
+            triangulation initiale).
+    """
+    body = request.get_json(silent=True)
+    pointset_id = body.get("pointSetId") if isinstance(body, dict) else None
     try:
-        pointset_data = get_pointset(pointset_id)
-    except ValueError as e:
-        return jsonify({
-            "code": "INVALID_UUID",
-            "message": str(e)
-        }), 400
-    except FileNotFoundError as e:
-        return jsonify({
-            "code": "POINTSET_NOT_FOUND",
-            "message": str(e)
-        }), 404
-    except ConnectionError as e:
-        return jsonify({
-            "code": "SERVICE_UNAVAILABLE",
-            "message": f"PointSetManager inaccessible: {e}"
-        }), 503
+        if not isinstance(pointset_id, str):
+            raise ServiceError(
+                400, "INVALID_REQUEST", "Corps attendu: {\"pointSetId\": \"<uuid>\"}"
+            )
+        try:
+            pointset_data = get_pointset(
+                pointset_id, manager_url=app.config["POINTSET_MANAGER_URL"]
+            )
+        except FETCH_ERRORS as e:
+            raise fetch_error(e) from e
+        with scheduler.admit(pointset_data):
+            triangulation = open_triangulation(
+                pointset_data, Deadline(app.config["TRIANGULATION_TIMEOUT"])
+            )
+        session = sessions.create(triangulation)
+        if session is None:
+            raise ServiceError(
+                503, "TOO_MANY_SESSIONS", "Nombre maximal de sessions atteint"
+            )
+    except ServiceError as e:
+        return jsonify(e.to_dict()), e.status, e.headers
+
+    with session.lock:
+        summary = _session_summary(session)
+    return jsonify(summary), 201, {"Location": f"/triangulation/sessions/{session.id}"}
+
+
+@app.route("/triangulation/sessions/<session_id>/points", methods=["POST"])
+def post_triangulation_session_points(session_id):
+    """Ajoute des points a la triangulation d'une session.
+
+    Le corps est un PointSet binaire (`application/octet-stream`) ; seules
+    les cavites des nouveaux points sont retriangulees, le cout ne depend
+    donc que de leur nombre. Les indices des nouveaux points suivent ceux
+    des points deja presents.
 
+    Args:
+        session_id: Identifiant de la session.
+
+    Returns:
+        Response: `{"sessionId", "points"}`, ou erreur JSON (400
+            INVALID_POINTSET si le corps est invalide).
+    """
     try:
-        points = decode_pointset(pointset_data)
-    except ValueError as e:
-        return jsonify({
-            "code": "INVALID_POINTSET",
-            "message": f"Format PointSet invalide: {e}"
-        }), 500
+        session = _get_session(session_id)
+        points = decode_points(request.get_data(), status=400)
+        with session.lock:
+            try:
+                session.triangulation.insert(points)
+            except ValueError as e:
+                raise ServiceError(400, "INVALID_POINTSET", str(e)) from e
+            summary = _session_summary(session)
+    except ServiceError as e:
+        return jsonify(e.to_dict()), e.status, e.headers
+    return jsonify(summary)
+
+
+@app.route("/triangulation/sessions/<session_id>", methods=["GET"])
+def get_triangulation_session(session_id):
+    """Retourne la triangulation courante d'une session.
+
+    Args:
+        session_id: Identifiant de la session.
 
+    Returns:
+        Response: Triangles au format binaire, ou erreur JSON.
+    """
     try:
-        triangles = triangulate(points)
-    except ValueError as e:
-        return jsonify({
-            "code": "TRIANGULATION_FAILED",
-            "message": str(e)
-        }), 500
+        session = _get_session(session_id)
+        with session.lock:
+            points = session.triangulation.points()
+            triangles = session.triangulation.triangles()
+        result = encode_triangulation(points, triangles)
+    except ServiceError as e:
+        return jsonify(e.to_dict()), e.status, e.headers
+    return _octet_stream(result)
+
+
+@app.route("/triangulation/sessions/<session_id>", methods=["DELETE"])
+def delete_triangulation_session(session_id):
+    """Ferme une session.
 
+    Args:
+        session_id: Identifiant de la session.
+
+    Returns:
+        Response: 204, ou 404 SESSION_NOT_FOUND.
+    """
     try:
-        result_data = encode_triangles(points, triangles)
-    except ValueError as e:
-        return jsonify({
-            "code": "ENCODING_FAILED",
-            "message": str(e)
-        }), 500
-
-    response = make_response(result_data)
-    response.headers["Content-Type"] = "application/octet-stream"
-    return response
+        session = _get_session(session_id)
+    except ServiceError as e:
+        return jsonify(e.to_dict()), e.status, e.headers
+    sessions.discard(session.id)
+    return "", 204
+
+
+_CIRCUIT_STATES = {
+    CircuitBreaker.CLOSED: 0,
+    CircuitBreaker.HALF_OPEN: 1,
+    CircuitBreaker.OPEN: 2,
+}
+
+
+def metrics_gauges():
+    """Retourne l'etat des caches, files, sessions, pool et PointSetManager.
+
+    Returns:
+        list: Tuples (nom, type, aide, valeur) pour `Metrics.render`.
+    """
+    cache = result_cache.stats()
+    flight = in_flight.stats()
+    session_stats = sessions.stats()
+    gauges = [
+        ("triangulator_cache_entries", "gauge", "Entrees du cache memoire.",
+         cache["entries"]),
+        ("triangulator_cache_bytes", "gauge", "Octets du cache memoire.",
+         cache["bytes"]),
+        ("triangulator_cache_hits_total", "counter", "Resultats servis par le cache.",
+         cache["hits"]),
+        ("triangulator_cache_disk_hits_total", "counter",
+         "Resultats servis par le cache disque.", cache["disk_hits"]),
+        ("triangulator_cache_misses_total", "counter", "Resultats absents du cache.",
+         cache["misses"]),
+        ("triangulator_cache_evictions_total", "counter", "Entrees evincees du cache.",
+         cache["evictions"]),
+        ("triangulator_cache_disk_entries", "gauge", "Fichiers du cache disque.",
+         cache["disk_entries"]),
+        ("triangulator_cache_disk_bytes", "gauge", "Octets du cache disque.",
+         cache["disk_bytes"]),
+        ("triangulator_cache_disk_evictions_total", "counter",
+         "Fichiers supprimes du cache disque.", cache["disk_evictions"]),
+        ("triangulator_singleflight_leaders_total", "counter",
+         "Calculs executes par un leader.", flight["leaders"]),
+        ("triangulator_singleflight_followers_total", "counter",
+         "Requetes servies par le calcul d'un leader.", flight["followers"]),
+        ("triangulator_singleflight_in_flight", "gauge", "Calculs en cours.",
+         flight["in_flight"]),
+        ("triangulator_sessions", "gauge", "Sessions incrementales ouvertes.",
+         session_stats["sessions"]),
+        ("triangulator_sessions_expired_total", "counter",
+         "Sessions incrementales expirees.", session_stats["expired"]),
+    ]
+    lanes = scheduler.stats()
+    for lane in ("small", "large"):
+        stats = lanes[lane]
+        gauges += [
+            (f"triangulator_scheduler_{lane}_running", "gauge",
+             f"Calculs en cours (file {lane}).", stats["running"]),
+            (f"triangulator_scheduler_{lane}_waiting", "gauge",
+             f"Calculs en attente d'une place (file {lane}).", stats["waiting"]),
+            (f"triangulator_scheduler_{lane}_backlog_seconds", "gauge",
+             f"Travail estime en cours et en attente (file {lane}).", stats["backlog"]),
+            (f"triangulator_scheduler_{lane}_rejected_total", "counter",
+             f"Calculs refuses par surcharge (file {lane}).", stats["rejected"]),
+        ]
+    gauges.append(("triangulator_scheduler_seconds_per_point", "gauge",
+                   "Duree estimee de triangulation par point.",
+                   lanes["seconds_per_point"]))
+    manager = manager_stats(app.config["POINTSET_MANAGER_URL"])
+    gauges += [
+        ("triangulator_manager_circuit_state", "gauge",
+         "Disjoncteur du PointSetManager (0 ferme, 1 semi-ouvert, 2 ouvert).",
+         _CIRCUIT_STATES[manager["state"]]),
+        ("triangulator_manager_failures", "gauge",
+         "Echecs de connexion consecutifs au PointSetManager.", manager["failures"]),
+        ("triangulator_manager_circuit_opened_total", "counter",
+         "Ouvertures du disjoncteur du PointSetManager.", manager["opened"]),
+        ("triangulator_manager_circuit_rejected_total", "counter",
+         "Recuperations refusees par le disjoncteur.", manager["rejected"]),
+        ("triangulator_manager_not_found_entries", "gauge",
+         "PointSets introuvables en cache negatif.", manager["not_found_entries"]),
+        ("triangulator_manager_not_found_hits_total", "counter",
+         "Recuperations evitees par le cache negatif.", manager["not_found_hits"]),
+    ]
+    pool = _pool
+    if pool is not None:
+        stats = pool.stats()
+        gauges += [
+            ("triangulator_pool_workers", "gauge", "Processus du pool.",
+             stats["workers"]),
+            ("triangulator_pool_pending", "gauge", "Travaux acceptes par le pool.",
+             stats["pending"]),
+            ("triangulator_pool_max_pending", "gauge", "Limite de travaux du pool.",
+             stats["max_pending"]),
+        ]
+    return gauges
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Expose les mesures du service au format texte Prometheus.
+
+    Returns:
+        Response: Histogrammes des etapes et des tailles, compteurs de
+            reponses et d'erreurs, etat du cache, du single-flight et du
+            pool de processus.
+    """
+    return Response(
+        metrics.render(metrics_gauges()),
+        mimetype="text/plain; version=0.0.4",
+    )
 
 
 @app.errorhandler(404)
@@ -0,0 +1,255 @@
+"""Point d'entree ASGI (asyncio) du service Triangulator.
+
+Meme contrat HTTP que l'application Flask (`TP/triangulator.yml`), mais la
+recuperation du PointSet est non bloquante (`get_pointset_async`) et le
+calcul, lie au CPU, est deporte dans un executor : une requete en attente
+du PointSetManager n'occupe aucun worker. Si le client se deconnecte avant
+la reponse, son calcul est annule (voir `triangulator.deadline`).
+
+Exemple de lancement::
+
+    uvicorn triangulator.asgi:app
+
+La configuration (moteur, URL du PointSetManager, cache) est celle de
+l'application Flask, `triangulator.app.app.config`, et les mesures
+(`/metrics`) sont partagees avec elle.
+"""
+
+import asyncio
+import json
+import time
+import urllib.parse
+
+from triangulator.app import get_pool, metrics, metrics_gauges, result_cache, scheduler
+from triangulator.app import app as flask_app
+from triangulator.cache import content_digest, etag_matches, make_etag, make_key
+from triangulator.client import close_async_clients, get_pointset_async
+from triangulator.deadline import Deadline
+from triangulator.metrics import server_timing
+from triangulator.service import (
+    FETCH_ERRORS,
+    ServiceError,
+    check_method,
+    compute_triangulation,
+    fetch_error,
+)
+from triangulator.singleflight import AsyncSingleFlight
+
+#: Executor du calcul quand aucun pool de processus n'est configure
+#: (None : executor par defaut de la boucle).
+executor = None
+
+_ROUTE_PREFIX = "/triangulation/"
+
+in_flight = AsyncSingleFlight()
+
+
+async def _send(send, status, body, content_type, headers=()):
+    """Envoie une reponse HTTP complete."""
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("ascii")),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_error(send, error, headers=()):
+    """Envoie une erreur JSON au format du contrat."""
+    body = json.dumps(error.to_dict()).encode("utf-8")
+    headers = [
+        *headers,
+        *((name.lower().encode("latin-1"), str(value).encode("latin-1"))
+          for name, value in error.headers.items()),
+    ]
+    await _send(send, error.status, body, "application/json", headers)
+
+
+async def get_triangulation(pointset_id, method, timings=None, if_none_match=None):
+    """Calcule la triangulation d'un PointSet de facon asynchrone.
+
+    Les appels concurrents pour le meme PointSet et le meme moteur
+    partagent une seule recuperation et un seul calcul, avec ou sans
+    `if_none_match` (voir `triangulator.app._shared_triangulation`).
+
+    Args:
+        pointset_id: UUID du PointSet a trianguler.
+        method: Nom du moteur de triangulation.
+        timings: Dictionnaire optionnel complete avec la duree (secondes)
+            des etapes "fetch", "queue" (voir `triangulator.scheduler`) et
+            "compute".
+        if_none_match: En-tete `If-None-Match` de la requete, ou None.
+
+    Returns:
+        tuple: (etag, Triangles au format binaire), ou (etag, None) si
+            `if_none_match` designe deja la version courante.
+
+    Raises:
+        ServiceError: En cas d'erreur (code HTTP et corps JSON associes).
+    """
+    check_method(method)
+    key = (pointset_id, method)
+    timings = {} if timings is None else timings
+    etag, result = await in_flight.do(
+        key, _triangulation_bytes, pointset_id, method, timings, if_none_match
+    )
+    while result is None and not etag_matches(if_none_match, etag):
+        etag, result = await in_flight.do(
+            key, _triangulation_bytes, pointset_id, method, timings, None
+        )
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, result
+
+
+async def _triangulation_bytes(pointset_id, method, timings, if_none_match):
+    """Recupere un PointSet et retourne (etag, triangulation encodee)."""
+    start = time.perf_counter()
+    try:
+        pointset_data = await get_pointset_async(
+            pointset_id, manager_url=flask_app.config["POINTSET_MANAGER_URL"]
+        )
+    except FETCH_ERRORS as e:
+        raise fetch_error(e) from e
+    finally:
+        timings["fetch"] = time.perf_counter() - start
+
+    digest = content_digest(pointset_data)
+    etag = make_etag(digest, method)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+
+    cache_key = make_key(pointset_id, pointset_data, method, digest)
+    result_data = result_cache.get(cache_key)
+    if result_data is None:
+        async with scheduler.admit(pointset_data) as ticket:
+            timings["queue"] = ticket.waited
+            start = time.perf_counter()
+            try:
+                pool = get_pool()
+                if pool is None:
+                    loop = asyncio.get_running_loop()
+                    deadline = Deadline(flask_app.config["TRIANGULATION_TIMEOUT"])
+                    try:
+                        result_data = await loop.run_in_executor(
+                            executor, compute_triangulation, pointset_data, method,
+                            deadline,
+                        )
+                    except asyncio.CancelledError:
+                        # Le thread ne peut pas etre interrompu : il s'arrete
+                        # a la prochaine verification du delai.
+                        deadline.cancel()
+                        raise
+                else:
+                    result_data = await pool.result_async(
+                        pool.submit(pointset_data, method)
+                    )
+            finally:
+                timings["compute"] = time.perf_counter() - start
+        result_cache.put(cache_key, result_data)
+    return etag, result_data
+
+
+async def _disconnected(receive):
+    """Attend la deconnexion du client (apres le corps de la requete)."""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _lifespan(receive, send):
+    """Gere les evenements lifespan du serveur ASGI."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_clients()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """Application ASGI."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        # Seul HTTP est servi : une connexion WebSocket est refusee (403
+        # cote serveur), les autres protocoles sont ignores.
+        if scope["type"] == "websocket":
+            await receive()
+            await send({"type": "websocket.close", "code": 1003})
+        return
+
+    path = scope["path"]
+    if path == "/metrics" and scope["method"] == "GET":
+        body = metrics.render(metrics_gauges()).encode("utf-8")
+        await _send(send, 200, body, "text/plain; version=0.0.4")
+        return
+
+    if not path.startswith(_ROUTE_PREFIX) or "/" in path[len(_ROUTE_PREFIX):] \
+            or path == _ROUTE_PREFIX:
+        await _send_error(send, ServiceError(404, "NOT_FOUND", "Route non trouvee"))
+        return
+
+    if scope["method"] != "GET":
+        await _send_error(
+            send, ServiceError(405, "METHOD_NOT_ALLOWED", "Methode non autorisee")
+        )
+        return
+
+    query = urllib.parse.parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    method = query.get("method", [flask_app.config["TRIANGULATION_METHOD"]])[0]
+
+    if_none_match = None
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"if-none-match":
+            if_none_match = value.decode("latin-1")
+
+    start = time.perf_counter()
+    timings = {}
+    compute = asyncio.ensure_future(get_triangulation(
+        path[len(_ROUTE_PREFIX):], method, timings, if_none_match
+    ))
+    disconnect = asyncio.ensure_future(_disconnected(receive))
+    try:
+        await asyncio.wait((compute, disconnect), return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        compute.cancel()
+        raise
+    finally:
+        disconnect.cancel()
+    if not compute.done():
+        # Client parti : personne n'attend plus la reponse.
+        compute.cancel()
+        await asyncio.gather(compute, return_exceptions=True)
+        metrics.count_response(499, "CLIENT_DISCONNECTED")
+        return
+
+    try:
+        etag, result_data = compute.result()
+    except ServiceError as e:
+        metrics.count_response(e.status, e.code)
+        error = e
+    else:
+        metrics.count_response(200 if result_data is not None else 304)
+        if result_data is not None:
+            metrics.observe_result(result_data)
+        error = None
+
+    timings["total"] = time.perf_counter() - start
+    metrics.observe_timings(timings)
+    headers = [(b"server-timing", server_timing(timings).encode("ascii"))]
+    if error is not None:
+        await _send_error(send, error, headers)
+        return
+    headers.append((b"etag", etag.encode("ascii")))
+    if result_data is None:
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await _send(send, 200, result_data, "application/octet-stream", headers)
@@ -1,21 +1,286 @@
-"""Encodage et decodage des formats binaires PointSet et Triangles."""
+"""Encodage et decodage des formats binaires PointSet et Triangles.
 
+Si NumPy est installe, les fonctions utilisent un chemin vectorise
+(`np.frombuffer` / `ndarray.tobytes`). Sinon, un chemin en Python pur
+construit les donnees dans un `bytearray` pre-dimensionne. Les deux chemins
+produisent exactement les memes octets.
+
+Le format de lot (`encode_batch_item` / `decode_batch`) encadre plusieurs
+reponses : un nombre d'elements (4 octets), puis pour chaque element son
+statut HTTP (2 octets), la longueur de sa charge utile (4 octets) et la
+charge utile elle-meme (Triangles si le statut est 200, erreur JSON sinon).
+
+`PointSetView` et `TrianglesView` exposent un buffer recu sans le copier,
+via `memoryview.cast`, pour eviter de materialiser des listes de tuples.
+"""
+
+import operator
 import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy est optionnel
+    np = None
+
+
+_COUNT = struct.Struct("<L")
+_POINT = struct.Struct("<ff")
+_TRIANGLE = struct.Struct("<LLL")
+_BATCH_ITEM = struct.Struct("<HL")
+
+#: Taille approximative (octets) des morceaux de `iter_encode_triangles`.
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Messages communs aux deux chemins pour des points ou triangles mal formes.
+_POINT_SHAPE_ERROR = "Points attendus sous forme de couples (x, y)"
+_COORD_TYPE_ERROR = "Coordonnees non numeriques"
+_TRIANGLE_SHAPE_ERROR = "Triangles attendus sous forme de triplets (i1, i2, i3)"
+_INDEX_TYPE_ERROR = "Indices de triangles non entiers"
+
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+_INDEX_FORMAT = "I" if struct.calcsize("I") == 4 else "L"
+
+
+def _cast(buffer, fmt):
+    """Retourne une vue typee (petit-boutiste) sur un buffer d'octets.
+
+    Sur une machine petit-boutiste, la vue partage la memoire du buffer.
+    Sinon, une copie reordonnee est necessaire.
+    """
+    if _NATIVE_LITTLE_ENDIAN:
+        return buffer.cast(fmt)
+    values = array(fmt)
+    values.frombytes(buffer)
+    values.byteswap()
+    return memoryview(values)
+
+
+def _little_endian_bytes(view):
+    """Retourne les octets petit-boutistes d'une vue typee."""
+    if _NATIVE_LITTLE_ENDIAN:
+        return view.tobytes()
+    values = array(view.format, view)
+    values.byteswap()
+    return values.tobytes()
+
+
+class _BufferView:
+    """Base des vues sans copie : enregistrements de taille fixe."""
+
+    __slots__ = ("_values", "_index")
+
+    _WIDTH = 1
+
+    def __init__(self, values, index=None):
+        """Initialise une vue sur des valeurs plates.
+
+        Args:
+            values: memoryview typee contenant les valeurs a plat.
+            index: range des enregistrements visibles (tous par defaut).
+        """
+        self._values = values
+        if index is None:
+            index = range(len(values) // self._WIDTH)
+        self._index = index
+
+    def __len__(self):
+        """Retourne le nombre d'enregistrements."""
+        return len(self._index)
+
+    def _flat(self):
+        """Retourne les valeurs visibles a plat (sans copie si possible)."""
+        index = self._index
+        width = self._WIDTH
+        if index.step == 1:
+            return self._values[width * index.start:width * index.stop]
+        return None
+
+    def __getitem__(self, key):
+        """Retourne un enregistrement (tuple) ou une sous-vue (slice)."""
+        if isinstance(key, slice):
+            return type(self)(self._values, self._index[key])
+        start = self._WIDTH * self._index[key]
+        return tuple(self._values[start:start + self._WIDTH])
+
+    def __iter__(self):
+        """Itere sur les enregistrements sous forme de tuples."""
+        flat = self._flat()
+        if flat is None:
+            return (self[i] for i in range(len(self)))
+        return zip(*[iter(flat)] * self._WIDTH)
+
+    def __repr__(self):
+        """Representation courte de la vue."""
+        return f"<{type(self).__name__} len={len(self)}>"
+
+    def tolist(self):
+        """Materialise la vue en liste de tuples."""
+        return list(self)
+
+    def values_bytes(self):
+        """Retourne les valeurs visibles au format binaire petit-boutiste."""
+        flat = self._flat()
+        if flat is None:
+            flat = memoryview(array(self._values.format, (v for rec in self for v in rec)))
+        return _little_endian_bytes(flat)
+
+
+class PointSetView(_BufferView):
+    """Vue sans copie sur un PointSet binaire.
+
+    Se comporte comme une sequence de tuples (x, y) : `len`, indexation,
+    iteration et decoupage (qui retourne une nouvelle vue).
+    """
+
+    __slots__ = ()
+
+    _WIDTH = 2
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Cree une vue sur un PointSet binaire.
+
+        Args:
+            data: bytes (ou objet buffer) representant un PointSet.
+
+        Returns:
+            PointSetView: Vue sur les points.
+
+        Raises:
+            ValueError: Si les donnees sont invalides.
+        """
+        count = _check_pointset_size(data)
+        end = _COUNT.size + count * _POINT.size
+        return cls(_cast(memoryview(data)[_COUNT.size:end], "f"))
+
+    @property
+    def xs(self):
+        """Liste des abscisses."""
+        return self._coordinate(0)
+
+    @property
+    def ys(self):
+        """Liste des ordonnees."""
+        return self._coordinate(1)
+
+    def _coordinate(self, axis):
+        """Retourne la liste d'une coordonnee des points visibles."""
+        index = self._index
+        start = 2 * index.start + axis
+        stop = 2 * index.stop + axis if index.stop >= 0 else None
+        return self._values[start:stop:2 * index.step].tolist()
+
+    def tobytes(self):
+        """Retourne le PointSet au format binaire."""
+        return _COUNT.pack(len(self)) + self.values_bytes()
+
+
+class TrianglesView(_BufferView):
+    """Vue sans copie sur la partie triangles d'un buffer Triangles.
+
+    Se comporte comme une sequence de tuples (i1, i2, i3).
+    """
+
+    __slots__ = ()
+
+    _WIDTH = 3
+
+
+def _encode_pointset_python(points):
+    """Encode un PointSet en Python pur dans un bytearray pre-dimensionne."""
+    data = bytearray(_COUNT.size + len(points) * _POINT.size)
+    _COUNT.pack_into(data, 0, len(points))
+    offset = _COUNT.size
+    for point in points:
+        if len(point) != 2:
+            raise ValueError(_POINT_SHAPE_ERROR)
+        try:
+            _POINT.pack_into(data, offset, *point)
+        except struct.error as e:
+            raise ValueError(_COORD_TYPE_ERROR) from e
+        offset += _POINT.size
+    return bytes(data)
+
+
+def _coordinate_array(points):
+    """Convertit des points en tableau (n, 2) de float64, comme le chemin pur.
+
+    Raises:
+        ValueError: Si les points ne sont pas des couples de nombres.
+    """
+    try:
+        coords = np.asarray(points)
+    except ValueError as e:  # couples de longueurs differentes
+        raise ValueError(_POINT_SHAPE_ERROR) from e
+    if coords.ndim == 1 and coords.size == 0:
+        return coords.reshape(0, 2).astype(np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError(_POINT_SHAPE_ERROR)
+    if coords.dtype.kind not in "biuf":
+        raise ValueError(_COORD_TYPE_ERROR)
+    return coords.astype(np.float64, copy=False)
+
+
+def _encode_pointset_numpy(points):
+    """Encode un PointSet avec NumPy."""
+    coords = _coordinate_array(points)
+    with np.errstate(over="ignore"):
+        coords32 = coords.astype("<f4")
+    overflow = np.isinf(coords32) & np.isfinite(coords)
+    if overflow.any():
+        raise OverflowError("float too large to pack with f format")
+    return _COUNT.pack(len(coords32)) + coords32.tobytes()
 
 
 def encode_pointset(points):
     """Encode un ensemble de points au format binaire.
 
     Args:
-        points: Liste de tuples (x, y) representant les points.
+        points: Liste de tuples (x, y) representant les points, ou
+            `PointSetView` (recopie directe des octets).
 
     Returns:
         bytes: Representation binaire du PointSet.
     """
-    data = struct.pack("<L", len(points))
-    for x, y in points:
-        data += struct.pack("<ff", x, y)
-    return data
+    if isinstance(points, PointSetView):
+        return points.tobytes()
+    if np is not None:
+        return _encode_pointset_numpy(points)
+    return _encode_pointset_python(points)
+
+
+def _check_pointset_size(data):
+    """Verifie la taille d'un PointSet et retourne son nombre de points."""
+    if len(data) < _COUNT.size:
+        raise ValueError("Header incomplet")
+
+    count = _COUNT.unpack_from(data, 0)[0]
+    expected_size = _COUNT.size + count * _POINT.size
+
+    if len(data) < expected_size:
+        raise ValueError("Donnees incompletes")
+
+    return count
+
+
+def read_point_count(data):
+    """Lit le nombre de points d'un PointSet sans le decoder.
+
+    Seul l'en-tete est lu ; la taille des donnees est verifiee pour qu'un
+    en-tete mensonger ne soit pas cru.
+
+    Args:
+        data: bytes representant un PointSet.
+
+    Returns:
+        int: Nombre de points.
+
+    Raises:
+        ValueError: Si l'en-tete est incomplet ou les donnees trop courtes.
+    """
+    return _check_pointset_size(data)
 
 
 def decode_pointset(data):
@@ -30,31 +295,137 @@ def decode_pointset(data):
     Raises:
         ValueError: Si les donnees sont invalides.
     """
-    if len(data) < 4:
-        raise ValueError("Header incomplet")
+    count = _check_pointset_size(data)
 
-    count = struct.unpack("<L", data[:4])[0]
-    expected_size = 4 + count * 8
+    if np is not None:
+        coords = np.frombuffer(data, dtype="<f4", count=2 * count, offset=_COUNT.size)
+        return list(map(tuple, coords.reshape(-1, 2).tolist()))
 
-    if len(data) < expected_size:
-        raise ValueError("Donnees incompletes")
+    end = _COUNT.size + count * _POINT.size
+    return list(_POINT.iter_unpack(memoryview(data)[_COUNT.size:end]))
 
-    points = []
-    offset = 4
-    for _ in range(count):
-        x, y = struct.unpack("<ff", data[offset:offset+8])
-        points.append((x, y))
-        offset += 8
 
-    return points
+def _first_out_of_range(indices, n_points):
+    """Retourne le premier index hors de [0, n_points[, ou None."""
+    bad = indices[(indices < 0) | (indices >= n_points)]
+    if bad.size:
+        return int(bad[0])
+    return None
+
+
+def _first_out_of_range_view(triangles, n_points):
+    """Retourne le premier index d'une `TrianglesView` hors limite, ou None."""
+    flat = triangles._flat()
+    if np is not None and flat is not None:
+        return _first_out_of_range(np.frombuffer(flat, dtype=np.uint32), n_points)
+    return next((idx for tri in triangles for idx in tri if idx >= n_points), None)
+
+
+def _encode_triangles_view(points, triangles):
+    """Encode des Triangles dont les indices sont une `TrianglesView`."""
+    bad = _first_out_of_range_view(triangles, len(points))
+    if bad is not None:
+        raise ValueError(f"Index {bad} hors limite")
+
+    return b"".join((
+        encode_pointset(points),
+        _COUNT.pack(len(triangles)),
+        triangles.values_bytes(),
+    ))
+
+
+def _check_triangles_python(triangles, n_points):
+    """Leve ValueError pour un triangle mal forme ou un indice invalide."""
+    for tri in triangles:
+        try:
+            indices = [operator.index(idx) for idx in tri]
+        except TypeError as e:
+            raise ValueError(_INDEX_TYPE_ERROR) from e
+        if len(indices) != 3:
+            raise ValueError(_TRIANGLE_SHAPE_ERROR)
+        for idx in indices:
+            if idx < 0 or idx >= n_points:
+                raise ValueError(f"Index {idx} hors limite")
+
+
+def _index_array(triangles):
+    """Convertit des triangles en tableau (n, 3) d'int64, comme le chemin pur.
+
+    Raises:
+        ValueError: Si les triangles ne sont pas des triplets d'entiers.
+    """
+    try:
+        indices = np.asarray(triangles)
+    except ValueError as e:  # triplets de longueurs differentes
+        raise ValueError(_TRIANGLE_SHAPE_ERROR) from e
+    if indices.ndim == 1 and indices.size == 0:
+        return indices.reshape(0, 3).astype(np.int64)
+    if indices.dtype.kind not in "biu":
+        raise ValueError(_INDEX_TYPE_ERROR)
+    if indices.ndim != 2 or indices.shape[1] != 3:
+        raise ValueError(_TRIANGLE_SHAPE_ERROR)
+    return indices.astype(np.int64, copy=False)
+
+
+def _encode_triangles_python(points, triangles):
+    """Encode des Triangles en Python pur dans un bytearray pre-dimensionne."""
+    _check_triangles_python(triangles, len(points))
+
+    pointset = encode_pointset(points)
+    data = bytearray(len(pointset) + _COUNT.size + len(triangles) * _TRIANGLE.size)
+    data[:len(pointset)] = pointset
+    offset = len(pointset)
+    _COUNT.pack_into(data, offset, len(triangles))
+    offset += _COUNT.size
+    for i1, i2, i3 in triangles:
+        _TRIANGLE.pack_into(data, offset, i1, i2, i3)
+        offset += _TRIANGLE.size
+    return bytes(data)
+
+
+def _encode_triangles_numpy(points, triangles):
+    """Encode des Triangles avec NumPy (validation vectorisee des indices)."""
+    indices = _index_array(triangles)
+    bad = _first_out_of_range(indices, len(points))
+    if bad is not None:
+        raise ValueError(f"Index {bad} hors limite")
+
+    return b"".join((
+        encode_pointset(points),
+        _COUNT.pack(len(indices)),
+        indices.astype("<u4").tobytes(),
+    ))
+
+
+def _triangles_section(data, n_points):
+    """Verifie la partie triangles d'un buffer et retourne ses bornes.
+
+    Returns:
+        tuple: (offset, n_triangles, end) de la liste d'indices.
+    """
+    offset = _COUNT.size + n_points * _POINT.size
+
+    if len(data) < offset + _COUNT.size:
+        raise ValueError("Header triangles manquant")
+
+    n_triangles = _COUNT.unpack_from(data, offset)[0]
+    offset += _COUNT.size
+
+    end = offset + n_triangles * _TRIANGLE.size
+    if len(data) < end:
+        raise ValueError("Donnees triangles incompletes")
+
+    return offset, n_triangles, end
 
 
 def encode_triangles(points, triangles):
     """Encode un ensemble de triangles au format binaire.
 
     Args:
-        points: Liste de tuples (x, y) représentant les sommets.
-        triangles: Liste de tuples (i1, i2, i3) représentant les indices.
+        points: Liste de tuples (x, y) représentant les sommets, ou
+            `PointSetView`.
+        triangles: Liste de tuples (i1, i2, i3) représentant les indices, ou
+            `TrianglesView`.
 
     Returns:
         bytes: Représentation binaire des Triangles.
@@ -62,20 +433,92 @@ def encode_triangles(points, triangles):
     Raises:
         ValueError: Si les données sont invalides.
     """
-    n_points = len(points)
+    if isinstance(triangles, TrianglesView):
+        return _encode_triangles_view(points, triangles)
+    if np is not None:
+        return _encode_triangles_numpy(points, triangles)
+    return _encode_triangles_python(points, triangles)
 
-    for tri in triangles:
-        for idx in tri:
-            if idx < 0 or idx >= n_points:
-                raise ValueError(f"Index {idx} hors limite")
 
-    data = encode_pointset(points)
-    data += struct.pack("<L", len(triangles))
+def encoded_triangles_size(n_points, n_triangles):
+    """Retourne la taille en octets de Triangles encodes.
 
-    for i1, i2, i3 in triangles:
-        data += struct.pack("<LLL", i1, i2, i3)
+    Args:
+        n_points: Nombre de sommets.
+        n_triangles: Nombre de triangles.
 
-    return data
+    Returns:
+        int: Taille du resultat de `encode_triangles`.
+    """
+    return 2 * _COUNT.size + n_points * _POINT.size + n_triangles * _TRIANGLE.size
+
+
+def _check_triangle_indices(points, triangles):
+    """Leve ValueError si un indice de triangle est hors limite."""
+    n_points = len(points)
+    if isinstance(triangles, TrianglesView):
+        bad = _first_out_of_range_view(triangles, n_points)
+    elif np is not None:
+        # Par tranches, pour ne pas materialiser tous les indices a la fois.
+        step = max(1, STREAM_CHUNK_SIZE // _TRIANGLE.size)
+        bad = None
+        for start in range(0, len(triangles), step):
+            indices = _index_array(triangles[start:start + step])
+            bad = _first_out_of_range(indices, n_points)
+            if bad is not None:
+                break
+    else:
+        _check_triangles_python(triangles, n_points)
+        return
+    if bad is not None:
+        raise ValueError(f"Index {bad} hors limite")
+
+
+def _triangles_chunk_bytes(triangles):
+    """Encode une tranche de triangles, sans header."""
+    if isinstance(triangles, TrianglesView):
+        return triangles.values_bytes()
+    if np is not None:
+        return _index_array(triangles).astype("<u4").tobytes()
+    data = bytearray(len(triangles) * _TRIANGLE.size)
+    for k, (i1, i2, i3) in enumerate(triangles):
+        _TRIANGLE.pack_into(data, k * _TRIANGLE.size, i1, i2, i3)
+    return bytes(data)
+
+
+def _iter_triangles_chunks(points, triangles, chunk_size):
+    """Genere les octets des Triangles par tranches (indices deja verifies)."""
+    yield _COUNT.pack(len(points))
+    step = max(1, chunk_size // _POINT.size)
+    for start in range(0, len(points), step):
+        yield encode_pointset(points[start:start + step])[_COUNT.size:]
+
+    yield _COUNT.pack(len(triangles))
+    step = max(1, chunk_size // _TRIANGLE.size)
+    for start in range(0, len(triangles), step):
+        yield _triangles_chunk_bytes(triangles[start:start + step])
+
+
+def iter_encode_triangles(points, triangles, chunk_size=STREAM_CHUNK_SIZE):
+    """Encode des Triangles par morceaux, sans construire tout le resultat.
+
+    La concatenation des morceaux est identique a
+    `encode_triangles(points, triangles)`. Les indices sont verifies avant
+    la creation du generateur : aucune erreur n'apparait en cours d'envoi.
+
+    Args:
+        points: Liste de tuples (x, y), ou `PointSetView`.
+        triangles: Liste de tuples (i1, i2, i3), ou `TrianglesView`.
+        chunk_size: Taille approximative des morceaux en octets.
+
+    Returns:
+        Iterator[bytes]: Morceaux du format binaire Triangles.
+
+    Raises:
+        ValueError: Si un indice est hors limite.
+    """
+    _check_triangle_indices(points, triangles)
+    return _iter_triangles_chunks(points, triangles, chunk_size)
 
 
 def decode_triangles(data):
@@ -94,27 +537,103 @@ def decode_triangles(data):
     points = decode_pointset(data)
     n_points = len(points)
 
-    offset = 4 + n_points * 8
+    offset, n_triangles, expected_size = _triangles_section(data, n_points)
 
-    if len(data) < offset + 4:
-        raise ValueError("Header triangles manquant")
+    if np is not None:
+        indices = np.frombuffer(data, dtype="<u4", count=3 * n_triangles, offset=offset)
+        bad = _first_out_of_range(indices, n_points)
+        if bad is not None:
+            raise ValueError(f"Index {bad} hors limite")
+        return points, list(map(tuple, indices.reshape(-1, 3).tolist()))
 
-    n_triangles = struct.unpack("<L", data[offset:offset+4])[0]
-    offset += 4
+    triangles = list(_TRIANGLE.iter_unpack(memoryview(data)[offset:expected_size]))
+    for tri in triangles:
+        for idx in tri:
+            if idx >= n_points:
+                raise ValueError(f"Index {idx} hors limite")
 
-    expected_size = offset + n_triangles * 12
-    if len(data) < expected_size:
-        raise ValueError("Donnees triangles incompletes")
+    return points, triangles
 
-    triangles = []
-    for _ in range(n_triangles):
-        i1, i2, i3 = struct.unpack("<LLL", data[offset:offset+12])
 
-        for idx in (i1, i2, i3):
-            if idx >= n_points:
-                raise ValueError(f"Index {idx} hors limite")
+def decode_triangles_view(data):
+    """Decode des Triangles sans copie sous forme de vues.
+
+    Args:
+        data: bytes (ou objet buffer) representant des Triangles.
 
-        triangles.append((i1, i2, i3))
-        offset += 12
+    Returns:
+        tuple: (PointSetView, TrianglesView).
+
+    Raises:
+        ValueError: Si les donnees sont invalides.
+    """
+    points = PointSetView.from_bytes(data)
+    n_points = len(points)
+
+    offset, _, end = _triangles_section(data, n_points)
+
+    triangles = TrianglesView(_cast(memoryview(data)[offset:end], _INDEX_FORMAT))
+    bad = _first_out_of_range_view(triangles, n_points)
+    if bad is not None:
+        raise ValueError(f"Index {bad} hors limite")
 
     return points, triangles
+
+
+def encode_batch_header(count):
+    """Encode l'en-tete d'un lot de reponses.
+
+    Args:
+        count: Nombre d'elements du lot.
+
+    Returns:
+        bytes: En-tete du lot.
+    """
+    return _COUNT.pack(count)
+
+
+def encode_batch_item(status, payload):
+    """Encode un element d'un lot de reponses.
+
+    Args:
+        status: Statut HTTP de l'element.
+        payload: Charge utile (Triangles ou erreur JSON), en bytes.
+
+    Returns:
+        bytes: Element encadre (statut, longueur, charge utile).
+    """
+    return _BATCH_ITEM.pack(status, len(payload)) + payload
+
+
+def decode_batch(data):
+    """Decode un lot de reponses.
+
+    Args:
+        data: bytes du lot.
+
+    Returns:
+        list: Liste de tuples (statut, charge utile), dans l'ordre du lot.
+
+    Raises:
+        ValueError: Si les donnees sont tronquees ou trop longues.
+    """
+    if len(data) < _COUNT.size:
+        raise ValueError("Donnees trop courtes pour lire le nombre d'elements")
+    (count,) = _COUNT.unpack_from(data, 0)
+
+    view = memoryview(data)
+    offset = _COUNT.size
+    items = []
+    for _ in range(count):
+        if len(data) < offset + _BATCH_ITEM.size:
+            raise ValueError("Lot tronque: en-tete d'element manquant")
+        status, length = _BATCH_ITEM.unpack_from(data, offset)
+        offset += _BATCH_ITEM.size
+        if len(data) < offset + length:
+            raise ValueError("Lot tronque: charge utile incomplete")
+        items.append((status, bytes(view[offset:offset + length])))
+        offset += length
+
+    if offset != len(data):
+        raise ValueError("Donnees en trop apres le dernier element")
+    return items
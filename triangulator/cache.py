@@ -0,0 +1,334 @@
+"""Cache des resultats de triangulation encodes."""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from triangulator.triangulation import ENGINE_VERSION
+
+
+def content_digest(pointset_data):
+    """Retourne l'empreinte SHA-256 (hexadecimale) du contenu d'un PointSet.
+
+    Args:
+        pointset_data: bytes du PointSet recus du PointSetManager.
+
+    Returns:
+        str: Empreinte hexadecimale.
+    """
+    return hashlib.sha256(pointset_data).hexdigest()
+
+
+def make_key(pointset_id, pointset_data, method, digest=None):
+    """Construit la cle de cache d'une triangulation.
+
+    La cle combine l'UUID du PointSet, le moteur de triangulation, sa
+    version et une empreinte SHA-256 du contenu recu : un PointSet modifie
+    cote PointSetManager, ou un moteur modifie, ne peut donc pas renvoyer
+    un resultat perime (niveau disque compris).
+
+    Args:
+        pointset_id: UUID du PointSet.
+        pointset_data: bytes du PointSet recus du PointSetManager.
+        method: Nom du moteur de triangulation.
+        digest: Empreinte deja calculee par `content_digest`, ou None.
+
+    Returns:
+        str: Cle de cache.
+    """
+    if digest is None:
+        digest = content_digest(pointset_data)
+    return f"{pointset_id}:{method}:v{ENGINE_VERSION}:{digest}"
+
+
+def make_etag(digest, method):
+    """Construit l'ETag fort d'une triangulation.
+
+    L'ETag ne depend que du contenu du PointSet, du moteur et de sa
+    version : deux reponses de meme ETag ont les memes octets.
+
+    Args:
+        digest: Empreinte du PointSet (`content_digest`).
+        method: Nom du moteur de triangulation.
+
+    Returns:
+        str: ETag entre guillemets, pret pour l'en-tete HTTP.
+    """
+    tag = hashlib.sha256(f"{method}:v{ENGINE_VERSION}:{digest}".encode("ascii"))
+    return f'"{tag.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Teste un en-tete `If-None-Match` (comparaison faible, RFC 9110).
+
+    Args:
+        if_none_match: Valeur de l'en-tete, ou None.
+        etag: ETag courant de la ressource.
+
+    Returns:
+        bool: True si le client detient deja cette version.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class TriangulationCache:
+    """Cache LRU des sorties de `encode_triangles`.
+
+    Les entrees sont evincees des que le nombre d'entrees ou le volume total
+    en octets depasse sa limite. Un second niveau optionnel sur disque
+    conserve les resultats entre deux redemarrages du worker ; il est borne
+    de la meme facon, les fichiers les moins recemment utilises (date de
+    modification) etant supprimes en premier. Le cache est partage entre
+    threads.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, directory=None,
+                 disk_max_entries=4096, disk_max_bytes=1024 * 1024 * 1024):
+        """Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximal d'entrees en memoire (0 desactive
+                le niveau memoire).
+            max_bytes: Volume maximal en octets des entrees en memoire.
+            directory: Repertoire du niveau disque, ou None.
+            disk_max_entries: Nombre maximal de fichiers du niveau disque
+                (0 desactive le niveau disque, None : illimite).
+            disk_max_bytes: Volume maximal en octets du niveau disque
+                (0 desactive le niveau disque, None : illimite).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        # Fichiers du niveau disque (chemin -> taille), du moins au plus
+        # recemment utilise, et leur volume total.
+        self._files = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_disk()
+
+    @property
+    def enabled(self):
+        """Indique si le cache conserve des entrees (en memoire ou sur disque)."""
+        return self.memory_enabled or self.disk_enabled
+
+    @property
+    def memory_enabled(self):
+        """Indique si le niveau memoire conserve des entrees."""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @property
+    def disk_enabled(self):
+        """Indique si le niveau disque conserve des entrees."""
+        return (
+            self.directory is not None
+            and self.disk_max_entries != 0
+            and self.disk_max_bytes != 0
+        )
+
+    def _path(self, key):
+        """Retourne le chemin du fichier disque associe a une cle."""
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def get(self, key):
+        """Retourne le resultat associe a une cle.
+
+        Args:
+            key: Cle construite par `make_key`.
+
+        Returns:
+            bytes: Resultat encode, ou None si absent.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            if self._fits_memory(value):
+                self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        """Enregistre un resultat.
+
+        Chaque niveau conserve le resultat s'il est active et si le
+        resultat tient dans son budget : un resultat trop gros pour la
+        memoire peut etre conserve sur disque.
+
+        Args:
+            key: Cle construite par `make_key`.
+            value: bytes produits par `encode_triangles`.
+        """
+        if self._fits_memory(value):
+            with self._lock:
+                self._store(key, value)
+        if self.disk_enabled and (
+            self.disk_max_bytes is None or len(value) <= self.disk_max_bytes
+        ):
+            self._write_disk(key, value)
+
+    def _fits_memory(self, value):
+        """Indique si une entree peut etre conservee en memoire."""
+        return self.memory_enabled and len(value) <= self.max_bytes
+
+    def _store(self, key, value):
+        """Insere une entree en memoire puis evince (verrou tenu)."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _scan_disk(self):
+        """Indexe les fichiers deja presents sur disque, du plus ancien au plus recent.
+
+        Les fichiers d'une ancienne version du moteur ne sont plus jamais lus :
+        ils sont evinces en premier, comme les autres fichiers anciens.
+        """
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".bin"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        with self._disk_lock:
+            for _, path, size in sorted(files):
+                self._files[path] = size
+                self._disk_bytes += size
+            self._evict_disk()
+
+    def _read_disk(self, key):
+        """Lit une entree du niveau disque, ou None.
+
+        Un fichier absent de l'index (ecrit par un autre worker partageant
+        le repertoire) y est ajoute, pour rester dans les limites du disque.
+        """
+        if not self.disk_enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        with self._disk_lock:
+            if path in self._files:
+                self._files.move_to_end(path)
+            else:
+                self._files[path] = len(value)
+                self._disk_bytes += len(value)
+                self._evict_disk()
+        return value
+
+    def _write_disk(self, key, value):
+        """Ecrit une entree sur disque de facon atomique puis evince."""
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._disk_lock:
+            self._disk_bytes -= self._files.pop(path, 0)
+            self._files[path] = len(value)
+            self._disk_bytes += len(value)
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprime les fichiers les plus anciens au-dela des limites (verrou disque tenu).
+
+        D'autres workers peuvent partager le repertoire : un fichier deja
+        supprime est simplement oublie.
+        """
+        while self._files and (
+            (self.disk_max_entries is not None
+             and len(self._files) > self.disk_max_entries)
+            or (self.disk_max_bytes is not None
+                and self._disk_bytes > self.disk_max_bytes)
+        ):
+            path, size = self._files.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Vide le niveau memoire du cache (le niveau disque est conserve)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Retourne les compteurs du cache.
+
+        Returns:
+            dict: Entrees, octets, hits, misses, evictions, hits disque,
+                fichiers, octets et evictions du niveau disque.
+        """
+        with self._lock:
+            result = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+            }
+        with self._disk_lock:
+            result["disk_entries"] = len(self._files)
+            result["disk_bytes"] = self._disk_bytes
+            result["disk_evictions"] = self.disk_evictions
+        return result
@@ -1,8 +1,24 @@
-"""Client pour communiquer avec le PointSetManager."""
+"""Client pour communiquer avec le PointSetManager.
 
+Deux protections evitent de solliciter inutilement le PointSetManager : un
+cache negatif (`NotFoundCache`) retient quelques secondes les UUID qui ont
+recu un 404, et un disjoncteur (`CircuitBreaker`) fait echouer
+immediatement les recuperations pendant une panne, au lieu d'attendre le
+delai de connexion a chaque requete. Les clients partages d'une meme URL
+(`get_client`, `get_pointset_async`) partagent ces protections, dont
+l'etat est expose par `manager_stats`.
+"""
+
+import asyncio
+import http.client
+import queue
 import re
-import urllib.error
-import urllib.request
+import socket
+import threading
+import time
+import urllib.parse
+import weakref
+from collections import OrderedDict
 
 
 UUID_PATTERN = re.compile(
@@ -10,6 +26,17 @@ UUID_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+DEFAULT_MANAGER_URL = "http://localhost:5000"
+
+#: Duree (s) pendant laquelle un PointSet introuvable n'est pas redemande.
+NOT_FOUND_TTL = 2.0
+
+#: Echecs de connexion consecutifs qui ouvrent le disjoncteur.
+BREAKER_FAILURE_THRESHOLD = 5
+
+#: Duree (s) d'ouverture du disjoncteur avant un appel d'essai.
+BREAKER_RESET_TIMEOUT = 5.0
+
 
 def _validate_uuid(pointset_id):
     """Valide le format d'un UUID.
@@ -27,9 +54,701 @@ def _validate_uuid(pointset_id):
         raise ValueError(f"UUID invalide: {pointset_id}")
 
 
-def get_pointset(pointset_id, manager_url="http://localhost:5000"):
+class _Validators:
+    """Derniere version recue (ETag, contenu) de chaque PointSet.
+
+    LRU bornee en octets, partagee entre threads. Elle permet de rejouer
+    une recuperation en requete conditionnelle (`If-None-Match`) : sur un
+    304, le contenu conserve est reutilise sans etre retransfere.
+    """
+
+    __slots__ = ("max_bytes", "_entries", "_bytes", "_lock")
+
+    def __init__(self, max_bytes):
+        """Initialise une LRU vide.
+
+        Args:
+            max_bytes: Volume maximal des contenus conserves (0 desactive).
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, pointset_id):
+        """Retourne (etag, contenu) d'un PointSet, ou None."""
+        with self._lock:
+            entry = self._entries.get(pointset_id)
+            if entry is not None:
+                self._entries.move_to_end(pointset_id)
+            return entry
+
+    def put(self, pointset_id, etag, body):
+        """Enregistre la version recue d'un PointSet."""
+        if len(body) > self.max_bytes:
+            self.discard(pointset_id)
+            return
+        with self._lock:
+            old = self._entries.pop(pointset_id, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[pointset_id] = (etag, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def discard(self, pointset_id):
+        """Oublie la version connue d'un PointSet."""
+        with self._lock:
+            old = self._entries.pop(pointset_id, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+
+
+class NotFoundCache:
+    """UUID des PointSets recemment introuvables (cache negatif).
+
+    Un UUID qui a recu un 404 est considere introuvable pendant `ttl`
+    secondes, sans nouvelle requete. Borne en nombre d'entrees (les plus
+    anciennes sont oubliees) et partage entre threads.
+    """
+
+    __slots__ = ("ttl", "max_entries", "hits", "_clock", "_expires", "_lock")
+
+    def __init__(self, ttl=NOT_FOUND_TTL, max_entries=4096, clock=time.monotonic):
+        """Initialise un cache vide.
+
+        Args:
+            ttl: Duree de vie (s) d'une entree (0 desactive le cache).
+            max_entries: Nombre maximal d'UUID conserves.
+            clock: Horloge (s) utilisee pour les expirations.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._clock = clock
+        self._expires = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, pointset_id):
+        """Teste si un PointSet est connu comme introuvable."""
+        with self._lock:
+            expires = self._expires.get(pointset_id)
+            if expires is None:
+                return False
+            if expires <= self._clock():
+                del self._expires[pointset_id]
+                return False
+            self.hits += 1
+            return True
+
+    def add(self, pointset_id):
+        """Retient qu'un PointSet est introuvable."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._expires[pointset_id] = self._clock() + self.ttl
+            self._expires.move_to_end(pointset_id)
+            while len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+
+    def stats(self):
+        """Retourne le nombre d'entrees et de recuperations evitees."""
+        with self._lock:
+            return {"entries": len(self._expires), "hits": self.hits}
+
+
+class CircuitOpenError(ConnectionError):
+    """Recuperation refusee sans requete : le disjoncteur est ouvert.
+
+    Attributes:
+        retry_after: Delai (s) avant le prochain appel d'essai.
+    """
+
+    def __init__(self, retry_after):
+        """Initialise l'erreur.
+
+        Args:
+            retry_after: Delai (s) avant le prochain appel d'essai.
+        """
+        super().__init__(
+            f"disjoncteur ouvert, nouvel essai dans {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Disjoncteur des appels au PointSetManager.
+
+    Ferme, il laisse passer les appels. Apres `failure_threshold` echecs
+    de connexion consecutifs, il s'ouvre : les appels echouent aussitot
+    (`CircuitOpenError`) pendant `reset_timeout` secondes. Il passe
+    ensuite en semi-ouvert et laisse passer un seul appel d'essai, qui le
+    referme s'il obtient une reponse HTTP (quel que soit son statut) ou le
+    rouvre sinon. Partage entre threads.
+
+    Attributes:
+        state: "closed", "open" ou "half-open".
+        failures: Echecs de connexion consecutifs.
+        opened: Nombre d'ouvertures.
+        rejected: Appels refuses sans requete.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, clock=time.monotonic):
+        """Initialise un disjoncteur ferme.
+
+        Args:
+            failure_threshold: Echecs consecutifs qui ouvrent le disjoncteur.
+            reset_timeout: Duree (s) d'ouverture avant un appel d'essai.
+            clock: Horloge (s).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Autorise un appel ou le refuse.
+
+        Raises:
+            CircuitOpenError: Si le disjoncteur est ouvert, ou semi-ouvert
+                avec un appel d'essai deja en cours.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - self._clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(remaining)
+                self.state = self.HALF_OPEN
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(self.reset_timeout)
+            self._probing = True
+
+    def succeeded(self):
+        """Enregistre une reponse du PointSetManager."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def failed(self):
+        """Enregistre un echec de connexion."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self.opened += 1
+
+    def abandoned(self):
+        """Enregistre un appel interrompu sans resultat (annulation)."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self):
+        """Retourne l'etat du disjoncteur et ses compteurs."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+def _pointset_body(validators, pointset_id, known, status, body, etag):
+    """Interprete la reponse du PointSetManager a une recuperation.
+
+    Args:
+        validators: Versions connues des PointSets (`_Validators`).
+        pointset_id: UUID du PointSet demande.
+        known: Version (etag, contenu) envoyee en `If-None-Match`, ou None.
+        status: Statut HTTP de la reponse.
+        body: Corps de la reponse.
+        etag: En-tete `ETag` de la reponse, ou None.
+
+    Returns:
+        bytes: Donnees binaires du PointSet.
+
+    Raises:
+        FileNotFoundError: Si le PointSet n'existe pas (404).
+        ValueError: Si la requete est refusee (400).
+        RuntimeError: Pour les autres erreurs serveur.
+    """
+    if status == 304 and known is not None:
+        return known[1]
+    if status == 200:
+        if etag:
+            validators.put(pointset_id, etag, body)
+        elif known is not None:
+            validators.discard(pointset_id)
+        return body
+    if status == 404:
+        validators.discard(pointset_id)
+        raise FileNotFoundError(f"PointSet {pointset_id} non trouve")
+    if status == 400:
+        raise ValueError(f"Requete invalide: {pointset_id}")
+    raise RuntimeError(f"Erreur serveur {status}")
+
+
+class PointSetManagerClient:
+    """Client HTTP du PointSetManager avec pool de connexions keep-alive.
+
+    Les connexions inactives sont conservees (au plus `pool_size`) et
+    reutilisees par les requetes suivantes, ce qui evite une poignee de
+    main TCP par triangulation. Si le PointSetManager renvoie un `ETag`,
+    les recuperations suivantes du meme PointSet sont conditionnelles
+    (`If-None-Match`) et un 304 reutilise le contenu deja recu. Une
+    instance peut etre partagee entre les threads des workers Flask.
+    """
+
+    def __init__(self, base_url=DEFAULT_MANAGER_URL, pool_size=8,
+                 connect_timeout=2.0, read_timeout=10.0,
+                 validator_max_bytes=16 * 1024 * 1024, breaker=None, not_found=None):
+        """Initialise le client.
+
+        Args:
+            base_url: URL du PointSetManager (http ou https).
+            pool_size: Nombre maximal de connexions inactives conservees.
+            connect_timeout: Delai maximal d'etablissement de connexion (s).
+            read_timeout: Delai maximal d'attente de la reponse (s).
+            validator_max_bytes: Volume maximal des PointSets conserves
+                pour les requetes conditionnelles (0 les desactive).
+            breaker: `CircuitBreaker` a utiliser (un nouveau par defaut).
+            not_found: `NotFoundCache` a utiliser (un nouveau par defaut).
+        """
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL du PointSetManager invalide: {base_url}")
+
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._base_path = parts.path.rstrip("/")
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._validators = _Validators(validator_max_bytes)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.not_found = not_found if not_found is not None else NotFoundCache()
+
+    def _new_connection(self):
+        """Ouvre une nouvelle connexion vers le PointSetManager."""
+        if self._scheme == "https":
+            conn = http.client.HTTPSConnection(
+                self._host, self._port, timeout=self.connect_timeout
+            )
+        else:
+            conn = http.client.HTTPConnection(
+                self._host, self._port, timeout=self.connect_timeout
+            )
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        return conn
+
+    def _acquire(self):
+        """Retourne une connexion inactive du pool, ou None."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _release(self, conn):
+        """Rend une connexion au pool (ou la ferme si le pool est plein)."""
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, path, headers=None):
+        """Execute un GET et retourne (status, body, etag).
+
+        Une connexion reutilisee peut avoir ete fermee par le serveur entre
+        deux requetes : dans ce cas la requete (idempotente) est rejouee une
+        fois sur une connexion neuve.
+        """
+        conn = self._acquire()
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._new_connection()
+            try:
+                conn.request("GET", path, headers=headers or {})
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError,
+                    ConnectionResetError):
+                conn.close()
+                if not reused:
+                    raise
+                conn = None
+                reused = False
+                continue
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, body, response.getheader("ETag")
+
+    def get_pointset(self, pointset_id):
+        """Recupere un PointSet depuis le PointSetManager.
+
+        Args:
+            pointset_id: UUID du PointSet a recuperer.
+
+        Returns:
+            bytes: Donnees binaires du PointSet.
+
+        Raises:
+            ValueError: Si l'UUID est invalide.
+            ConnectionError: Si le PointSetManager est inaccessible
+                (`CircuitOpenError`, sans requete, si le disjoncteur est
+                ouvert).
+            FileNotFoundError: Si le PointSet n'existe pas (404, retenu
+                par le cache negatif).
+            RuntimeError: Pour les autres erreurs serveur.
+        """
+        _validate_uuid(pointset_id)
+        if pointset_id in self.not_found:
+            raise FileNotFoundError(f"PointSet {pointset_id} non trouve")
+        self.breaker.before_call()
+
+        path = f"{self._base_path}/pointset/{pointset_id}"
+        known = self._validators.get(pointset_id)
+        headers = {"If-None-Match": known[0]} if known is not None else None
+
+        try:
+            status, body, etag = self._request(path, headers)
+        except (TimeoutError, socket.timeout) as e:
+            self.breaker.failed()
+            raise ConnectionError(f"Timeout de connexion: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            self.breaker.failed()
+            raise ConnectionError(f"PointSetManager inaccessible: {e}") from e
+        except BaseException:
+            self.breaker.abandoned()
+            raise
+        self.breaker.succeeded()
+
+        if status == 404:
+            self.not_found.add(pointset_id)
+        return _pointset_body(self._validators, pointset_id, known, status, body, etag)
+
+    def close(self):
+        """Ferme toutes les connexions inactives du pool."""
+        while True:
+            conn = self._acquire()
+            if conn is None:
+                return
+            conn.close()
+
+
+class AsyncPointSetManagerClient:
+    """Client asyncio du PointSetManager avec connexions keep-alive.
+
+    Equivalent non bloquant de `PointSetManagerClient` (requetes
+    conditionnelles comprises) : l'attente reseau ne mobilise aucun thread.
+    Une instance est liee a la boucle d'evenements qui l'utilise en premier.
+    """
+
+    def __init__(self, base_url=DEFAULT_MANAGER_URL, pool_size=8,
+                 connect_timeout=2.0, read_timeout=10.0,
+                 validator_max_bytes=16 * 1024 * 1024, breaker=None, not_found=None):
+        """Initialise le client.
+
+        Args:
+            base_url: URL du PointSetManager (http ou https).
+            pool_size: Nombre maximal de connexions inactives conservees.
+            connect_timeout: Delai maximal d'etablissement de connexion (s).
+            read_timeout: Delai maximal d'attente de la reponse (s).
+            validator_max_bytes: Volume maximal des PointSets conserves
+                pour les requetes conditionnelles (0 les desactive).
+            breaker: `CircuitBreaker` a utiliser (un nouveau par defaut).
+            not_found: `NotFoundCache` a utiliser (un nouveau par defaut).
+        """
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL du PointSetManager invalide: {base_url}")
+
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._ssl = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port or (443 if self._ssl else 80)
+        self._base_path = parts.path.rstrip("/")
+        self._idle = []
+        self._validators = _Validators(validator_max_bytes)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.not_found = not_found if not_found is not None else NotFoundCache()
+
+    async def _new_connection(self):
+        """Ouvre une nouvelle connexion (reader, writer)."""
+        return await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port, ssl=self._ssl or None),
+            self.connect_timeout,
+        )
+
+    async def _read_response(self, reader):
+        """Lit une reponse HTTP/1.1 et retourne (status, body, keep_alive, headers)."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected("Connexion fermee par le serveur")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if status in (204, 304) or 100 <= status < 200:
+            # Reponses sans corps, meme sans Content-Length.
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, body, keep_alive, headers
+
+    async def _request(self, path, headers=None):
+        """Execute un GET et retourne (status, body, etag).
+
+        Comme pour le client synchrone, une connexion reutilisee fermee par
+        le serveur est remplacee une fois par une connexion neuve.
+        """
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {self._host}:{self._port}\r\n"
+            f"{extra}"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+
+        conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = await self._new_connection()
+            reader, writer = conn
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, body, keep_alive, response_headers = await asyncio.wait_for(
+                    self._read_response(reader), self.read_timeout
+                )
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                conn = None
+                reused = False
+                continue
+            except BaseException:
+                writer.close()
+                raise
+
+            if keep_alive and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+            else:
+                writer.close()
+            return status, body, response_headers.get("etag")
+
+    async def get_pointset(self, pointset_id):
+        """Recupere un PointSet depuis le PointSetManager sans bloquer.
+
+        Args:
+            pointset_id: UUID du PointSet a recuperer.
+
+        Returns:
+            bytes: Donnees binaires du PointSet.
+
+        Raises:
+            ValueError: Si l'UUID est invalide.
+            ConnectionError: Si le PointSetManager est inaccessible
+                (`CircuitOpenError`, sans requete, si le disjoncteur est
+                ouvert).
+            FileNotFoundError: Si le PointSet n'existe pas (404, retenu
+                par le cache negatif).
+            RuntimeError: Pour les autres erreurs serveur.
+        """
+        _validate_uuid(pointset_id)
+        if pointset_id in self.not_found:
+            raise FileNotFoundError(f"PointSet {pointset_id} non trouve")
+        self.breaker.before_call()
+
+        path = f"{self._base_path}/pointset/{pointset_id}"
+        known = self._validators.get(pointset_id)
+        headers = {"If-None-Match": known[0]} if known is not None else None
+
+        try:
+            status, body, etag = await self._request(path, headers)
+        except (TimeoutError, asyncio.TimeoutError) as e:
+            self.breaker.failed()
+            raise ConnectionError(f"Timeout de connexion: {e}") from e
+        except (OSError, http.client.HTTPException, asyncio.IncompleteReadError,
+                ValueError) as e:
+            self.breaker.failed()
+            raise ConnectionError(f"PointSetManager inaccessible: {e}") from e
+        except BaseException:
+            self.breaker.abandoned()
+            raise
+        self.breaker.succeeded()
+
+        if status == 404:
+            self.not_found.add(pointset_id)
+        return _pointset_body(self._validators, pointset_id, known, status, body, etag)
+
+    async def close(self):
+        """Ferme toutes les connexions inactives."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def _shared_guards(manager_url):
+    """Retourne le disjoncteur et le cache negatif partages d'une URL."""
+    with _guards_lock:
+        guards = _guards.get(manager_url)
+        if guards is None:
+            guards = {"breaker": CircuitBreaker(), "not_found": NotFoundCache()}
+            _guards[manager_url] = guards
+        return guards
+
+
+def manager_stats(manager_url=DEFAULT_MANAGER_URL):
+    """Retourne l'etat des protections partagees d'un PointSetManager.
+
+    Args:
+        manager_url: URL du PointSetManager.
+
+    Returns:
+        dict: Etat du disjoncteur ("state", "failures", "opened",
+            "rejected") et du cache negatif ("not_found_entries",
+            "not_found_hits").
+    """
+    guards = _shared_guards(manager_url)
+    not_found = guards["not_found"].stats()
+    return {
+        **guards["breaker"].stats(),
+        "not_found_entries": not_found["entries"],
+        "not_found_hits": not_found["hits"],
+    }
+
+
+def get_client(manager_url=DEFAULT_MANAGER_URL):
+    """Retourne le client partage associe a une URL de PointSetManager.
+
+    Args:
+        manager_url: URL du PointSetManager.
+
+    Returns:
+        PointSetManagerClient: Client (et pool) partage entre les threads.
+    """
+    with _clients_lock:
+        client = _clients.get(manager_url)
+        if client is None:
+            client = PointSetManagerClient(manager_url, **_shared_guards(manager_url))
+            _clients[manager_url] = client
+        return client
+
+
+def get_pointset(pointset_id, manager_url=DEFAULT_MANAGER_URL):
     """Recupere un PointSet depuis le PointSetManager.
 
+    Utilise le pool de connexions partage de `get_client(manager_url)`.
+
+    Args:
+        pointset_id: UUID du PointSet a recuperer.
+        manager_url: URL du PointSetManager.
+
+    Returns:
+        bytes: Donnees binaires du PointSet.
+
+    Raises:
+        ValueError: Si l'UUID est invalide.
+        ConnectionError: Si le PointSetManager est inaccessible
+            (`CircuitOpenError` si le disjoncteur est ouvert).
+        FileNotFoundError: Si le PointSet n'existe pas (404).
+        RuntimeError: Pour les autres erreurs serveur.
+    """
+    _validate_uuid(pointset_id)
+    return get_client(manager_url).get_pointset(pointset_id)
+
+
+# Clients asynchrones par boucle d'evenements puis par URL. Les connexions
+# inactives referencent leur boucle : les boucles fermees sont retirees a
+# chaque acces, sans attendre le ramasse-miettes.
+_async_clients = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def _async_client(loop, manager_url):
+    """Retourne le client asynchrone partage d'une boucle et d'une URL."""
+    with _async_clients_lock:
+        for closed in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[closed]
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(manager_url)
+        if client is None:
+            client = AsyncPointSetManagerClient(manager_url, **_shared_guards(manager_url))
+            clients[manager_url] = client
+        return client
+
+
+async def get_pointset_async(pointset_id, manager_url=DEFAULT_MANAGER_URL):
+    """Recupere un PointSet depuis le PointSetManager sans bloquer de thread.
+
+    Utilise un `AsyncPointSetManagerClient` partage par boucle d'evenements
+    et par URL.
+
     Args:
         pointset_id: UUID du PointSet a recuperer.
         manager_url: URL du PointSetManager.
@@ -39,24 +758,23 @@ def get_pointset(pointset_id, manager_url="http://localhost:5000"):
 
     Raises:
         ValueError: Si l'UUID est invalide.
-        ConnectionError: Si le PointSetManager est inaccessible.
+        ConnectionError: Si le PointSetManager est inaccessible
+            (`CircuitOpenError` si le disjoncteur est ouvert).
         FileNotFoundError: Si le PointSet n'existe pas (404).
         RuntimeError: Pour les autres erreurs serveur.
     """
     _validate_uuid(pointset_id)
+    client = _async_client(asyncio.get_running_loop(), manager_url)
+    return await client.get_pointset(pointset_id)
+
 
-    url = f"{manager_url}/pointset/{pointset_id}"
-
-    try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            return response.read()
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            raise FileNotFoundError(f"PointSet {pointset_id} non trouve") from e
-        if e.code == 400:
-            raise ValueError(f"Requete invalide: {pointset_id}") from e
-        raise RuntimeError(f"Erreur serveur {e.code}") from e
-    except urllib.error.URLError as e:
-        raise ConnectionError(f"PointSetManager inaccessible: {e}") from e
-    except TimeoutError as e:
-        raise ConnectionError(f"Timeout de connexion: {e}") from e
+async def close_async_clients():
+    """Ferme et oublie les clients asynchrones de la boucle courante.
+
+    A appeler a l'arret de l'application (evenement lifespan
+    `shutdown`), avant la fermeture de la boucle.
+    """
+    with _async_clients_lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
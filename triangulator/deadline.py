@@ -0,0 +1,74 @@
+"""Delais et annulation cooperative des triangulations.
+
+Les moteurs sont du Python pur : un calcul abandonne (client deconnecte,
+delai depasse) ne peut pas etre interrompu de l'exterieur. Ils recoivent
+donc un `Deadline` optionnel qu'ils consultent toutes les
+`CHECK_INTERVAL` insertions (ou etapes equivalentes) et s'arretent en
+levant `TriangulationCancelled` des qu'il a expire ou ete annule.
+"""
+
+import time
+
+#: Nombre d'insertions entre deux verifications du delai : quelques
+#: millisecondes de calcul au plus, pour un cout de verification negligeable.
+CHECK_INTERVAL = 64
+
+
+class TriangulationCancelled(Exception):
+    """Triangulation interrompue par son `Deadline` (expire ou annule)."""
+
+
+class Deadline:
+    """Delai maximal d'un calcul, annulable a tout moment.
+
+    Partage entre le thread qui attend le calcul (et l'annule) et celui
+    qui l'execute (et le verifie). Transmis a un autre processus, il y est
+    reconstruit a partir du temps restant, un `Deadline` annule donnant un
+    delai nul.
+    """
+
+    __slots__ = ("expires", "_clock", "_cancelled")
+
+    def __init__(self, timeout=None, clock=time.monotonic):
+        """Initialise le delai.
+
+        Args:
+            timeout: Duree maximale en secondes a partir de maintenant
+                (None : pas de limite, seulement l'annulation).
+            clock: Horloge (s) utilisee pour l'expiration.
+        """
+        self._clock = clock
+        self.expires = None if timeout is None else clock() + timeout
+        self._cancelled = False
+
+    def __reduce__(self):
+        """Transmet le temps restant (les horloges des processus different)."""
+        return Deadline, (self.remaining(),)
+
+    def cancel(self):
+        """Annule le calcul : la prochaine verification l'interrompt."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        """True si le calcul a ete annule."""
+        return self._cancelled
+
+    def remaining(self):
+        """Retourne le temps restant en secondes (None : pas de limite)."""
+        if self._cancelled:
+            return 0.0
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - self._clock())
+
+    def check(self):
+        """Interrompt le calcul si le delai a expire ou a ete annule.
+
+        Raises:
+            TriangulationCancelled: Si le calcul doit s'arreter.
+        """
+        if self._cancelled:
+            raise TriangulationCancelled("Triangulation annulee")
+        if self.expires is not None and self._clock() >= self.expires:
+            raise TriangulationCancelled("Delai de triangulation depasse")
@@ -0,0 +1,268 @@
+"""Triangulation de Delaunay par diviser pour regner (Guibas-Stolfi).
+
+Les aretes sont stockees dans une structure quad-edge a plat : chaque arete
+occupe 4 enregistrements consecutifs (arete, rotation, symetrique, rotation
+inverse) dans les listes `org` et `onext`.
+"""
+
+from functools import partial
+
+from triangulator.deadline import CHECK_INTERVAL
+from triangulator.predicates import incircle_indexed, orient2d_indexed
+from triangulator.preprocessing import prepare
+
+
+def _rot(e):
+    """Retourne l'arete duale tournee de 90 degres."""
+    return (e & ~3) | ((e + 1) & 3)
+
+
+def _sym(e):
+    """Retourne l'arete de sens oppose."""
+    return (e & ~3) | ((e + 2) & 3)
+
+
+def _invrot(e):
+    """Retourne l'arete duale tournee de -90 degres."""
+    return (e & ~3) | ((e + 3) & 3)
+
+
+class _QuadEdgeMesh:
+    """Maillage quad-edge utilise par l'algorithme de Guibas-Stolfi."""
+
+    def __init__(self, xs, ys, deadline=None):
+        """Initialise un maillage vide.
+
+        Args:
+            xs: Abscisses des points (tries par x puis y).
+            ys: Ordonnees des points.
+            deadline: `Deadline` optionnel verifie par `build`.
+        """
+        self.xs = xs
+        self.ys = ys
+        self.deadline = deadline
+        # Predicats robustes lies aux coordonnees : `orient(a, b, c) > 0` si
+        # (a, b, c) est direct, `incircle(a, b, c, d) > 0` si d est
+        # strictement dans le cercle de (a, b, c) direct.
+        self.orient = partial(orient2d_indexed, xs, ys)
+        self.incircle = partial(incircle_indexed, xs, ys)
+        self.org = []
+        self.onext = []
+        self.alive = []
+
+    def dest(self, e):
+        """Retourne le sommet d'arrivee de l'arete e."""
+        return self.org[_sym(e)]
+
+    def lnext(self, e):
+        """Retourne l'arete suivante autour de la face gauche de e."""
+        return _rot(self.onext[_invrot(e)])
+
+    def oprev(self, e):
+        """Retourne l'arete precedente autour de l'origine de e."""
+        return _rot(self.onext[_rot(e)])
+
+    def rprev(self, e):
+        """Retourne l'arete precedente autour de la face droite de e."""
+        return self.onext[_sym(e)]
+
+    def make_edge(self, a, b):
+        """Cree une arete isolee de a vers b."""
+        e = len(self.org)
+        self.org.extend((a, -1, b, -1))
+        self.onext.extend((e, e + 3, e + 2, e + 1))
+        self.alive.append(True)
+        return e
+
+    def splice(self, a, b):
+        """Operateur splice de Guibas-Stolfi."""
+        onext = self.onext
+        alpha = _rot(onext[a])
+        beta = _rot(onext[b])
+        onext[a], onext[b] = onext[b], onext[a]
+        onext[alpha], onext[beta] = onext[beta], onext[alpha]
+
+    def connect(self, a, b):
+        """Cree une arete de dest(a) vers org(b) dans la face gauche de a."""
+        e = self.make_edge(self.dest(a), self.org[b])
+        self.splice(e, self.lnext(a))
+        self.splice(_sym(e), b)
+        return e
+
+    def delete_edge(self, e):
+        """Retire une arete du maillage."""
+        self.splice(e, self.oprev(e))
+        self.splice(_sym(e), self.oprev(_sym(e)))
+        self.alive[e >> 2] = False
+
+    def ccw(self, a, b, c):
+        """Teste si les sommets a, b, c sont en sens direct."""
+        return self.orient(a, b, c) > 0
+
+    def build(self, lo, hi):
+        """Triangule les sommets d'indices [lo, hi) de facon recursive.
+
+        Le `deadline` du maillage est verifie a l'entree de chaque
+        sous-probleme d'au moins `CHECK_INTERVAL` sommets.
+
+        Returns:
+            tuple: (ldo, rdo) aretes de l'enveloppe convexe partant du
+            sommet le plus a gauche (sens direct) et arrivant au sommet le
+            plus a droite (sens indirect).
+
+        Raises:
+            TriangulationCancelled: Si le `deadline` expire ou est annule.
+        """
+        count = hi - lo
+        if count >= CHECK_INTERVAL and self.deadline is not None:
+            self.deadline.check()
+        if count == 2:
+            a = self.make_edge(lo, lo + 1)
+            return a, _sym(a)
+
+        if count == 3:
+            a = self.make_edge(lo, lo + 1)
+            b = self.make_edge(lo + 1, lo + 2)
+            self.splice(_sym(a), b)
+            if self.ccw(lo, lo + 1, lo + 2):
+                self.connect(b, a)
+                return a, _sym(b)
+            if self.ccw(lo, lo + 2, lo + 1):
+                c = self.connect(b, a)
+                return _sym(c), c
+            return a, _sym(b)
+
+        mid = (lo + hi) // 2
+        ldo, ldi = self.build(lo, mid)
+        rdi, rdo = self.build(mid, hi)
+        return self.merge(ldo, ldi, rdi, rdo)
+
+    def merge(self, ldo, ldi, rdi, rdo):
+        """Fusionne deux triangulations voisines en une seule.
+
+        Tous les sommets de gauche precedent (ordre lexicographique) ceux
+        de droite. Seules les aretes proches de la couture sont examinees :
+        des aretes de part et d'autre sont supprimees et les aretes de
+        couture creees.
+
+        Args:
+            ldo: Arete d'enveloppe de gauche partant de son sommet le plus a
+                gauche (sens direct).
+            ldi: Arete d'enveloppe de gauche arrivant a son sommet le plus a
+                droite (sens indirect).
+            rdi: Arete d'enveloppe de droite partant de son sommet le plus a
+                gauche (sens direct).
+            rdo: Arete d'enveloppe de droite arrivant a son sommet le plus a
+                droite (sens indirect).
+
+        Returns:
+            tuple: (ldo, rdo) de la triangulation fusionnee.
+        """
+        org = self.org
+        dest = self.dest
+        orient = self.orient
+
+        # Tangente inferieure commune aux deux enveloppes.
+        while True:
+            if orient(org[rdi], org[ldi], dest(ldi)) > 0:
+                ldi = self.lnext(ldi)
+            elif orient(org[ldi], dest(rdi), org[rdi]) > 0:
+                rdi = self.rprev(rdi)
+            else:
+                break
+
+        basel = self.connect(_sym(rdi), ldi)
+        if org[ldi] == org[ldo]:
+            ldo = _sym(basel)
+        if org[rdi] == org[rdo]:
+            rdo = basel
+
+        incircle = self.incircle
+        onext = self.onext
+        while True:
+            b_org = org[basel]
+            b_dest = dest(basel)
+
+            lcand = onext[_sym(basel)]
+            lvalid = orient(dest(lcand), b_dest, b_org) > 0
+            if lvalid:
+                while incircle(b_dest, b_org, dest(lcand), dest(onext[lcand])) > 0:
+                    t = onext[lcand]
+                    self.delete_edge(lcand)
+                    lcand = t
+
+            rcand = self.oprev(basel)
+            rvalid = orient(dest(rcand), b_dest, b_org) > 0
+            if rvalid:
+                while incircle(b_dest, b_org, dest(rcand), dest(self.oprev(rcand))) > 0:
+                    t = self.oprev(rcand)
+                    self.delete_edge(rcand)
+                    rcand = t
+
+            if not lvalid and not rvalid:
+                break
+
+            if not lvalid or (
+                rvalid
+                and incircle(dest(lcand), org[lcand], org[rcand], dest(rcand)) > 0
+            ):
+                basel = self.connect(rcand, _sym(basel))
+            else:
+                basel = self.connect(_sym(basel), _sym(lcand))
+
+        return ldo, rdo
+
+    def triangles(self):
+        """Extrait les faces triangulaires internes en sens direct.
+
+        Returns:
+            list: Liste de tuples (i1, i2, i3) d'indices de sommets tries.
+        """
+        org = self.org
+        lnext = self.lnext
+        result = []
+        for q, is_alive in enumerate(self.alive):
+            if not is_alive:
+                continue
+            for e in (4 * q, 4 * q + 2):
+                e2 = lnext(e)
+                e3 = lnext(e2)
+                if lnext(e3) != e or e2 < e or e3 < e:
+                    continue
+                a, b, c = org[e], org[e2], org[e3]
+                if self.ccw(a, b, c):
+                    result.append((a, b, c))
+        return result
+
+
+def triangulate(points, deadline=None):
+    """Calcule la triangulation de Delaunay par diviser pour regner.
+
+    Les points distincts sont tries lexicographiquement puis triangules par
+    l'algorithme de Guibas-Stolfi en O(n log n). Les indices retournes font
+    reference a la liste `points` d'origine (premiere occurrence pour les
+    doublons).
+
+    Args:
+        points: Liste de tuples (x, y) ou `PreparedPoints`.
+        deadline: `Deadline` optionnel verifie pendant la construction.
+
+    Returns:
+        list: Liste de tuples (i1, i2, i3) representant les triangles
+              par indices de sommets.
+
+    Raises:
+        TriangulationCancelled: Si `deadline` expire ou est annule.
+    """
+    prepared = prepare(points)
+    original = prepared.lexicographic()
+    xs = [prepared.xs[i] for i in original]
+    ys = [prepared.ys[i] for i in original]
+
+    mesh = _QuadEdgeMesh(xs, ys, deadline)
+    mesh.build(0, len(xs))
+
+    return [
+        (original[a], original[b], original[c])
+        for a, b, c in mesh.triangles()
+    ]
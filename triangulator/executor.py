@@ -0,0 +1,224 @@
+"""Execution des triangulations dans un pool de processus.
+
+`triangulate` est du Python pur et garde le GIL : des threads ne
+s'executent pas en parallele. Le pool envoie le travail decode ->
+triangulation -> encodage a des processus, avec des bytes en entree comme
+en sortie. Au-dela d'une taille de PointSet, entree et sortie passent par
+des segments de memoire partagee (`triangulator.transport`) au lieu d'etre
+serialisees.
+
+Chaque travail recoit un `Deadline` de `timeout` secondes : le processus
+de calcul s'arrete de lui-meme quand l'appelant abandonne l'attente, au
+lieu d'occuper le pool jusqu'a la fin de la triangulation.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from triangulator.deadline import Deadline
+from triangulator.service import ServiceError, compute_triangulation
+from triangulator.transport import SharedJob, compute_shared, output_size
+
+
+class TriangulationPool:
+    """Pool de processus borne pour `compute_triangulation`.
+
+    Au plus `max_pending` travaux (en cours ou en attente) sont acceptes ;
+    au-dela, la soumission est refusee immediatement (503). Chaque travail
+    dispose d'un delai maximal `timeout`. Les PointSets d'au moins
+    `shared_memory_min_bytes` octets sont transmis par memoire partagee.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=30.0,
+                 shared_memory_min_bytes=1024 * 1024):
+        """Initialise le pool (les processus sont demarres a la demande).
+
+        Args:
+            workers: Nombre de processus (nombre de coeurs par defaut).
+            max_pending: Nombre maximal de travaux acceptes simultanement
+                (2 x workers par defaut).
+            timeout: Delai maximal d'un travail en secondes.
+            shared_memory_min_bytes: Taille de PointSet a partir de laquelle
+                la memoire partagee est utilisee (None la desactive).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.timeout = timeout
+        self.shared_memory_min_bytes = shared_memory_min_bytes
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = 0
+
+    def _get_executor(self):
+        """Retourne l'executor, en le (re)creant si necessaire."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset(self, executor):
+        """Remplace un executor casse par un processus mort."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, pointset_data, method):
+        """Soumet un travail sans attendre son resultat.
+
+        Args:
+            pointset_data: bytes du PointSet.
+            method: Nom du moteur de triangulation.
+
+        Returns:
+            concurrent.futures.Future: Future des Triangles encodes.
+
+        Raises:
+            ServiceError: 503 POOL_SATURATED si le pool est plein.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceError(
+                503, "POOL_SATURATED", "Trop de triangulations en cours"
+            )
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._submit(pointset_data, method, Deadline(self.timeout))
+        except BaseException:
+            self._release()
+            raise
+
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        """Libere la place d'un travail termine ou refuse."""
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _submit(self, pointset_data, method, deadline):
+        """Soumet un travail, par memoire partagee s'il est assez gros."""
+        min_bytes = self.shared_memory_min_bytes
+        size = None
+        if min_bytes is not None and len(pointset_data) >= min_bytes:
+            size = output_size(pointset_data)
+        if size is None:
+            return self._submit_call(compute_triangulation, pointset_data, method, deadline)
+
+        job = SharedJob(pointset_data, size)
+        try:
+            inner = self._submit_call(compute_shared, *job.arguments(), method, deadline)
+        except BaseException:
+            job.close()
+            raise
+        return job.attach(inner)
+
+    def _submit_call(self, fn, *args):
+        """Soumet un appel, en recreant une fois un executor casse.
+
+        Un processus mort casse tout l'executor : la soumission suivante
+        echoue avec `BrokenProcessPool` et l'executor est alors remplace.
+        """
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset(executor)
+        return self._get_executor().submit(fn, *args)
+
+    def result(self, future):
+        """Attend le resultat d'un travail soumis.
+
+        Args:
+            future: Future retournee par `submit`.
+
+        Returns:
+            bytes: Triangles au format binaire.
+
+        Raises:
+            ServiceError: 503 TRIANGULATION_TIMEOUT si le delai est depasse,
+                500 WORKER_FAILED si le processus est mort, ou l'erreur du
+                calcul lui-meme.
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise ServiceError(
+                503, "TRIANGULATION_TIMEOUT",
+                f"Triangulation non terminee apres {self.timeout}s"
+            ) from e
+        except BrokenProcessPool as e:
+            raise ServiceError(
+                500, "WORKER_FAILED", "Le processus de triangulation s'est arrete"
+            ) from e
+
+    async def result_async(self, future):
+        """Attend le resultat d'un travail soumis sans bloquer la boucle.
+
+        Args:
+            future: Future retournee par `submit`.
+
+        Returns:
+            bytes: Triangles au format binaire.
+
+        Raises:
+            ServiceError: Voir `result`.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError as e:
+            raise ServiceError(
+                503, "TRIANGULATION_TIMEOUT",
+                f"Triangulation non terminee apres {self.timeout}s"
+            ) from e
+        except BrokenProcessPool as e:
+            raise ServiceError(
+                500, "WORKER_FAILED", "Le processus de triangulation s'est arrete"
+            ) from e
+
+    def run(self, pointset_data, method):
+        """Soumet un travail et attend son resultat.
+
+        Args:
+            pointset_data: bytes du PointSet.
+            method: Nom du moteur de triangulation.
+
+        Returns:
+            bytes: Triangles au format binaire.
+
+        Raises:
+            ServiceError: Voir `submit` et `result`.
+        """
+        return self.result(self.submit(pointset_data, method))
+
+    def stats(self):
+        """Retourne l'occupation du pool.
+
+        Returns:
+            dict: Nombre de processus, travaux acceptes et limite.
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+            }
+
+    def shutdown(self, wait=True):
+        """Arrete les processus du pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,234 @@
+"""Mesures du pipeline de triangulation.
+
+Chaque requete chronometre ses etapes (recuperation, decodage,
+preparation, triangulation, encodage) dans un dictionnaire `timings` ;
+`Metrics` agrege ces durees et les tailles d'entree / sortie dans des
+histogrammes a seaux fixes, et compte les reponses par statut et code
+d'erreur. Enregistrer une mesure ne coute qu'une recherche dichotomique
+et un increment sous verrou : l'instrumentation reste active en
+production.
+
+Les mesures sont exposees au format texte Prometheus (`Metrics.render`)
+et, pour une requete, dans l'en-tete `Server-Timing` (`server_timing`).
+"""
+
+import bisect
+import struct
+import threading
+
+#: Seaux (secondes) des histogrammes de duree.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0, 30.0,
+)
+
+#: Seaux des histogrammes de nombre de points et de triangles.
+COUNT_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+#: Seaux (octets) de l'histogramme de taille des reponses.
+BYTES_BUCKETS = (
+    1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000,
+)
+
+_COUNT = struct.Struct("<L")
+
+
+class Histogram:
+    """Histogramme cumulatif a seaux fixes, partageable entre threads."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "_lock")
+
+    def __init__(self, buckets):
+        """Initialise un histogramme vide.
+
+        Args:
+            buckets: Bornes superieures des seaux, croissantes (le seau
+                +Inf est implicite).
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Enregistre une valeur.
+
+        Args:
+            value: Valeur mesuree.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self):
+        """Retourne (comptes cumules par seau, nombre, somme)."""
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.sum
+        cumulative = []
+        running = 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return cumulative, count, total
+
+
+def _format_value(value):
+    """Formate un nombre au format texte Prometheus."""
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _format_labels(labels):
+    """Formate un dictionnaire de labels Prometheus."""
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{value}"' for name, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _render_histogram(lines, name, labels, histogram):
+    """Ajoute les lignes d'un histogramme au rendu Prometheus."""
+    cumulative, count, total = histogram.snapshot()
+    bounds = [_format_value(b) for b in histogram.buckets] + ["+Inf"]
+    for bound, value in zip(bounds, cumulative):
+        lines.append(
+            f"{name}_bucket{_format_labels({**labels, 'le': bound})} {value}"
+        )
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+
+def server_timing(timings):
+    """Formate des durees d'etapes pour l'en-tete `Server-Timing`.
+
+    Args:
+        timings: Dictionnaire etape -> duree en secondes.
+
+    Returns:
+        str: Valeur de l'en-tete (durees en millisecondes).
+    """
+    return ", ".join(
+        f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in timings.items()
+    )
+
+
+class Metrics:
+    """Mesures agregees du service."""
+
+    def __init__(self):
+        """Initialise des mesures vides."""
+        self._lock = threading.Lock()
+        self.phases = {}
+        self.points = Histogram(COUNT_BUCKETS)
+        self.triangles = Histogram(COUNT_BUCKETS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.responses = {}
+        self.errors = {}
+
+    def _phase(self, phase):
+        """Retourne l'histogramme d'une etape, cree a la premiere mesure."""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            with self._lock:
+                histogram = self.phases.setdefault(phase, Histogram(LATENCY_BUCKETS))
+        return histogram
+
+    def observe_timings(self, timings):
+        """Enregistre les durees des etapes d'une requete.
+
+        Args:
+            timings: Dictionnaire etape -> duree en secondes.
+        """
+        for phase, seconds in timings.items():
+            self._phase(phase).observe(seconds)
+
+    def observe_sizes(self, n_points, n_triangles, n_bytes):
+        """Enregistre les tailles d'un resultat.
+
+        Args:
+            n_points: Nombre de points.
+            n_triangles: Nombre de triangles.
+            n_bytes: Taille du resultat encode en octets.
+        """
+        self.points.observe(n_points)
+        self.triangles.observe(n_triangles)
+        self.response_bytes.observe(n_bytes)
+
+    def observe_result(self, data):
+        """Enregistre les tailles d'un resultat deja encode.
+
+        Les nombres de points et de triangles sont lus dans les en-tetes du
+        format Triangles, sans decoder le reste.
+
+        Args:
+            data: Triangles au format binaire.
+        """
+        (n_points,) = _COUNT.unpack_from(data, 0)
+        (n_triangles,) = _COUNT.unpack_from(data, _COUNT.size + 8 * n_points)
+        self.observe_sizes(n_points, n_triangles, len(data))
+
+    def count_response(self, status, code=None):
+        """Compte une reponse (ou un element de lot).
+
+        Args:
+            status: Statut HTTP.
+            code: Code d'erreur JSON, pour une erreur.
+        """
+        with self._lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+            if code is not None:
+                self.errors[code] = self.errors.get(code, 0) + 1
+
+    def render(self, gauges=()):
+        """Retourne les mesures au format texte Prometheus.
+
+        Args:
+            gauges: Valeurs supplementaires, iterable de tuples (nom, type,
+                aide, valeur) ; le type est "gauge" ou "counter".
+
+        Returns:
+            str: Exposition Prometheus (version 0.0.4).
+        """
+        lines = []
+
+        lines.append("# HELP triangulator_phase_seconds Duree des etapes du calcul.")
+        lines.append("# TYPE triangulator_phase_seconds histogram")
+        for phase in sorted(self.phases):
+            _render_histogram(
+                lines, "triangulator_phase_seconds", {"phase": phase}, self.phases[phase]
+            )
+
+        for name, help_text, histogram in (
+            ("triangulator_points", "Nombre de points des PointSets.", self.points),
+            ("triangulator_triangles", "Nombre de triangles calcules.", self.triangles),
+            ("triangulator_response_bytes", "Taille des Triangles encodes.",
+             self.response_bytes),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            _render_histogram(lines, name, {}, histogram)
+
+        with self._lock:
+            responses = sorted(self.responses.items())
+            errors = sorted(self.errors.items())
+        lines.append("# HELP triangulator_responses_total Reponses par statut HTTP.")
+        lines.append("# TYPE triangulator_responses_total counter")
+        for status, count in responses:
+            lines.append(f'triangulator_responses_total{{status="{status}"}} {count}')
+        lines.append("# HELP triangulator_errors_total Erreurs par code.")
+        lines.append("# TYPE triangulator_errors_total counter")
+        for code, count in errors:
+            lines.append(f'triangulator_errors_total{{code="{code}"}} {count}')
+
+        for name, kind, help_text, value in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
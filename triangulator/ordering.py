@@ -0,0 +1,160 @@
+"""Ordres d'insertion spatiaux pour la triangulation incrementale.
+
+Bowyer-Watson localise chaque point par marche depuis le dernier triangle
+cree : le cout d'une insertion depend de la distance au point precedent.
+Inserer les points le long d'une courbe de Hilbert, ou selon un ordre
+aleatoire biaise (BRIO : tours aleatoires de taille croissante, chacun
+parcouru le long de la courbe), rend ce cout quasi constant quel que soit
+l'ordre d'arrivee des points.
+
+Si NumPy est installe, les cles de Hilbert sont calculees de facon
+vectorisee ; sinon en Python pur. Les deux chemins donnent les memes cles.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy est optionnel
+    np = None
+
+
+#: Nombre de bits par axe de la grille de Hilbert.
+HILBERT_BITS = 16
+
+_HILBERT_SIDE = 1 << HILBERT_BITS
+
+
+def _grid_scale(xs, ys):
+    """Retourne (min_x, min_y, echelle) pour ramener les points sur la grille."""
+    min_x = min(xs)
+    min_y = min(ys)
+    extent = max(max(xs) - min_x, max(ys) - min_y)
+    scale = (_HILBERT_SIDE - 1) / extent if extent > 0 else 0.0
+    return min_x, min_y, scale
+
+
+def _hilbert_keys_python(xs, ys):
+    """Calcule les cles de Hilbert en Python pur."""
+    min_x, min_y, scale = _grid_scale(xs, ys)
+    last = _HILBERT_SIDE - 1
+    keys = []
+    for x, y in zip(xs, ys):
+        gx = int((x - min_x) * scale)
+        gy = int((y - min_y) * scale)
+        key = 0
+        s = _HILBERT_SIDE >> 1
+        while s:
+            rx = 1 if gx & s else 0
+            ry = 1 if gy & s else 0
+            key += s * s * ((3 * rx) ^ ry)
+            if not ry:
+                if rx:
+                    gx = last - gx
+                    gy = last - gy
+                gx, gy = gy, gx
+            s >>= 1
+        keys.append(key)
+    return keys
+
+
+def _hilbert_keys_numpy(xs, ys):
+    """Calcule les cles de Hilbert avec NumPy."""
+    min_x, min_y, scale = _grid_scale(xs, ys)
+    last = _HILBERT_SIDE - 1
+    gx = ((np.asarray(xs, dtype=np.float64) - min_x) * scale).astype(np.int64)
+    gy = ((np.asarray(ys, dtype=np.float64) - min_y) * scale).astype(np.int64)
+    keys = np.zeros(len(gx), dtype=np.int64)
+    s = _HILBERT_SIDE >> 1
+    while s:
+        rx = (gx & s) > 0
+        ry = (gy & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+        flip = ~ry & rx
+        gx = np.where(flip, last - gx, gx)
+        gy = np.where(flip, last - gy, gy)
+        gx, gy = np.where(ry, gx, gy), np.where(ry, gy, gx)
+        s >>= 1
+    return keys.tolist()
+
+
+def hilbert_keys(xs, ys):
+    """Calcule la position de chaque point sur une courbe de Hilbert.
+
+    Les points sont ramenes sur une grille de 2^HILBERT_BITS cases par axe
+    couvrant leur boite englobante.
+
+    Args:
+        xs: Abscisses des points.
+        ys: Ordonnees des points.
+
+    Returns:
+        list: Cle entiere de chaque point.
+    """
+    if not xs:
+        return []
+    if np is not None:
+        return _hilbert_keys_numpy(xs, ys)
+    return _hilbert_keys_python(xs, ys)
+
+
+def input_order(xs, ys, indices):
+    """Conserve l'ordre d'arrivee des points."""
+    return list(indices)
+
+
+def hilbert_order(xs, ys, indices):
+    """Trie des indices de points le long d'une courbe de Hilbert.
+
+    Args:
+        xs: Abscisses de tous les points.
+        ys: Ordonnees de tous les points.
+        indices: Indices des points a ordonner.
+
+    Returns:
+        list: Indices tries (ordre stable pour les cles egales).
+    """
+    indices = list(indices)
+    keys = hilbert_keys([xs[i] for i in indices], [ys[i] for i in indices])
+    return [i for _, i in sorted(zip(keys, indices))]
+
+
+def brio_order(xs, ys, indices, seed=0):
+    """Ordonne des indices de points en BRIO (Amenta, Choi, Rote).
+
+    Les points sont melanges puis repartis en tours de taille doublant a
+    chaque tour ; chaque tour est parcouru le long d'une courbe de Hilbert.
+
+    Args:
+        xs: Abscisses de tous les points.
+        ys: Ordonnees de tous les points.
+        indices: Indices des points a ordonner.
+        seed: Graine du melange (ordre reproductible).
+
+    Returns:
+        list: Indices ordonnes.
+    """
+    shuffled = list(indices)
+    random.Random(seed).shuffle(shuffled)
+
+    bounds = []
+    end = len(shuffled)
+    while end > 0:
+        bounds.append(end)
+        end //= 2
+    bounds.reverse()
+
+    ordered = []
+    start = 0
+    for end in bounds:
+        ordered.extend(hilbert_order(xs, ys, shuffled[start:end]))
+        start = end
+    return ordered
+
+
+#: Ordres d'insertion disponibles, par nom.
+ORDERS = {
+    "input": input_order,
+    "hilbert": hilbert_order,
+    "brio": brio_order,
+}
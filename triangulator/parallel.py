@@ -0,0 +1,331 @@
+"""Triangulation de Delaunay parallele par bandes verticales.
+
+Les points distincts, tries lexicographiquement, sont decoupes en bandes
+verticales de meme effectif, une par processus. Chaque processus triangule
+sa bande par Guibas-Stolfi (`triangulator.divide_and_conquer`) et renvoie
+son maillage quad-edge et ses triangles. Le processus principal recolle les
+bandes voisines par l'etape de fusion de Guibas-Stolfi, qui n'examine que
+les aretes proches de la couture : le resultat est la triangulation de
+Delaunay globale, comme en sequentiel.
+
+Le processus principal ne recalcule pas les triangles des bandes : il
+retire ceux dont une arete a ete supprimee par une fusion et ajoute ceux
+des aretes de couture. Avec NumPy, le recollement des maillages et ce
+filtrage sont vectorises ; sinon ils sont faits en Python pur.
+"""
+
+import multiprocessing
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy est optionnel
+    np = None
+
+from triangulator import divide_and_conquer
+from triangulator.binary_format import _INDEX_FORMAT, TrianglesView
+from triangulator.deadline import TriangulationCancelled
+from triangulator.preprocessing import prepare
+
+#: Nombre minimal de points par bande : en dessous, le cout des processus
+#: depasse le gain et la triangulation reste sequentielle.
+MIN_STRIP_POINTS = 10_000
+
+# Intervalle (s) de verification du delai pendant l'attente des bandes.
+_POLL_INTERVAL = 0.005
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    """Retourne le pool de processus partage, (re)cree pour `workers`."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def _reset(executor):
+    """Oublie un pool casse par un processus mort."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    """Arrete les processus du pool partage."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _triangulate_strip(xs_data, ys_data, deadline=None):
+    """Triangule une bande (execute dans un processus du pool).
+
+    Args:
+        xs_data: Abscisses de la bande (octets d'un array "d"), dans l'ordre
+            lexicographique.
+        ys_data: Ordonnees de la bande (octets d'un array "d").
+        deadline: `Deadline` optionnel, reconstruit a partir du temps
+            restant a l'envoi.
+
+    Returns:
+        tuple: (org, onext, alive, ldo, rdo, triangles) ; `org`, `onext`
+            et `triangles` (a plat) sont les octets d'arrays d'entiers,
+            `alive` un octet par arete. Indices de sommets et d'aretes sont
+            locaux a la bande.
+    """
+    xs = array("d", xs_data).tolist()
+    ys = array("d", ys_data).tolist()
+    mesh = divide_and_conquer._QuadEdgeMesh(xs, ys, deadline)
+    ldo, rdo = mesh.build(0, len(xs))
+    triangles = array(_INDEX_FORMAT, [v for tri in mesh.triangles() for v in tri])
+    return (
+        array("i", mesh.org).tobytes(),
+        array("i", mesh.onext).tobytes(),
+        bytes(mesh.alive),
+        ldo,
+        rdo,
+        triangles.tobytes(),
+    )
+
+
+class _StripMesh(divide_and_conquer._QuadEdgeMesh):
+    """Maillage des bandes recollees, qui memorise les aretes supprimees."""
+
+    def __init__(self, xs, ys):
+        """Initialise un maillage vide sur tous les points.
+
+        Args:
+            xs: Abscisses de tous les points distincts (ordre
+                lexicographique).
+            ys: Ordonnees de tous les points distincts.
+        """
+        super().__init__(xs, ys)
+        self.org = array("i")
+        self.onext = array("i")
+        self.alive = bytearray()
+        self.deleted = []
+
+    def delete_edge(self, e):
+        """Retire une arete du maillage et la memorise."""
+        super().delete_edge(e)
+        self.deleted.append(e >> 2)
+
+    def append(self, org, onext, alive, vertex_offset):
+        """Ajoute le maillage d'une bande.
+
+        Args:
+            org: Octets de `org` de la bande.
+            onext: Octets de `onext` de la bande.
+            alive: Octets de `alive` de la bande.
+            vertex_offset: Indice global du premier sommet de la bande.
+
+        Returns:
+            int: Decalage a ajouter aux aretes de la bande.
+        """
+        edge_offset = len(self.org)
+        if np is not None:
+            org_values = np.frombuffer(org, dtype=np.intc)
+            self.org.frombytes(
+                np.where(org_values >= 0, org_values + vertex_offset, -1)
+                .astype(np.intc).tobytes()
+            )
+            self.onext.frombytes(
+                (np.frombuffer(onext, dtype=np.intc) + edge_offset).astype(np.intc).tobytes()
+            )
+        else:
+            self.org.extend(v + vertex_offset if v >= 0 else -1 for v in array("i", org))
+            self.onext.extend(e + edge_offset for e in array("i", onext))
+        self.alive.extend(alive)
+        return edge_offset
+
+    def faces(self, quads):
+        """Retourne les triangles bordes par des aretes (sens direct).
+
+        Args:
+            quads: Indices des aretes (quad-edge) a examiner.
+
+        Returns:
+            set: Triangles (a, b, c) en sens direct, `a` le plus petit
+                indice.
+        """
+        org = self.org
+        lnext = self.lnext
+        result = set()
+        for q in quads:
+            if not self.alive[q]:
+                continue
+            for e in (4 * q, 4 * q + 2):
+                e2 = lnext(e)
+                e3 = lnext(e2)
+                if lnext(e3) != e:
+                    continue
+                a, b, c = org[e], org[e2], org[e3]
+                if not self.ccw(a, b, c):
+                    continue
+                if b < a and b < c:
+                    a, b, c = b, c, a
+                elif c < a and c < b:
+                    a, b, c = c, a, b
+                result.add((a, b, c))
+        return result
+
+
+def _kept_triangles(strips, removed, n_points):
+    """Retourne les triangles des bandes qu'aucune fusion n'a detruits.
+
+    Args:
+        strips: Couples (indice du premier sommet, octets des triangles a
+            plat) de chaque bande.
+        removed: Aretes orientees (a, b) supprimees par les fusions.
+        n_points: Nombre de sommets.
+
+    Returns:
+        list: Indices de sommets a plat (tableau NumPy avec NumPy).
+    """
+    if np is not None:
+        keys = np.array([a * n_points + b for a, b in removed], dtype=np.int64)
+        kept = []
+        for lo, data in strips:
+            tri = np.frombuffer(data, dtype=np.uint32).reshape(-1, 3).astype(np.int64) + lo
+            mask = np.ones(len(tri), dtype=bool)
+            for k in range(3):
+                mask &= ~np.isin(tri[:, k] * n_points + tri[:, (k + 1) % 3], keys)
+            kept.append(tri[mask].ravel())
+        return np.concatenate(kept)
+
+    kept = []
+    for lo, data in strips:
+        flat = array(_INDEX_FORMAT, data)
+        for k in range(0, len(flat), 3):
+            a, b, c = flat[k] + lo, flat[k + 1] + lo, flat[k + 2] + lo
+            if (a, b) in removed or (b, c) in removed or (c, a) in removed:
+                continue
+            kept.extend((a, b, c))
+    return kept
+
+
+def _strip_result(future, deadline):
+    """Attend le resultat d'une bande en verifiant `deadline`."""
+    if deadline is None:
+        return future.result()
+    while True:
+        deadline.check()
+        try:
+            return future.result(timeout=_POLL_INTERVAL)
+        except FutureTimeoutError:
+            pass
+
+
+def triangulate(points, workers=None, deadline=None):
+    """Calcule la triangulation de Delaunay en parallele, par bandes.
+
+    Les indices retournes font reference a la liste `points` d'origine
+    (premiere occurrence pour les doublons). Avec un seul processus, ou
+    moins de 2 x `MIN_STRIP_POINTS` points distincts, le calcul est
+    sequentiel (`divide_and_conquer.triangulate`).
+
+    Args:
+        points: Liste de tuples (x, y) ou `PreparedPoints`.
+        workers: Nombre de processus et de bandes (nombre de coeurs par
+            defaut).
+        deadline: `Deadline` optionnel. Il est verifie pendant l'attente
+            des bandes, qui sont alors abandonnees ; chaque processus en
+            recoit une copie (temps restant) et s'arrete a son expiration,
+            mais pas a son annulation.
+
+    Returns:
+        Sequence de tuples (i1, i2, i3) : liste, ou `TrianglesView` quand le
+        calcul est reparti (encodee sans copie par `encode_triangles`).
+
+    Raises:
+        RuntimeError: Si un processus de triangulation s'est arrete.
+        TriangulationCancelled: Si `deadline` expire ou est annule.
+    """
+    prepared = prepare(points)
+    workers = workers or os.cpu_count() or 1
+    strips = min(workers, len(prepared.unique) // MIN_STRIP_POINTS)
+    if strips < 2:
+        return divide_and_conquer.triangulate(prepared, deadline)
+
+    original = prepared.lexicographic()
+    xs = [prepared.xs[i] for i in original]
+    ys = [prepared.ys[i] for i in original]
+    bounds = [len(xs) * k // strips for k in range(strips + 1)]
+
+    executor = _get_executor(workers)
+    futures = [
+        executor.submit(
+            _triangulate_strip,
+            array("d", xs[lo:hi]).tobytes(),
+            array("d", ys[lo:hi]).tobytes(),
+            deadline,
+        )
+        for lo, hi in zip(bounds, bounds[1:])
+    ]
+
+    mesh = _StripMesh(xs, ys)
+    hulls = []
+    strip_triangles = []
+    try:
+        for lo, future in zip(bounds, futures):
+            org, onext, alive, ldo, rdo, triangles = _strip_result(future, deadline)
+            offset = mesh.append(org, onext, alive, lo)
+            hulls.append((ldo + offset, rdo + offset))
+            strip_triangles.append((lo, triangles))
+    except BrokenProcessPool as e:
+        _reset(executor)
+        raise RuntimeError("Un processus de triangulation s'est arrete") from e
+    except TriangulationCancelled:
+        for future in futures:
+            future.cancel()
+        raise
+
+    # Fusions deux a deux, comme les niveaux superieurs de la recursion.
+    n_strip_edges = len(mesh.alive)
+    while len(hulls) > 1:
+        merged = [
+            mesh.merge(*hulls[k], *hulls[k + 1])
+            for k in range(0, len(hulls) - 1, 2)
+        ]
+        if len(hulls) % 2:
+            merged.append(hulls[-1])
+        hulls = merged
+
+    org = mesh.org
+    removed = set()
+    for q in mesh.deleted:
+        if q < n_strip_edges:
+            a, b = org[4 * q], org[4 * q + 2]
+            removed.add((a, b))
+            removed.add((b, a))
+    seam = mesh.faces(range(n_strip_edges, len(mesh.alive)))
+
+    kept = _kept_triangles(strip_triangles, removed, len(xs))
+    if np is not None:
+        flat = np.concatenate((kept, np.array(sorted(seam), dtype=np.int64).reshape(-1)))
+        indices = np.asarray(original, dtype=np.uint32)[flat]
+        values = array(_INDEX_FORMAT, indices.astype(np.uint32).tobytes())
+    else:
+        values = array(_INDEX_FORMAT, (original[v] for v in kept))
+        values.extend(original[v] for tri in sorted(seam) for v in tri)
+    return TrianglesView(memoryview(values))
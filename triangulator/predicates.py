@@ -0,0 +1,253 @@
+"""Predicats geometriques robustes (orientation et cercle circonscrit).
+
+Chaque predicat evalue d'abord son determinant en flottants et le compare
+a une borne d'erreur (Shewchuk, "Adaptive Precision Floating-Point
+Arithmetic and Fast Robust Geometric Predicates", etape A) : si le
+resultat depasse la borne, son signe est certain. Sinon seulement, le
+determinant est recalcule en arithmetique exacte sur des entiers (les
+flottants sont des fractions dyadiques, ramenees a un denominateur
+commun). Le cas courant ne coute donc que quelques multiplications, sans
+division ni epsilon arbitraire. Les coordonnees doivent etre finies.
+"""
+
+
+_EPSILON = 2.0 ** -53
+
+_CCW_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_ICC_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+
+def _sign(value):
+    """Retourne -1, 0 ou 1 selon le signe de `value`."""
+    return (value > 0) - (value < 0)
+
+
+def _as_integers(*values):
+    """Convertit des flottants en entiers, a un meme facteur positif pres.
+
+    Chaque flottant fini vaut n / 2^e : multiplier toutes les valeurs par
+    2^max(e) donne des entiers exacts, sans changer le signe d'un
+    determinant homogene.
+    """
+    ratios = [value.as_integer_ratio() for value in values]
+    scale = max(den for _, den in ratios)
+    return [num * (scale // den) for num, den in ratios]
+
+
+def _orient2d_exact(ax, ay, bx, by, cx, cy):
+    """Calcule le signe exact de `orient2d`."""
+    ax, ay, bx, by, cx, cy = _as_integers(ax, ay, bx, by, cx, cy)
+    return _sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def orient2d(ax, ay, bx, by, cx, cy):
+    """Teste l'orientation du triangle (a, b, c).
+
+    Args:
+        ax: Abscisse de a.
+        ay: Ordonnee de a.
+        bx: Abscisse de b.
+        by: Ordonnee de b.
+        cx: Abscisse de c.
+        cy: Ordonnee de c.
+
+    Returns:
+        float: Valeur de signe exact : positive si c est a gauche de a->b
+        (sens direct), negative a droite, nulle si les points sont alignes.
+    """
+    detleft = (ax - cx) * (by - cy)
+    detright = (ay - cy) * (bx - cx)
+    det = detleft - detright
+
+    if detleft > 0:
+        if detright <= 0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0:
+        if detright >= 0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+
+    errbound = _CCW_ERRBOUND * detsum
+    if det >= errbound or -det >= errbound:
+        return det
+    return _orient2d_exact(ax, ay, bx, by, cx, cy)
+
+
+def _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy):
+    """Calcule le signe exact de `incircle`."""
+    ax, ay, bx, by, cx, cy, dx, dy = _as_integers(ax, ay, bx, by, cx, cy, dx, dy)
+    adx = ax - dx
+    ady = ay - dy
+    bdx = bx - dx
+    bdy = by - dy
+    cdx = cx - dx
+    cdy = cy - dy
+    return _sign(
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+
+
+def incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    """Teste la position de d par rapport au cercle circonscrit de (a, b, c).
+
+    Args:
+        ax: Abscisse de a.
+        ay: Ordonnee de a.
+        bx: Abscisse de b.
+        by: Ordonnee de b.
+        cx: Abscisse de c.
+        cy: Ordonnee de c.
+        dx: Abscisse du point teste.
+        dy: Ordonnee du point teste.
+
+    Returns:
+        float: Valeur de signe exact, pour (a, b, c) en sens direct :
+        positive si d est strictement dans le cercle, negative s'il est
+        dehors, nulle s'il est sur le cercle.
+    """
+    adx = ax - dx
+    ady = ay - dy
+    bdx = bx - dx
+    bdy = by - dy
+    cdx = cx - dx
+    cdy = cy - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (alift * (bdxcdy - cdxbdy)
+           + blift * (cdxady - adxcdy)
+           + clift * (adxbdy - bdxady))
+
+    # Premier filtre sans valeur absolue : |x * y| <= (x^2 + y^2) / 2 majore
+    # le permanent par alift * blift + blift * clift + clift * alift.
+    errbound = _ICC_ERRBOUND * (alift * (blift + clift) + blift * clift)
+    if det > errbound or -det > errbound:
+        return det
+
+    # d confondu avec un sommet : exactement sur le cercle (une difference
+    # de flottants n'est nulle que si les deux valeurs sont egales).
+    if ((adx == 0 and ady == 0) or (bdx == 0 and bdy == 0)
+            or (cdx == 0 and cdy == 0)):
+        return 0.0
+
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    errbound = _ICC_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    return _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy)
+
+
+def orient2d_indexed(xs, ys, a, b, c):
+    """Variante de `orient2d` sur des indices de sommets.
+
+    Evite la construction des arguments dans les boucles des moteurs de
+    triangulation ; meme filtre et meme repli exact.
+
+    Args:
+        xs: Abscisses des sommets.
+        ys: Ordonnees des sommets.
+        a: Indice de a.
+        b: Indice de b.
+        c: Indice de c.
+
+    Returns:
+        float: Voir `orient2d`.
+    """
+    cx = xs[c]
+    cy = ys[c]
+    detleft = (xs[a] - cx) * (ys[b] - cy)
+    detright = (ys[a] - cy) * (xs[b] - cx)
+    det = detleft - detright
+
+    if detleft > 0:
+        if detright <= 0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0:
+        if detright >= 0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+
+    errbound = _CCW_ERRBOUND * detsum
+    if det >= errbound or -det >= errbound:
+        return det
+    return _orient2d_exact(xs[a], ys[a], xs[b], ys[b], cx, cy)
+
+
+def incircle_indexed(xs, ys, a, b, c, d):
+    """Variante de `incircle` sur des indices de sommets.
+
+    Args:
+        xs: Abscisses des sommets.
+        ys: Ordonnees des sommets.
+        a: Indice de a.
+        b: Indice de b.
+        c: Indice de c.
+        d: Indice du point teste.
+
+    Returns:
+        float: Voir `incircle`.
+    """
+    dx = xs[d]
+    dy = ys[d]
+    adx = xs[a] - dx
+    ady = ys[a] - dy
+    bdx = xs[b] - dx
+    bdy = ys[b] - dy
+    cdx = xs[c] - dx
+    cdy = ys[c] - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (alift * (bdxcdy - cdxbdy)
+           + blift * (cdxady - adxcdy)
+           + clift * (adxbdy - bdxady))
+
+    # Premier filtre sans valeur absolue : |x * y| <= (x^2 + y^2) / 2 majore
+    # le permanent par alift * blift + blift * clift + clift * alift.
+    errbound = _ICC_ERRBOUND * (alift * (blift + clift) + blift * clift)
+    if det > errbound or -det > errbound:
+        return det
+
+    # d confondu avec un sommet : exactement sur le cercle (une difference
+    # de flottants n'est nulle que si les deux valeurs sont egales).
+    if ((adx == 0 and ady == 0) or (bdx == 0 and bdy == 0)
+            or (cdx == 0 and cdy == 0)):
+        return 0.0
+
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    errbound = _ICC_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    return _incircle_exact(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], dx, dy)
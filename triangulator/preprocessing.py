@@ -0,0 +1,201 @@
+"""Preparation des points avant triangulation.
+
+Une seule etape valide les points (nombre, coordonnees finies, points
+distincts, alignement), elimine les doublons en gardant la premiere
+occurrence, et calcule la boite englobante. Les moteurs de triangulation
+recoivent le resultat (`PreparedPoints`) au lieu de refaire ces parcours.
+
+Si NumPy est installe, l'etape est vectorisee (tri lexicographique unique
+qui sert aussi au dedoublonnage) ; sinon elle est faite en Python pur. Les
+deux chemins donnent le meme resultat.
+"""
+
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy est optionnel
+    np = None
+
+from triangulator.binary_format import PointSetView
+from triangulator.predicates import _CCW_ERRBOUND, orient2d
+
+
+class PreparedPoints:
+    """Points valides et dedoublonnes, prets a etre triangules.
+
+    Attributes:
+        xs: Abscisses (float) de tous les points, dans l'ordre d'origine.
+        ys: Ordonnees (float) de tous les points, dans l'ordre d'origine.
+        unique: Indices d'origine des points distincts (premiere
+            occurrence), croissants.
+        bounds: Boite englobante (min_x, min_y, max_x, max_y).
+        timings: Duree de chaque etape en secondes.
+    """
+
+    __slots__ = ("xs", "ys", "unique", "bounds", "timings", "_lexicographic")
+
+    def __init__(self, xs, ys, unique, bounds, timings, lexicographic=None):
+        """Initialise le resultat de `prepare`."""
+        self.xs = xs
+        self.ys = ys
+        self.unique = unique
+        self.bounds = bounds
+        self.timings = timings
+        self._lexicographic = lexicographic
+
+    def __len__(self):
+        """Retourne le nombre de points d'origine (doublons compris)."""
+        return len(self.xs)
+
+    def lexicographic(self):
+        """Retourne les indices distincts tries par (x, y)."""
+        if self._lexicographic is None:
+            xs = self.xs
+            ys = self.ys
+            self._lexicographic = sorted(self.unique, key=lambda i: (xs[i], ys[i]))
+        return self._lexicographic
+
+
+def _coordinates_numpy(points):
+    """Retourne les points sous forme de tableau NumPy (n, 2) en float64."""
+    if isinstance(points, PointSetView):
+        coords = np.frombuffer(points.values_bytes(), dtype="<f4")
+    else:
+        coords = np.asarray(points, dtype=np.float64)
+    return coords.astype(np.float64).reshape(-1, 2)
+
+
+def _collinear_numpy(coords):
+    """Teste si des points distincts (au moins 2) sont exactement alignes."""
+    x0, y0 = coords[0]
+    x1, y1 = coords[1]
+    detleft = (x0 - coords[:, 0]) * (y1 - coords[:, 1])
+    detright = (y0 - coords[:, 1]) * (x1 - coords[:, 0])
+    det = detleft - detright
+    errbound = _CCW_ERRBOUND * (np.abs(detleft) + np.abs(detright))
+    if np.any(np.abs(det) > errbound):
+        return False
+    # Cas ambigus seulement (points presque alignes) : predicat exact.
+    return all(
+        orient2d(x0, y0, x1, y1, x, y) == 0 for x, y in coords[2:].tolist()
+    )
+
+
+def _prepare_numpy(points, timings):
+    """Chemin vectorise de `prepare`."""
+    start = time.perf_counter()
+    coords = _coordinates_numpy(points)
+    if not np.isfinite(coords).all():
+        raise ValueError("Les coordonnees doivent etre finies")
+    timings["validation"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    # Tri stable : a coordonnees egales, la premiere occurrence vient
+    # d'abord et sera conservee.
+    order = np.lexsort((coords[:, 1], coords[:, 0]))
+    ordered = coords[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+    lexicographic = order[first]
+    unique = np.sort(lexicographic)
+    timings["dedupe"] = time.perf_counter() - start
+
+    if len(unique) < 3:
+        raise ValueError("Au moins 3 points distincts sont requis")
+
+    start = time.perf_counter()
+    distinct = coords[unique]
+    low = distinct.min(axis=0)
+    high = distinct.max(axis=0)
+    bounds = (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+    timings["bounds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    collinear = _collinear_numpy(distinct)
+    timings["collinearity"] = time.perf_counter() - start
+    if collinear:
+        raise ValueError("Les points sont alignes")
+
+    return PreparedPoints(
+        coords[:, 0].tolist(), coords[:, 1].tolist(), unique.tolist(),
+        bounds, timings, lexicographic.tolist(),
+    )
+
+
+def _prepare_python(points, timings):
+    """Chemin en Python pur de `prepare`."""
+    start = time.perf_counter()
+    if isinstance(points, PointSetView):
+        xs = points.xs
+        ys = points.ys
+    else:
+        xs = [float(p[0]) for p in points]
+        ys = [float(p[1]) for p in points]
+    if not all(math.isfinite(x) and math.isfinite(y) for x, y in zip(xs, ys)):
+        raise ValueError("Les coordonnees doivent etre finies")
+    timings["validation"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first = {}
+    for i, p in enumerate(zip(xs, ys)):
+        first.setdefault(p, i)
+    unique = list(first.values())
+    timings["dedupe"] = time.perf_counter() - start
+
+    if len(unique) < 3:
+        raise ValueError("Au moins 3 points distincts sont requis")
+
+    start = time.perf_counter()
+    min_x = max_x = xs[unique[0]]
+    min_y = max_y = ys[unique[0]]
+    for i in unique:
+        x = xs[i]
+        y = ys[i]
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    timings["bounds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    x0, y0 = xs[unique[0]], ys[unique[0]]
+    x1, y1 = xs[unique[1]], ys[unique[1]]
+    collinear = all(orient2d(x0, y0, x1, y1, xs[i], ys[i]) == 0 for i in unique[2:])
+    timings["collinearity"] = time.perf_counter() - start
+    if collinear:
+        raise ValueError("Les points sont alignes")
+
+    return PreparedPoints(xs, ys, unique, (min_x, min_y, max_x, max_y), timings)
+
+
+def prepare(points):
+    """Valide et dedoublonne des points en une seule etape.
+
+    Args:
+        points: Liste de tuples (x, y), `PointSetView`, ou `PreparedPoints`
+            (retourne tel quel).
+
+    Returns:
+        PreparedPoints: Points prets a etre triangules.
+
+    Raises:
+        ValueError: Si moins de 3 points, si une coordonnee n'est pas
+            finie, si moins de 3 points sont distincts ou s'ils sont tous
+            alignes.
+    """
+    if isinstance(points, PreparedPoints):
+        return points
+
+    if len(points) < 3:
+        raise ValueError("Au moins 3 points sont requis")
+
+    timings = {}
+    if np is not None:
+        return _prepare_numpy(points, timings)
+    return _prepare_python(points, timings)
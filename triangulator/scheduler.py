@@ -0,0 +1,284 @@
+"""Controle d'admission et ordonnancement des triangulations selon leur cout.
+
+Le cout d'une triangulation est estime avant tout decodage, a partir du
+nombre de points lu dans l'en-tete du PointSet, en secondes : nombre de
+points x duree par point, moyenne glissante des calculs observes. Les
+travaux sont repartis entre deux files, petits et gros travaux, chacune
+avec sa propre limite de calculs simultanes : un PointSet d'un million de
+points n'occupe que la file des gros travaux et ne retarde pas les petits.
+
+Chaque file borne son arriere (travail estime en cours et en attente) :
+au-dela, la requete est refusee immediatement (503 SERVICE_OVERLOADED)
+avec un en-tete `Retry-After` estime, au lieu d'attendre sans fin.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+from triangulator.binary_format import read_point_count
+from triangulator.service import ServiceError
+
+#: Duree initiale estimee d'une triangulation par point (secondes).
+DEFAULT_SECONDS_PER_POINT = 50e-6
+
+# Poids d'une nouvelle mesure dans la moyenne glissante, et taille minimale
+# d'un calcul pour qu'il soit mesure (les petits sont domines par le bruit).
+_EWMA_WEIGHT = 0.2
+_MIN_OBSERVED_POINTS = 1000
+
+
+class _Lane:
+    """File de travaux de meme classe de cout (etat protege par le verrou)."""
+
+    __slots__ = ("name", "concurrency", "max_backlog", "running", "backlog",
+                 "waiters", "admitted", "rejected")
+
+    def __init__(self, name, concurrency, max_backlog):
+        """Initialise une file vide."""
+        self.name = name
+        self.concurrency = concurrency
+        self.max_backlog = max_backlog
+        self.running = 0
+        self.backlog = 0.0
+        self.waiters = []
+        self.admitted = 0
+        self.rejected = 0
+
+
+class Ticket:
+    """Travail admis dans une file, en attente d'une place de calcul.
+
+    S'utilise comme gestionnaire de contexte, synchrone (`with`) ou
+    asynchrone (`async with`) : l'entree attend une place dans la file,
+    la sortie la libere et, si le calcul a reussi, mesure sa duree.
+
+    Attributes:
+        lane: Nom de la file ("small" ou "large").
+        points: Nombre de points du travail.
+        cost: Cout estime en secondes.
+        waited: Duree d'attente d'une place (secondes).
+    """
+
+    __slots__ = ("lane", "points", "cost", "waited", "_scheduler", "_lane", "_started",
+                 "_done")
+
+    def __init__(self, scheduler, lane, points, cost):
+        """Initialise un ticket admis (voir `Scheduler.admit`)."""
+        self._scheduler = scheduler
+        self._lane = lane
+        self.lane = lane.name
+        self.points = points
+        self.cost = cost
+        self.waited = 0.0
+        self._started = None
+        self._done = False
+
+    def __enter__(self):
+        """Attend une place de calcul dans la file."""
+        start = time.perf_counter()
+        event = self._scheduler._acquire(self._lane, threading.Event)
+        if event is not None:
+            event.wait()
+        self._started = time.perf_counter()
+        self.waited = self._started - start
+        return self
+
+    async def __aenter__(self):
+        """Attend une place de calcul sans bloquer la boucle."""
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        waiter = self._scheduler._acquire(self._lane, loop.create_future)
+        if waiter is not None:
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._scheduler._abandon(self._lane, waiter, self.cost)
+                self._done = True
+                raise
+        self._started = time.perf_counter()
+        self.waited = self._started - start
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Libere la place et enregistre la duree d'un calcul reussi."""
+        self.close(exc_type)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Libere la place et enregistre la duree d'un calcul reussi."""
+        self.close(exc_type)
+
+    def close(self, exc_type=None):
+        """Libere la place (ou la reservation si le calcul n'a pas commence).
+
+        Args:
+            exc_type: Type de l'exception qui a interrompu le calcul, ou
+                None s'il a reussi. Un calcul en echec (refus immediat,
+                entree invalide, delai depasse) n'est pas mesure : sa duree
+                ne dit rien du cout par point.
+        """
+        if self._done:
+            return
+        self._done = True
+        if self._started is None:
+            self._scheduler._cancel(self._lane, self.cost)
+            return
+        elapsed = None
+        if exc_type is None:
+            elapsed = time.perf_counter() - self._started
+        self._scheduler._release(self._lane, self.cost, self.points, elapsed)
+
+
+class Scheduler:
+    """Admission et repartition des triangulations en deux files.
+
+    Partage entre threads et boucles asyncio.
+    """
+
+    def __init__(self, large_points=50_000, small_concurrency=8, large_concurrency=1,
+                 small_max_backlog=10.0, large_max_backlog=120.0,
+                 seconds_per_point=DEFAULT_SECONDS_PER_POINT):
+        """Initialise l'ordonnanceur.
+
+        Args:
+            large_points: Nombre de points a partir duquel un travail est
+                gros.
+            small_concurrency: Calculs simultanes de la file des petits
+                travaux.
+            large_concurrency: Calculs simultanes de la file des gros
+                travaux.
+            small_max_backlog: Travail estime maximal (secondes) en cours et
+                en attente dans la file des petits travaux (None : illimite).
+            large_max_backlog: Idem pour la file des gros travaux.
+            seconds_per_point: Estimation initiale de la duree par point.
+        """
+        self.large_points = large_points
+        self.seconds_per_point = seconds_per_point
+        self._small = _Lane("small", small_concurrency, small_max_backlog)
+        self._large = _Lane("large", large_concurrency, large_max_backlog)
+        self._lock = threading.Lock()
+
+    def estimate(self, points):
+        """Estime la duree (secondes) de la triangulation de `points` points."""
+        return points * self.seconds_per_point
+
+    def admit(self, pointset_data):
+        """Admet un travail dans sa file, ou le refuse.
+
+        Seul l'en-tete du PointSet est lu ; un en-tete invalide est admis
+        comme un travail vide (le decodage signalera l'erreur).
+
+        Args:
+            pointset_data: bytes du PointSet.
+
+        Returns:
+            Ticket: Travail admis, a utiliser comme gestionnaire de contexte.
+
+        Raises:
+            ServiceError: 503 SERVICE_OVERLOADED, avec un en-tete
+                `Retry-After`, si l'arriere de la file serait depasse.
+        """
+        try:
+            points = read_point_count(pointset_data)
+        except ValueError:
+            points = 0
+        lane = self._large if points >= self.large_points else self._small
+
+        with self._lock:
+            cost = self.estimate(points)
+            limit = lane.max_backlog
+            # Une file vide accepte toujours un travail, meme plus gros que
+            # sa limite : sinon il ne serait jamais execute.
+            if limit is not None and lane.backlog > 0 and lane.backlog + cost > limit:
+                lane.rejected += 1
+                retry_after = max(1, math.ceil(lane.backlog / lane.concurrency))
+                raise ServiceError(
+                    503, "SERVICE_OVERLOADED",
+                    f"File des travaux {lane.name} pleine "
+                    f"(~{lane.backlog:.1f}s de travail en attente)",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            lane.backlog += cost
+            lane.admitted += 1
+        return Ticket(self, lane, points, cost)
+
+    def _acquire(self, lane, make_waiter):
+        """Prend une place dans la file, ou retourne un objet a attendre."""
+        with self._lock:
+            if lane.running < lane.concurrency and not lane.waiters:
+                lane.running += 1
+                return None
+            waiter = make_waiter()
+            lane.waiters.append(waiter)
+            return waiter
+
+    def _wake(self, lane):
+        """Donne la place liberee au premier en attente (verrou tenu)."""
+        # Une future annulee mais pas encore retiree recoit aussi la place :
+        # `_abandon` la rendra.
+        while lane.waiters and lane.running < lane.concurrency:
+            waiter = lane.waiters.pop(0)
+            lane.running += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                waiter.get_loop().call_soon_threadsafe(_grant, waiter)
+
+    def _release(self, lane, cost, points, elapsed):
+        """Libere une place apres un calcul et met a jour l'estimation.
+
+        `elapsed` vaut None pour un calcul en echec, qui n'est pas mesure.
+        """
+        with self._lock:
+            lane.running -= 1
+            lane.backlog = max(0.0, lane.backlog - cost)
+            if elapsed is not None and points >= _MIN_OBSERVED_POINTS:
+                self.seconds_per_point += _EWMA_WEIGHT * (
+                    elapsed / points - self.seconds_per_point
+                )
+            self._wake(lane)
+
+    def _cancel(self, lane, cost):
+        """Retire la reservation d'un travail jamais commence."""
+        with self._lock:
+            lane.backlog = max(0.0, lane.backlog - cost)
+
+    def _abandon(self, lane, waiter, cost):
+        """Retire un travail asynchrone annule pendant son attente."""
+        with self._lock:
+            lane.backlog = max(0.0, lane.backlog - cost)
+            if waiter in lane.waiters:
+                lane.waiters.remove(waiter)
+                return
+            # La place lui avait deja ete donnee : la passer au suivant.
+            lane.running -= 1
+            self._wake(lane)
+
+    def stats(self):
+        """Retourne l'etat des files.
+
+        Returns:
+            dict: Par file ("small", "large") : calculs en cours, travaux en
+                attente, arriere estime (s), admis et refuses ; et la duree
+                estimee par point.
+        """
+        with self._lock:
+            result = {
+                lane.name: {
+                    "running": lane.running,
+                    "waiting": len(lane.waiters),
+                    "backlog": lane.backlog,
+                    "admitted": lane.admitted,
+                    "rejected": lane.rejected,
+                }
+                for lane in (self._small, self._large)
+            }
+            result["seconds_per_point"] = self.seconds_per_point
+            return result
+
+
+def _grant(waiter):
+    """Reveille un travail asynchrone en attente (dans sa boucle)."""
+    if not waiter.done():
+        waiter.set_result(None)
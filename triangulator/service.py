@@ -0,0 +1,242 @@
+"""Etapes du service de triangulation communes aux differents points d'entree.
+
+Les applications Flask (`triangulator.app`) et ASGI (`triangulator.asgi`)
+partagent la correspondance entre exceptions et reponses d'erreur JSON du
+contrat `TP/triangulator.yml`, ainsi que le calcul decode -> triangulation
+-> encodage.
+"""
+
+import math
+import time
+
+from triangulator.binary_format import (
+    PointSetView,
+    encode_triangles,
+    encoded_triangles_size,
+    iter_encode_triangles,
+)
+from triangulator.client import CircuitOpenError
+from triangulator.deadline import TriangulationCancelled
+from triangulator.triangulation import ENGINES, Triangulation, triangulate
+
+
+class ServiceError(Exception):
+    """Erreur du service, associee a un code HTTP et a un code d'erreur JSON."""
+
+    def __init__(self, status, code, message, headers=None):
+        """Initialise l'erreur.
+
+        Args:
+            status: Code HTTP de la reponse.
+            code: Code d'erreur du corps JSON.
+            message: Message lisible du corps JSON.
+            headers: En-tetes HTTP a ajouter a la reponse (ex. `Retry-After`).
+        """
+        super().__init__(status, code, message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.headers = headers or {}
+
+    def to_dict(self):
+        """Retourne le corps JSON de l'erreur."""
+        return {"code": self.code, "message": self.message}
+
+
+def check_method(method):
+    """Verifie qu'un moteur de triangulation existe.
+
+    Args:
+        method: Nom du moteur demande.
+
+    Raises:
+        ServiceError: 400 INVALID_METHOD si le moteur est inconnu.
+    """
+    if method not in ENGINES:
+        raise ServiceError(
+            400, "INVALID_METHOD", f"Methode de triangulation inconnue: {method}"
+        )
+
+
+def fetch_error(error):
+    """Traduit une exception de recuperation du PointSet en `ServiceError`.
+
+    Args:
+        error: Exception levee par `get_pointset`.
+
+    Returns:
+        ServiceError: Erreur a renvoyer au client.
+    """
+    if isinstance(error, ValueError):
+        return ServiceError(400, "INVALID_UUID", str(error))
+    if isinstance(error, FileNotFoundError):
+        return ServiceError(404, "POINTSET_NOT_FOUND", str(error))
+    if isinstance(error, CircuitOpenError):
+        return ServiceError(
+            503, "SERVICE_UNAVAILABLE", f"PointSetManager indisponible: {error}",
+            headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+        )
+    return ServiceError(
+        503, "SERVICE_UNAVAILABLE", f"PointSetManager inaccessible: {error}"
+    )
+
+
+#: Exceptions de `get_pointset` traduites par `fetch_error`.
+FETCH_ERRORS = (ValueError, FileNotFoundError, ConnectionError, RuntimeError)
+
+
+def cancelled_error(error):
+    """Traduit une triangulation interrompue en `ServiceError`.
+
+    Args:
+        error: `TriangulationCancelled` levee par le moteur.
+
+    Returns:
+        ServiceError: 503 TRIANGULATION_TIMEOUT.
+    """
+    return ServiceError(503, "TRIANGULATION_TIMEOUT", str(error))
+
+
+def decode_points(pointset_data, status=500):
+    """Decode un PointSet en `PointSetView`.
+
+    Args:
+        pointset_data: bytes du PointSet.
+        status: Code HTTP de l'erreur si le format est invalide (500 pour
+            un PointSet du PointSetManager, 400 pour un corps de requete).
+
+    Returns:
+        PointSetView: Points du PointSet.
+
+    Raises:
+        ServiceError: INVALID_POINTSET si le format est invalide.
+    """
+    try:
+        return PointSetView.from_bytes(pointset_data)
+    except ValueError as e:
+        raise ServiceError(
+            status, "INVALID_POINTSET", f"Format PointSet invalide: {e}"
+        ) from e
+
+
+def open_triangulation(pointset_data, deadline=None):
+    """Decode un PointSet et construit sa `Triangulation` incrementale.
+
+    Args:
+        pointset_data: bytes du PointSet.
+        deadline: `Deadline` optionnel de la triangulation.
+
+    Returns:
+        Triangulation: Triangulation a laquelle des points peuvent etre
+            ajoutes.
+
+    Raises:
+        ServiceError: 500 INVALID_POINTSET ou TRIANGULATION_FAILED, 503
+            TRIANGULATION_TIMEOUT si `deadline` expire ou est annule.
+    """
+    points = decode_points(pointset_data)
+    try:
+        return Triangulation(points, deadline=deadline)
+    except ValueError as e:
+        raise ServiceError(500, "TRIANGULATION_FAILED", str(e)) from e
+    except TriangulationCancelled as e:
+        raise cancelled_error(e) from e
+
+
+def triangulate_pointset(pointset_data, method, timings=None, deadline=None):
+    """Decode un PointSet et le triangule, sans encoder le resultat.
+
+    Args:
+        pointset_data: bytes du PointSet.
+        method: Nom du moteur de triangulation.
+        timings: Dictionnaire optionnel complete avec la duree (secondes)
+            des etapes "decode", "preprocess" et "triangulate".
+        deadline: `Deadline` optionnel de la triangulation.
+
+    Returns:
+        tuple: (PointSetView, triangles).
+
+    Raises:
+        ServiceError: 500 INVALID_POINTSET, TRIANGULATION_FAILED ou
+            WORKER_FAILED (processus du moteur parallel arrete), 503
+            TRIANGULATION_TIMEOUT si `deadline` expire ou est annule.
+    """
+    start = time.perf_counter()
+    points = decode_points(pointset_data)
+    decoded = time.perf_counter()
+
+    steps = {}
+    try:
+        triangles = triangulate(points, method=method, timings=steps, deadline=deadline)
+    except ValueError as e:
+        raise ServiceError(500, "TRIANGULATION_FAILED", str(e)) from e
+    except TriangulationCancelled as e:
+        raise cancelled_error(e) from e
+    except RuntimeError as e:
+        raise ServiceError(500, "WORKER_FAILED", str(e)) from e
+
+    if timings is not None:
+        timings["decode"] = decoded - start
+        triangulation = steps.pop("triangulation")
+        timings["preprocess"] = sum(steps.values())
+        timings["triangulate"] = triangulation
+    return points, triangles
+
+
+def compute_triangulation(pointset_data, method, deadline=None):
+    """Decode un PointSet, le triangule et encode le resultat.
+
+    Args:
+        pointset_data: bytes du PointSet.
+        method: Nom du moteur de triangulation.
+        deadline: `Deadline` optionnel de la triangulation.
+
+    Returns:
+        bytes: Triangles au format binaire.
+
+    Raises:
+        ServiceError: 500 INVALID_POINTSET, TRIANGULATION_FAILED,
+            WORKER_FAILED ou ENCODING_FAILED selon l'etape en echec, 503
+            TRIANGULATION_TIMEOUT si `deadline` expire ou est annule.
+    """
+    points, triangles = triangulate_pointset(pointset_data, method, deadline=deadline)
+    return encode_triangulation(points, triangles)
+
+
+def encode_triangulation(points, triangles):
+    """Encode le resultat de `triangulate_pointset`.
+
+    Args:
+        points: Sommets (`PointSetView`).
+        triangles: Triangles retournes par `triangulate`.
+
+    Returns:
+        bytes: Triangles au format binaire.
+
+    Raises:
+        ServiceError: 500 ENCODING_FAILED si un indice est invalide.
+    """
+    try:
+        return encode_triangles(points, triangles)
+    except ValueError as e:
+        raise ServiceError(500, "ENCODING_FAILED", str(e)) from e
+
+
+def stream_triangulation(points, triangles):
+    """Prepare l'envoi par morceaux d'une triangulation.
+
+    Args:
+        points: Sommets (`PointSetView`).
+        triangles: Triangles retournes par `triangulate`.
+
+    Returns:
+        tuple: (taille totale en octets, iterateur de morceaux bytes).
+
+    Raises:
+        ServiceError: 500 ENCODING_FAILED si un indice est invalide.
+    """
+    try:
+        chunks = iter_encode_triangles(points, triangles)
+    except ValueError as e:
+        raise ServiceError(500, "ENCODING_FAILED", str(e)) from e
+    return encoded_triangles_size(len(points), len(triangles)), chunks
@@ -0,0 +1,139 @@
+"""Sessions de triangulation incrementale conservees cote serveur.
+
+Une session garde une `Triangulation` en memoire entre les requetes : les
+producteurs qui ajoutent quelques points a un grand ensemble ne paient que
+l'insertion de ces points, au lieu d'une triangulation complete a chaque
+envoi. Les sessions inutilisees expirent apres un delai (TTL) remis a zero
+a chaque acces, et leur nombre est borne.
+"""
+
+import threading
+import time
+import uuid
+
+
+class Session:
+    """Triangulation d'une session et verrou qui serialise ses mises a jour.
+
+    Attributes:
+        id: Identifiant (UUID) de la session.
+        triangulation: `Triangulation` de la session.
+        lock: Verrou a tenir pendant une lecture ou une insertion.
+    """
+
+    __slots__ = ("id", "triangulation", "lock", "expires")
+
+    def __init__(self, session_id, triangulation, expires):
+        """Initialise une session.
+
+        Args:
+            session_id: Identifiant de la session.
+            triangulation: `Triangulation` initiale.
+            expires: Instant d'expiration (horloge du `SessionStore`).
+        """
+        self.id = session_id
+        self.triangulation = triangulation
+        self.lock = threading.Lock()
+        self.expires = expires
+
+
+class SessionStore:
+    """Sessions indexees par identifiant, avec expiration (TTL).
+
+    Les sessions expirees sont retirees a la demande, lors des acces
+    suivants ; le magasin est partage entre threads.
+    """
+
+    def __init__(self, ttl=300.0, max_sessions=64, clock=time.monotonic):
+        """Initialise un magasin vide.
+
+        Args:
+            ttl: Duree de vie (s) d'une session sans acces.
+            max_sessions: Nombre maximal de sessions ouvertes.
+            clock: Horloge (s) utilisee pour les expirations.
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+
+    def _purge(self, now):
+        """Retire les sessions expirees (verrou tenu)."""
+        for session_id in [s.id for s in self._sessions.values() if s.expires <= now]:
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def create(self, triangulation):
+        """Ouvre une session.
+
+        Args:
+            triangulation: `Triangulation` initiale de la session.
+
+        Returns:
+            Session: Session creee, ou None si `max_sessions` sessions sont
+                deja ouvertes.
+        """
+        with self._lock:
+            now = self._clock()
+            self._purge(now)
+            if len(self._sessions) >= self.max_sessions:
+                return None
+            session = Session(str(uuid.uuid4()), triangulation, now + self.ttl)
+            self._sessions[session.id] = session
+            self.created += 1
+            return session
+
+    def get(self, session_id):
+        """Retourne une session ouverte et repousse son expiration.
+
+        Args:
+            session_id: Identifiant de la session.
+
+        Returns:
+            Session: Session, ou None si elle n'existe pas ou a expire.
+        """
+        with self._lock:
+            now = self._clock()
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expires <= now:
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+            session.expires = now + self.ttl
+            return session
+
+    def discard(self, session_id):
+        """Ferme une session.
+
+        Args:
+            session_id: Identifiant de la session.
+
+        Returns:
+            bool: True si la session etait ouverte.
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def clear(self):
+        """Ferme toutes les sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self):
+        """Retourne les compteurs du magasin.
+
+        Returns:
+            dict: Sessions ouvertes, creees et expirees.
+        """
+        with self._lock:
+            self._purge(self._clock())
+            return {
+                "sessions": len(self._sessions),
+                "created": self.created,
+                "expired": self.expired,
+            }
@@ -0,0 +1,153 @@
+"""Deduplication des calculs concurrents identiques (single-flight).
+
+Quand plusieurs requetes demandent la meme cle en meme temps, seule la
+premiere (le leader) execute le calcul ; les suivantes (followers)
+attendent et recoivent le meme resultat ou la meme exception.
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    """Calcul en cours partage entre un leader et ses followers."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        """Initialise un calcul en cours."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplication des appels concurrents par cle, entre threads."""
+
+    def __init__(self):
+        """Initialise un groupe sans appel en cours."""
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, fn, *args):
+        """Execute `fn(*args)` une seule fois par cle pour les appels concurrents.
+
+        Args:
+            key: Cle identifiant le calcul (hashable).
+            fn: Fonction a executer par le leader.
+            *args: Arguments de `fn`.
+
+        Returns:
+            object: Resultat de `fn`, partage entre leader et followers.
+
+        Raises:
+            Exception: L'exception levee par `fn`, pour tous les appelants.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Retourne les compteurs du groupe.
+
+        Returns:
+            dict: Nombre de leaders, de followers et d'appels en cours.
+        """
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """Deduplication des appels concurrents par cle, dans une boucle asyncio."""
+
+    def __init__(self):
+        """Initialise un groupe sans appel en cours."""
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key, fn, *args):
+        """Execute `await fn(*args)` une seule fois par cle.
+
+        Args:
+            key: Cle identifiant le calcul (hashable).
+            fn: Fonction coroutine a executer par le leader.
+            *args: Arguments de `fn`.
+
+        Returns:
+            object: Resultat de `fn`, partage entre leader et followers.
+
+        Si le leader est annule (client deconnecte), un follower en attente
+        reprend le calcul a son compte.
+
+        Raises:
+            Exception: L'exception levee par `fn`, pour tous les appelants.
+        """
+        future = self._calls.get(key)
+        while future is not None:
+            self.followers += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            future = self._calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn(*args)
+        except Exception as e:
+            future.set_exception(e)
+            # Evite l'avertissement "exception never retrieved" sans follower.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not future.done():
+                future.cancel()
+
+    def stats(self):
+        """Retourne les compteurs du groupe.
+
+        Returns:
+            dict: Nombre de leaders, de followers et d'appels en cours.
+        """
+        return {
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,196 @@
+"""Echange des PointSets et des Triangles par memoire partagee.
+
+Envoyer un gros PointSet a un processus de calcul, et recuperer ses
+Triangles, par serialisation pickle copie plusieurs fois les octets (pickle,
+tube, depickle). Ici, le processus web place le PointSet dans un segment
+`multiprocessing.shared_memory` et reserve un second segment pour le
+resultat ; seuls leurs noms et tailles traversent la frontiere. Le
+processus de calcul ecrit les Triangles directement dans le segment de
+sortie, par morceaux.
+
+Le processus web possede les deux segments : il les supprime des que le
+travail se termine, y compris en erreur, apres un delai depasse ou si le
+processus de calcul meurt (voir `SharedJob`). S'il meurt lui-meme, le
+`resource_tracker` de multiprocessing supprime les segments restants.
+"""
+
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+from triangulator.binary_format import _check_pointset_size, encoded_triangles_size
+from triangulator.service import ServiceError, stream_triangulation, triangulate_pointset
+
+
+def output_size(pointset_data):
+    """Retourne la taille maximale des Triangles d'un PointSet.
+
+    Une triangulation de n points compte au plus 2n - 5 triangles.
+
+    Args:
+        pointset_data: bytes du PointSet.
+
+    Returns:
+        int: Taille en octets, ou None si l'en-tete du PointSet est invalide.
+    """
+    try:
+        count = _check_pointset_size(pointset_data)
+    except ValueError:
+        return None
+    return encoded_triangles_size(count, 2 * count)
+
+
+class SharedJob:
+    """Segments d'entree et de sortie d'un travail, possedes par l'appelant.
+
+    Attributes:
+        input: Segment contenant le PointSet.
+        output: Segment reserve aux Triangles.
+        input_size: Taille du PointSet en octets.
+    """
+
+    __slots__ = ("input", "output", "input_size", "_lock", "_closed")
+
+    def __init__(self, pointset_data, size):
+        """Cree les segments et y copie le PointSet.
+
+        Args:
+            pointset_data: bytes du PointSet.
+            size: Taille du segment de sortie (voir `output_size`).
+        """
+        self.input_size = len(pointset_data)
+        self.input = shared_memory.SharedMemory(create=True, size=max(1, self.input_size))
+        try:
+            self.input.buf[:self.input_size] = pointset_data
+            self.output = shared_memory.SharedMemory(create=True, size=max(1, size))
+        except BaseException:
+            _unlink(self.input)
+            raise
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def arguments(self):
+        """Retourne les arguments de `compute_shared` (hors moteur)."""
+        return self.input.name, self.input_size, self.output.name, self.output.size
+
+    def read(self, length):
+        """Copie les `length` premiers octets du segment de sortie."""
+        return bytes(self.output.buf[:length])
+
+    def close(self):
+        """Supprime les deux segments (sans effet s'ils le sont deja)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        _unlink(self.input)
+        _unlink(self.output)
+
+    def attach(self, inner):
+        """Lie le travail a la future de son calcul.
+
+        Les segments sont supprimes quand le calcul se termine, quel que
+        soit son issue.
+
+        Args:
+            inner: Future de `compute_shared`.
+
+        Returns:
+            concurrent.futures.Future: Future des Triangles encodes (bytes),
+                terminee en meme temps que `inner`.
+        """
+        outer = _SharedFuture(inner)
+
+        def finish(done):
+            try:
+                if done.cancelled():
+                    Future.cancel(outer)
+                elif done.exception() is not None:
+                    outer.set_exception(done.exception())
+                else:
+                    outer.set_result(self.read(done.result()))
+            finally:
+                self.close()
+
+        inner.add_done_callback(finish)
+        return outer
+
+
+class _SharedFuture(Future):
+    """Future du resultat d'un `SharedJob`.
+
+    Elle n'est annulee que si son calcul l'est (calcul pas encore
+    commence) : un calcul en cours garde ses segments jusqu'a sa fin.
+    """
+
+    def __init__(self, inner):
+        """Initialise la future.
+
+        Args:
+            inner: Future de `compute_shared`.
+        """
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self):
+        """Annule le calcul s'il n'a pas commence."""
+        return self._inner.cancel()
+
+
+def _unlink(segment):
+    """Ferme et supprime un segment deja eventuellement supprime."""
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def compute_shared(input_name, input_size, output_name, output_size, method,
+                   deadline=None):
+    """Triangule un PointSet en memoire partagee (processus de calcul).
+
+    Le PointSet est copie une fois hors du segment d'entree (les points
+    sont convertis de toute facon par la preparation) ; les Triangles sont
+    ecrits par morceaux dans le segment de sortie, sans construire le
+    resultat complet en memoire.
+
+    Args:
+        input_name: Nom du segment du PointSet.
+        input_size: Taille du PointSet en octets.
+        output_name: Nom du segment de sortie.
+        output_size: Taille du segment de sortie.
+        method: Nom du moteur de triangulation.
+        deadline: `Deadline` optionnel de la triangulation.
+
+    Returns:
+        int: Nombre d'octets ecrits dans le segment de sortie.
+
+    Raises:
+        ServiceError: Voir `triangulator.service.compute_triangulation` ;
+            500 ENCODING_FAILED si le resultat depasse le segment de sortie.
+    """
+    segment = shared_memory.SharedMemory(name=input_name)
+    try:
+        pointset_data = bytes(segment.buf[:input_size])
+    finally:
+        segment.close()
+
+    points, triangles = triangulate_pointset(pointset_data, method, deadline=deadline)
+    size, chunks = stream_triangulation(points, triangles)
+    if size > output_size:
+        raise ServiceError(
+            500, "ENCODING_FAILED",
+            f"Resultat de {size} octets pour un segment de {output_size}",
+        )
+
+    segment = shared_memory.SharedMemory(name=output_name)
+    try:
+        buf = segment.buf
+        offset = 0
+        for chunk in chunks:
+            buf[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    finally:
+        segment.close()
+    return offset
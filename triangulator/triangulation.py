@@ -1,188 +1,567 @@
 """Algorithme de triangulation."""
 
+import math
+import time
+from array import array
 
-def _circumcircle(p1, p2, p3):
-    """Calcule le cercle circonscrit d'un triangle.
+from triangulator import divide_and_conquer, parallel
+from triangulator.binary_format import PointSetView
+from triangulator.deadline import CHECK_INTERVAL
+from triangulator.ordering import ORDERS
+from triangulator.predicates import incircle_indexed, orient2d_indexed
+from triangulator.preprocessing import prepare
 
-    Args:
-        p1: Tuple (x, y) du premier sommet.
-        p2: Tuple (x, y) du deuxieme sommet.
-        p3: Tuple (x, y) du troisieme sommet.
-
-    Returns:
-        tuple: (cx, cy, r_squared) centre et rayon au carre.
-        None si les points sont alignes.
-    """
-    ax, ay = p1
-    bx, by = p2
-    cx, cy = p3
-
-    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
-
-    if abs(d) < 1e-10:
-        return None
 
-    ax2_ay2 = ax * ax + ay * ay
-    bx2_by2 = bx * bx + by * by
-    cx2_cy2 = cx * cx + cy * cy
+DEFAULT_METHOD = "bowyer-watson"
 
-    ux = (ax2_ay2 * (by - cy) + bx2_by2 * (cy - ay) + cx2_cy2 * (ay - by)) / d
-    uy = (ax2_ay2 * (cx - bx) + bx2_by2 * (ax - cx) + cx2_cy2 * (bx - ax)) / d
+#: Ordre d'insertion par defaut du moteur incremental (cle de `ORDERS`).
+DEFAULT_ORDER = "brio"
 
-    r_squared = (ax - ux) ** 2 + (ay - uy) ** 2
+# Facteur (genereux) de la marge d'erreur des cercles circonscrits.
+_CIRCLE_ERRBOUND = 64 * 2.0 ** -53
 
-    return (ux, uy, r_squared)
 
+class _TriangleStore:
+    """Triangles en tableaux plats, avec recyclage des emplacements libres.
 
-def _point_in_circumcircle(point, circumcircle):
-    """Verifie si un point est dans le cercle circonscrit.
+    Le triangle `t` occupe les entrees `3 * t` a `3 * t + 2` de `vertices`
+    (sommets en sens direct) et de `neighbors` (voisin k oppose au sommet
+    k, -1 si aucun), et les entrees `4 * t` a `4 * t + 3` de `circles`
+    (cercle circonscrit calcule une seule fois a la creation, voir
+    `_circle`). Un triangle supprime libere son emplacement, reutilise par
+    le prochain ajout : suppression et ajout sont en O(1).
+    """
 
-    Args:
-        point: Tuple (x, y).
-        circumcircle: Tuple (cx, cy, r_squared).
+    __slots__ = (
+        "vertices", "neighbors", "circles", "alive", "_free", "_xs", "_ys", "_ghost"
+    )
+
+    def __init__(self, xs, ys, ghost=-1):
+        """Initialise un ensemble vide.
+
+        Args:
+            xs: Abscisses des sommets.
+            ys: Ordonnees des sommets.
+            ghost: Indice du sommet a l'infini des triangles fantomes (-1 si
+                aucun).
+        """
+        self.vertices = array("I")
+        self.neighbors = array("i")
+        self.circles = array("d")
+        self.alive = bytearray()
+        self._free = []
+        self._xs = xs
+        self._ys = ys
+        self._ghost = ghost
+
+    def _circle(self, a, b, c):
+        """Retourne (cx, cy, inner, outer) pour le triangle (a, b, c).
+
+        Un point a distance au carre du centre inferieure a `inner` est
+        surement dans le cercle circonscrit, superieure a `outer` surement
+        dehors ; entre les deux, seul un predicat exact peut trancher. La
+        marge majore l'erreur d'arrondi du centre et du rayon, qui croit
+        quand le triangle est aplati. Un triangle fantome n'a pas de cercle.
+        """
+        ghost = self._ghost
+        if a == ghost or b == ghost or c == ghost:
+            return 0.0, 0.0, -1.0, math.inf
+
+        xs = self._xs
+        ys = self._ys
+        ax = xs[a]
+        ay = ys[a]
+        bx = xs[b] - ax
+        by = ys[b] - ay
+        cx = xs[c] - ax
+        cy = ys[c] - ay
+        left = bx * cy
+        right = by * cx
+        d = left - right
+        if d == 0:
+            return 0.0, 0.0, -1.0, math.inf
+
+        b2 = bx * bx + by * by
+        c2 = cx * cx + cy * cy
+        ux = (cy * b2 - by * c2) / (2 * d)
+        uy = (bx * c2 - cx * b2) / (2 * d)
+        radius = math.sqrt(ux * ux + uy * uy)
+        ox = ax + ux
+        oy = ay + uy
+
+        abs_d = abs(d)
+        longest = b2 if b2 > c2 else c2
+        margin = _CIRCLE_ERRBOUND * (
+            radius * (1 + (abs(left) + abs(right)) / abs_d)
+            + math.sqrt(longest) * longest / abs_d
+            + abs(ox) + abs(oy)
+        )
+        inner = (radius - margin) ** 2 if margin < radius else -1.0
+        return ox, oy, inner, (radius + margin) ** 2
+
+    def add(self, a, b, c, na, nb, nc):
+        """Ajoute le triangle (a, b, c) et retourne son indice."""
+        circle = self._circle(a, b, c)
+        if self._free:
+            t = self._free.pop()
+            base = 3 * t
+            self.vertices[base:base + 3] = array("I", (a, b, c))
+            self.neighbors[base:base + 3] = array("i", (na, nb, nc))
+            self.circles[4 * t:4 * t + 4] = array("d", circle)
+            self.alive[t] = 1
+            return t
+        self.vertices.extend((a, b, c))
+        self.neighbors.extend((na, nb, nc))
+        self.circles.extend(circle)
+        self.alive.append(1)
+        return len(self.alive) - 1
+
+    def remove(self, t):
+        """Supprime le triangle `t` et libere son emplacement."""
+        self.alive[t] = 0
+        self._free.append(t)
+
+    def triangles(self, n):
+        """Retourne les triangles presents dont les sommets sont tous < n."""
+        vertices = self.vertices
+        result = []
+        for t, is_alive in enumerate(self.alive):
+            if not is_alive:
+                continue
+            i1, i2, i3 = vertices[3 * t:3 * t + 3]
+            if i1 < n and i2 < n and i3 < n:
+                result.append((i1, i2, i3))
+        return result
+
+
+def _along(xs, ys, u, v, p):
+    """Situe p, aligne avec u et v, par rapport au segment [u, v].
 
     Returns:
-        bool: True si le point est dans le cercle.
+        int: -1 avant u, 0 strictement entre u et v, 1 apres v.
+    """
+    if xs[u] != xs[v]:
+        cu, cv, cp = xs[u], xs[v], xs[p]
+    else:
+        cu, cv, cp = ys[u], ys[v], ys[p]
+    if cu > cv:
+        cu, cv, cp = -cu, -cv, -cp
+    if cp < cu:
+        return -1
+    if cp > cv:
+        return 1
+    return 0
+
+
+def _ghost_position(tri_v, base, ghost):
+    """Retourne la position du sommet a l'infini dans un triangle, ou -1."""
+    if tri_v[base + 2] == ghost:
+        return 2
+    if tri_v[base] == ghost:
+        return 0
+    if tri_v[base + 1] == ghost:
+        return 1
+    return -1
+
+
+def _in_conflict(xs, ys, tri_v, base, p, ghost):
+    """Teste si p est dans le cercle circonscrit (ouvert) d'un triangle.
+
+    Pour un triangle fantome (u, v, infini), le "cercle" est le demi-plan
+    ouvert exterieur a l'arete u-v, plus le segment ouvert ]u, v[.
     """
-    cx, cy, r_squared = circumcircle
-    px, py = point
-    dist_squared = (px - cx) ** 2 + (py - cy) ** 2
-    return dist_squared < r_squared
+    g = _ghost_position(tri_v, base, ghost)
+    if g == -1:
+        return incircle_indexed(
+            xs, ys, tri_v[base], tri_v[base + 1], tri_v[base + 2], p
+        ) > 0
+    u = tri_v[base + (g + 1) % 3]
+    v = tri_v[base + (g + 2) % 3]
+    o = orient2d_indexed(xs, ys, u, v, p)
+    if o != 0:
+        return o > 0
+    return _along(xs, ys, u, v, p) == 0
 
 
-def _get_super_triangle(points):
-    """Cree un super-triangle qui contient tous les points.
+def _locate(xs, ys, tri_v, tri_n, alive, start, p, ghost):
+    """Localise le triangle contenant un point par marche depuis `start`.
+
+    Un point hors de l'enveloppe convexe est localise dans un triangle
+    fantome dont l'arete d'enveloppe le voit.
 
     Args:
-        points: Liste de tuples (x, y).
+        xs: Abscisses des sommets.
+        ys: Ordonnees des sommets.
+        tri_v: Sommets des triangles (3 entrees par triangle, sens direct).
+        tri_n: Voisins des triangles (voisin k oppose au sommet k).
+        alive: Indicateurs des triangles encore presents.
+        start: Indice du triangle de depart.
+        p: Indice du sommet a localiser.
+        ghost: Indice du sommet a l'infini.
 
     Returns:
-        tuple: 3 tuples (x, y) formant le super-triangle.
+        int: Indice du triangle contenant le point (bord inclus), en
+            conflit avec p.
     """
-    min_x = min(p[0] for p in points)
-    max_x = max(p[0] for p in points)
-    min_y = min(p[1] for p in points)
-    max_y = max(p[1] for p in points)
-
-    dx = max_x - min_x
-    dy = max_y - min_y
-    delta = max(dx, dy, 1.0)
+    t = start
+    max_steps = len(alive)
+    for step in range(max_steps):
+        base = 3 * t
+        g = _ghost_position(tri_v, base, ghost)
+        if g != -1:
+            u = tri_v[base + (g + 1) % 3]
+            v = tri_v[base + (g + 2) % 3]
+            o = orient2d_indexed(xs, ys, u, v, p)
+            if o < 0:
+                t = tri_n[base + g]
+                continue
+            if o > 0:
+                return t
+            side = _along(xs, ys, u, v, p)
+            if side == 0:
+                return t
+            t = tri_n[base + (g + 1) % 3] if side > 0 else tri_n[base + (g + 2) % 3]
+            continue
+
+        for j in range(3):
+            k = (step + j) % 3
+            a = tri_v[base + (k + 1) % 3]
+            b = tri_v[base + (k + 2) % 3]
+            if orient2d_indexed(xs, ys, a, b, p) < 0:
+                t = tri_n[base + k]
+                break
+        else:
+            return t
+
+    # Marche interrompue (ne devrait pas arriver) : recherche exhaustive.
+    for t, is_alive in enumerate(alive):
+        if not is_alive:
+            continue
+        base = 3 * t
+        if _ghost_position(tri_v, base, ghost) != -1:
+            if _in_conflict(xs, ys, tri_v, base, p, ghost):
+                return t
+            continue
+        a, b, c = tri_v[base:base + 3]
+        if (orient2d_indexed(xs, ys, a, b, p) >= 0
+                and orient2d_indexed(xs, ys, b, c, p) >= 0
+                and orient2d_indexed(xs, ys, c, a, p) >= 0):
+            return t
+    return start
+
+
+def _initial_triangles(store, xs, ys, insertion, ghost):
+    """Cree le premier triangle et ses trois triangles fantomes.
 
-    mid_x = (min_x + max_x) / 2
-    mid_y = (min_y + max_y) / 2
-
-    p1 = (mid_x - 20 * delta, mid_y - delta)
-    p2 = (mid_x, mid_y + 20 * delta)
-    p3 = (mid_x + 20 * delta, mid_y - delta)
+    Returns:
+        tuple: (indice du triangle reel, points restant a inserer).
+    """
+    a, b = insertion[0], insertion[1]
+    for k in range(2, len(insertion)):
+        c = insertion[k]
+        o = orient2d_indexed(xs, ys, a, b, c)
+        if o != 0:
+            break
+    if o < 0:
+        a, b = b, a
+
+    # Indices 0 a 3 dans un stockage vide : triangle (a, b, c), puis les
+    # fantomes au-dela des aretes a-b, b-c et c-a.
+    t, gab, gbc, gca = 0, 1, 2, 3
+    store.add(a, b, c, gbc, gca, gab)
+    store.add(b, a, ghost, gca, gbc, t)
+    store.add(c, b, ghost, gab, gca, t)
+    store.add(a, c, ghost, gbc, gab, t)
+    return t, insertion[2:k] + insertion[k + 1:]
+
+
+def _insert(store, xs, ys, i, t, ghost):
+    """Insere un sommet dans la triangulation de Delaunay.
+
+    La cavite (triangles dont le cercle circonscrit contient le point) est
+    construite par parcours des voisins depuis le triangle contenant le
+    point, puis remplacee par l'etoile du point.
 
-    return (p1, p2, p3)
+    Args:
+        store: Triangles (`_TriangleStore`).
+        xs: Abscisses des sommets.
+        ys: Ordonnees des sommets.
+        i: Indice du sommet a inserer.
+        t: Triangle contenant le sommet (`_locate`).
+        ghost: Indice du sommet a l'infini.
 
+    Returns:
+        int: Indice d'un des triangles crees.
+    """
+    tri_v = store.vertices
+    tri_n = store.neighbors
+    circles = store.circles
+    px = xs[i]
+    py = ys[i]
+
+    bad = {t}
+    stack = [t]
+    boundary = []
+    while stack:
+        t = stack.pop()
+        base = 3 * t
+        for k in range(3):
+            nb = tri_n[base + k]
+            if nb in bad:
+                continue
+            a = tri_v[base + (k + 1) % 3]
+            b = tri_v[base + (k + 2) % 3]
+            if (a != ghost and b != ghost
+                    and orient2d_indexed(xs, ys, a, b, i) <= 0):
+                # Garantit une cavite etoilee autour du point.
+                bad.add(nb)
+                stack.append(nb)
+                continue
+            # Le cercle precalcule tranche les cas nets ; sinon le
+            # predicat exact decide.
+            cbase = 4 * nb
+            dx = px - circles[cbase]
+            dy = py - circles[cbase + 1]
+            dist_squared = dx * dx + dy * dy
+            if dist_squared <= circles[cbase + 3] and (
+                    dist_squared < circles[cbase + 2]
+                    or _in_conflict(xs, ys, tri_v, 3 * nb, i, ghost)):
+                bad.add(nb)
+                stack.append(nb)
+                continue
+            boundary.append((a, b, nb, t))
+
+    # Position, dans chaque voisin exterieur, du lien vers la cavite :
+    # relevee avant que les emplacements liberes ne soient reutilises.
+    links = []
+    for a, b, nb, old in boundary:
+        nbase = 3 * nb
+        nk = nbase + (0 if tri_n[nbase] == old
+                      else 1 if tri_n[nbase + 1] == old else 2)
+        links.append((a, b, nb, nk))
+
+    for t in bad:
+        store.remove(t)
+
+    by_first = {}
+    by_second = {}
+    for a, b, nb, nk in links:
+        new = store.add(a, b, i, -1, -1, nb)
+        tri_n[nk] = new
+        by_first[a] = new
+        by_second[b] = new
+
+    for a, b, _, _ in links:
+        new = by_first[a]
+        tri_n[3 * new] = by_first[b]
+        tri_n[3 * new + 1] = by_second[a]
+
+    return new
+
+
+def _duplicate_of(xs, ys, tri_v, base, i, ghost):
+    """Retourne le sommet du triangle de memes coordonnees que i, ou -1."""
+    x = xs[i]
+    y = ys[i]
+    for v in tri_v[base:base + 3]:
+        if v != ghost and xs[v] == x and ys[v] == y:
+            return v
+    return -1
+
+
+# Sommet a l'infini des triangles fantomes : indice hors de portee des
+# sommets reels, qui peuvent ainsi etre ajoutes apres coup.
+_GHOST = 0xFFFFFFFF
+
+
+class Triangulation:
+    """Triangulation de Delaunay incrementale (Bowyer-Watson).
+
+    Les triangles sont relies a leurs voisins, le point a inserer est
+    localise par marche depuis le dernier triangle cree et la cavite est
+    construite par parcours des voisins au lieu d'examiner tous les
+    triangles. Au lieu d'un super-triangle de coordonnees finies, dont les
+    sommets peuvent tomber dans le cercle de triangles d'enveloppe tres
+    aplatis, chaque arete de l'enveloppe convexe porte un triangle fantome
+    vers un sommet symbolique a l'infini. Tous les tests passent par les
+    predicats exacts de `triangulator.predicates`.
+
+    Le maillage est conserve entre les appels : `insert` ajoute des points
+    en ne retriangulant que leurs cavites, pour un cout proportionnel au
+    nombre de points ajoutes et non au total. Les indices des triangles
+    font reference aux points dans leur ordre d'ajout (premiere occurrence
+    pour les doublons, qui ne sont pas inseres).
+    """
 
-def _are_collinear(points):
-    """Verifie si tous les points sont alignes.
+    __slots__ = ("_xs", "_ys", "_store", "_last", "_order")
+
+    def __init__(self, points, order=DEFAULT_ORDER, deadline=None):
+        """Triangule un premier ensemble de points.
+
+        Args:
+            points: Liste de tuples (x, y), `PointSetView` ou
+                `PreparedPoints`.
+            order: Ordre d'insertion (cle de `ORDERS`), applique aussi aux
+                points de chaque appel a `insert`.
+            deadline: `Deadline` optionnel verifie pendant les insertions.
+
+        Raises:
+            ValueError: Si moins de 3 points, si une coordonnee n'est pas
+                finie ou si les points sont alignes.
+            TriangulationCancelled: Si `deadline` expire ou est annule.
+        """
+        prepared = prepare(points)
+        self._xs = list(prepared.xs)
+        self._ys = list(prepared.ys)
+        self._order = order
+        self._store = _TriangleStore(self._xs, self._ys, _GHOST)
+
+        # Les doublons ne sont pas inseres.
+        insertion = ORDERS[order](self._xs, self._ys, prepared.unique)
+        self._last, insertion = _initial_triangles(
+            self._store, self._xs, self._ys, insertion, _GHOST
+        )
+        self._insert_all(insertion, deadline)
+
+    def __len__(self):
+        """Retourne le nombre de points ajoutes (doublons compris)."""
+        return len(self._xs)
+
+    def _insert_all(self, indices, deadline=None):
+        """Insere des sommets deja presents dans `_xs` et `_ys`.
+
+        `deadline` est verifie toutes les `CHECK_INTERVAL` insertions.
+        """
+        xs = self._xs
+        ys = self._ys
+        store = self._store
+        tri_v = store.vertices
+        tri_n = store.neighbors
+        alive = store.alive
+        last = self._last
+        for k, i in enumerate(indices):
+            if deadline is not None and not k % CHECK_INTERVAL:
+                deadline.check()
+            t = _locate(xs, ys, tri_v, tri_n, alive, last, i, _GHOST)
+            if _duplicate_of(xs, ys, tri_v, 3 * t, i, _GHOST) == -1:
+                last = _insert(store, xs, ys, i, t, _GHOST)
+        self._last = last
+
+    def insert(self, points):
+        """Ajoute des points a la triangulation.
+
+        Les points sont tous valides avant la premiere insertion : en cas
+        d'erreur, la triangulation est inchangee.
+
+        Args:
+            points: Liste de tuples (x, y) ou `PointSetView`.
+
+        Raises:
+            ValueError: Si une coordonnee n'est pas finie.
+        """
+        if isinstance(points, PointSetView):
+            new_xs = points.xs
+            new_ys = points.ys
+        else:
+            new_xs = [float(p[0]) for p in points]
+            new_ys = [float(p[1]) for p in points]
+        if not all(math.isfinite(x) and math.isfinite(y) for x, y in zip(new_xs, new_ys)):
+            raise ValueError("Les coordonnees doivent etre finies")
+
+        first = len(self._xs)
+        self._xs.extend(new_xs)
+        self._ys.extend(new_ys)
+        self._insert_all(
+            ORDERS[self._order](self._xs, self._ys, range(first, len(self._xs)))
+        )
+
+    def points(self):
+        """Retourne les points ajoutes, dans l'ordre, en tuples (x, y)."""
+        return list(zip(self._xs, self._ys))
+
+    def triangles(self):
+        """Retourne les triangles, en tuples (i1, i2, i3) d'indices de points."""
+        return self._store.triangles(len(self._xs))
+
+
+def _bowyer_watson(points, order=DEFAULT_ORDER, deadline=None):
+    """Calcule la triangulation de Delaunay par Bowyer-Watson incremental.
+
+    Voir `Triangulation`. Les points sont inseres dans l'ordre `order` ;
+    les indices retournes font toujours reference a la liste `points`
+    d'origine (premiere occurrence pour les doublons).
 
     Args:
-        points: Liste de tuples (x, y).
+        points: Liste de tuples (x, y) ou `PreparedPoints`.
+        order: Ordre d'insertion (cle de `ORDERS`).
+        deadline: `Deadline` optionnel verifie pendant les insertions.
 
     Returns:
-        bool: True si tous les points sont alignes.
+        list: Liste de tuples (i1, i2, i3) representant les triangles
+              par indices de sommets.
     """
-    if len(points) < 3:
-        return True
+    return Triangulation(points, order, deadline).triangles()
 
-    x0, y0 = points[0]
-    x1, y1 = points[1]
 
-    for i in range(2, len(points)):
-        x2, y2 = points[i]
-        cross = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
-        if abs(cross) > 1e-10:
-            return False
+#: Version des moteurs, a incrementer des que les triangles produits pour
+#: une meme entree changent : elle entre dans les cles de cache et les ETag.
+ENGINE_VERSION = 1
 
-    return True
+#: Moteurs par nom ; chacun est appele avec les points prepares et le
+#: mot-cle `deadline` (`Deadline` ou None), a verifier regulierement.
+ENGINES = {
+    "bowyer-watson": _bowyer_watson,
+    "divide-and-conquer": divide_and_conquer.triangulate,
+    "parallel": parallel.triangulate,
+}
 
 
-def triangulate(points):
+def triangulate(points, method=DEFAULT_METHOD, order=None, timings=None, deadline=None):
     """Calcule la triangulation de Delaunay d'un ensemble de points 2D.
 
-    Utilise l'algorithme de Bowyer-Watson.
-
     Args:
-        points: Liste de tuples (x, y) representant les points.
+        points: Liste de tuples (x, y) representant les points, ou
+            `PointSetView`.
+        method: Nom du moteur de triangulation (cle de `ENGINES`).
+        order: Ordre d'insertion des points (cle de `ORDERS`) pour le moteur
+            incremental ; None : `DEFAULT_ORDER`. Sans effet sur
+            divide-and-conquer et parallel, qui trient deja les points.
+        timings: Dictionnaire optionnel complete avec la duree (secondes)
+            de chaque etape de preparation et de la triangulation.
+        deadline: `Deadline` optionnel : le moteur le verifie toutes les
+            `CHECK_INTERVAL` insertions et s'arrete s'il a expire ou ete
+            annule.
 
     Returns:
         list: Liste de tuples (i1, i2, i3) representant les triangles
-              par indices de sommets.
+              par indices de sommets (`TrianglesView` si le moteur
+              parallel a reparti le calcul).
 
     Raises:
-        ValueError: Si moins de 3 points ou si les points sont alignes.
+        ValueError: Si moins de 3 points, si une coordonnee n'est pas
+            finie, si les points sont alignes ou si la methode ou l'ordre
+            est inconnu.
+        TriangulationCancelled: Si `deadline` expire ou est annule.
     """
-    if len(points) < 3:
-        raise ValueError("Au moins 3 points sont requis")
-
-    unique_points = list(set(points))
-    if len(unique_points) < 3:
-        raise ValueError("Au moins 3 points distincts sont requis")
-
-    if _are_collinear(unique_points):
-        raise ValueError("Les points sont alignes")
-
-    {p: i for i, p in enumerate(points)}
-
-    super_tri = _get_super_triangle(points)
-    sp1, sp2, sp3 = super_tri
-
-    all_points = list(points) + [sp1, sp2, sp3]
-    n = len(points)
-
-    triangles = [(n, n + 1, n + 2)]
-
-    for i, point in enumerate(points):
-        bad_triangles = []
-
-        for tri in triangles:
-            p1 = all_points[tri[0]]
-            p2 = all_points[tri[1]]
-            p3 = all_points[tri[2]]
-
-            cc = _circumcircle(p1, p2, p3)
-            if cc is not None and _point_in_circumcircle(point, cc):
-                bad_triangles.append(tri)
-
-        polygon = []
-        for tri in bad_triangles:
-            edges = [
-                (tri[0], tri[1]),
-                (tri[1], tri[2]),
-                (tri[2], tri[0])
-            ]
-            for edge in edges:
-                edge_reversed = (edge[1], edge[0])
-                shared = False
-                for other_tri in bad_triangles:
-                    if other_tri == tri:
-                        continue
-                    other_edges = [
-                        (other_tri[0], other_tri[1]),
-                        (other_tri[1], other_tri[2]),
-                        (other_tri[2], other_tri[0])
-                    ]
-                    if edge in other_edges or edge_reversed in other_edges:
-                        shared = True
-                        break
-                if not shared:
-                    polygon.append(edge)
-
-        for tri in bad_triangles:
-            triangles.remove(tri)
-
-        for edge in polygon:
-            new_tri = (edge[0], edge[1], i)
-            triangles.append(new_tri)
-
-    final_triangles = []
-    for tri in triangles:
-        if tri[0] < n and tri[1] < n and tri[2] < n:
-            final_triangles.append(tri)
-
-    return final_triangles
+    engine = ENGINES.get(method)
+    if engine is None:
+        raise ValueError(f"Methode de triangulation inconnue: {method}")
+
+    if order is not None and order not in ORDERS:
+        raise ValueError(f"Ordre d'insertion inconnu: {order}")
+
+    # Un calcul deja expire (reste en file d'attente) ne commence pas.
+    if deadline is not None:
+        deadline.check()
+    prepared = prepare(points)
+
+    start = time.perf_counter()
+    if order is not None and engine is _bowyer_watson:
+        triangles = engine(prepared, order=order, deadline=deadline)
+    else:
+        triangles = engine(prepared, deadline=deadline)
+
+    if timings is not None:
+        timings.update(prepared.timings)
+        timings["triangulation"] = time.perf_counter() - start
+    return triangles